@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Batch futures P&L over a trade log (NumPy columns in, NumPy columns out).
+
+    python -m ch11_pnl_futures.batch trades.csv -o pnl.csv      # "-" = stdin/stdout
+
+CSV columns: entry, exit, side (long/short), contracts; optional symbol
+(specs and per-root plan fees from the posagg fee catalog), tick_size,
+dollars_per_tick (default MES), plan (free / no_commission), fee_per_side
+(overrides plan), slippage_ticks (round trip, default 1.0). Output appends
+fees_rt, slippage_usd, pnl, pnl_per_contract.
+"""
+from __future__ import annotations
+from typing import Dict, List
+import numpy as np
+from ch11_pnl_common.batch import csv_main, round_cents, side_sign
+from .pnl_futures import ContractSpec, FuturesFees, per_side_total
+
+PLANS: Dict[str, FuturesFees] = {
+    "free": FuturesFees(),                                  # Free plan (commissioned)
+    "no_commission": FuturesFees(commission_per_side=0.00), # No Commission Membership
+}
+OUT_COLUMNS = ("fees_rt", "slippage_usd", "pnl", "pnl_per_contract")
+
+def plan_fee_per_side(plan) -> np.ndarray:
+    """Per-side fee for each row's plan name, one per_side_total() per distinct plan."""
+    names, inv = np.unique(np.asarray(plan, dtype=str), return_inverse=True)
+    try:
+        per_plan = np.array([per_side_total(PLANS[n]) for n in names.tolist()])
+    except KeyError as e:
+        raise ValueError(f"unknown plan {e.args[0]!r} (known: {', '.join(PLANS)})") from None
+    return per_plan[inv]
+
+def futures_costs_batch(contracts, dollars_per_tick, fee_per_side, slippage_ticks_rt):
+    """(round-trip fees, slippage $) per row; matches round_trip_fees() + slippage in pnl_futures."""
+    contracts = np.asarray(contracts, dtype=np.float64)
+    fees_rt = 2 * np.asarray(fee_per_side, dtype=np.float64) * contracts
+    slip_usd = np.asarray(slippage_ticks_rt, dtype=np.float64) * dollars_per_tick * contracts
+    return fees_rt, slip_usd
+
+def pnl_futures_batch(entry, exit, side, contracts, tick_size=ContractSpec.tick_size,
+                      dollars_per_tick=ContractSpec.dollars_per_tick,
+                      fee_per_side=per_side_total(FuturesFees()), slippage_ticks_rt=1.0) -> np.ndarray:
+    """Vectorized pnl_futures(): net P&L per trade, rounded to cents.
+
+    Every argument is an array or a scalar broadcast over the rows; results
+    equal pnl_futures() row by row.
+    """
+    sign = side_sign(side)
+    entry = np.asarray(entry, dtype=np.float64)
+    exit = np.asarray(exit, dtype=np.float64)
+    dollars_per_tick = np.asarray(dollars_per_tick, dtype=np.float64)
+    contracts = np.asarray(contracts, dtype=np.float64)
+    ticks_per_point = 1.0 / np.asarray(tick_size, dtype=np.float64)
+    gross = sign * (exit - entry) * ticks_per_point * dollars_per_tick * contracts
+    fees_rt, slip_usd = futures_costs_batch(contracts, dollars_per_tick, fee_per_side, slippage_ticks_rt)
+    return round_cents(gross - (fees_rt + slip_usd))
+
+def net_per_contract_batch(entry, exit, side, tick_size=ContractSpec.tick_size,
+                           dollars_per_tick=ContractSpec.dollars_per_tick,
+                           fee_per_side=per_side_total(FuturesFees()), slippage_ticks_rt=1.0) -> np.ndarray:
+    """Vectorized net_per_contract()."""
+    sign = side_sign(side)
+    dollars_per_tick = np.asarray(dollars_per_tick, dtype=np.float64)
+    ticks_per_point = 1.0 / np.asarray(tick_size, dtype=np.float64)
+    gross = sign * (np.asarray(exit, dtype=np.float64) - np.asarray(entry, dtype=np.float64)) \
+        * ticks_per_point * dollars_per_tick
+    fees_rt, slip_usd = futures_costs_batch(1, dollars_per_tick, fee_per_side, slippage_ticks_rt)
+    return round_cents(gross - fees_rt - slip_usd)
+
+def pnl_futures_cents_batch(entry, exit, side, contracts, tick_size=ContractSpec.tick_size,
+                            dollars_per_tick=ContractSpec.dollars_per_tick,
+                            fee_per_side=per_side_total(FuturesFees()), slippage_ticks_rt=1.0) -> np.ndarray:
+    """Exact pnl_futures() in int64 cents, via posagg's integer tick kernel.
+
+    Prices go to int ticks and slippage to 1/100 ticks once; the P&L is then
+    pure integer math, rounded half-even once (needs position-aggregator).
+    """
+    from posagg.ticks import prices_to_ticks, round_trip_cents, slippage_to_units
+    sign = side_sign(side)
+    n = sign.shape[0]
+    tick = np.broadcast_to(np.asarray(tick_size, dtype=np.float64), (n,))
+    dpt = np.broadcast_to(np.asarray(dollars_per_tick, dtype=np.float64), (n,))
+    qty = np.broadcast_to(np.asarray(contracts, dtype=np.int64), (n,))
+    fee_cents = np.broadcast_to(np.rint(np.asarray(fee_per_side, dtype=np.float64) * 100).astype(np.int64), (n,))
+    slip = np.broadcast_to(slippage_to_units(slippage_ticks_rt), (n,))
+    entry_t = prices_to_ticks(np.broadcast_to(entry, (n,)), tick)
+    exit_t = prices_to_ticks(np.broadcast_to(exit, (n,)), tick)
+    out = np.empty(n, dtype=np.int64)
+    for d in np.unique(dpt).tolist():
+        # $/tick is exact per contract, so one integer pass per distinct value
+        m = dpt == d
+        out[m] = round_trip_cents(entry_t[m], exit_t[m], sign[m], qty[m], d, fee_cents[m], slip[m])
+    return out
+
+def _specs(rows: List[dict], plans: List[str]):
+    # tick size / $ per tick / fee per side per row: explicit columns, else the symbol's
+    # posagg catalog entry (one table lookup per row), else MES and PLANS
+    n = len(rows)
+    tick = np.full(n, ContractSpec.tick_size)
+    dpt = np.full(n, ContractSpec.dollars_per_tick)
+    fee = None
+    syms = [r.get("symbol") or "" for r in rows]
+    has = [i for i, s in enumerate(syms) if s]
+    if has:
+        from posagg.catalog import UnknownFeePlanError, default_catalog
+        cat = default_catalog()
+        rid = cat.root_ids([syms[i] for i in has])
+        try:
+            pid = cat.plan_ids([plans[i] for i in has])
+        except UnknownFeePlanError as e:
+            raise ValueError(e.args[0]) from None
+        tick[has], dpt[has] = cat.tick_size[rid], cat.dollars_per_tick[rid]
+        fee = np.empty(n)
+        fee[has] = cat.per_side[rid, pid]
+        rest = [i for i, s in enumerate(syms) if not s]
+        if rest:
+            fee[rest] = plan_fee_per_side([plans[i] for i in rest])
+        if np.isnan(fee).any():
+            i = int(np.flatnonzero(np.isnan(fee))[0])
+            raise ValueError(f"no {plans[i]!r} fees for {syms[i]!r} in the fee catalog")
+    for i, r in enumerate(rows):
+        if r.get("tick_size"):
+            tick[i] = float(r["tick_size"])
+        if r.get("dollars_per_tick"):
+            dpt[i] = float(r["dollars_per_tick"])
+    if fee is None:
+        fee = plan_fee_per_side(plans)
+    return tick, dpt, fee
+
+def compute_rows(rows: List[dict], exact: bool = False) -> Dict[str, np.ndarray]:
+    entry = np.array([float(r["entry"]) for r in rows])
+    exit_ = np.array([float(r["exit"]) for r in rows])
+    side = [r["side"] for r in rows]
+    contracts = np.array([int(r["contracts"]) for r in rows])
+    tick, dpt, fee = _specs(rows, [r.get("plan") or "free" for r in rows])
+    override = [i for i, r in enumerate(rows) if r.get("fee_per_side")]
+    fee[override] = [float(rows[i]["fee_per_side"]) for i in override]
+    slip = np.array([float(r.get("slippage_ticks") or 1.0) for r in rows])
+
+    fees_rt, slip_usd = futures_costs_batch(contracts, dpt, fee, slip)
+    if exact:
+        return {
+            "fees_rt": round_cents(fees_rt),
+            "slippage_usd": round_cents(slip_usd),
+            "pnl": pnl_futures_cents_batch(entry, exit_, side, contracts, tick, dpt, fee, slip) / 100,
+            "pnl_per_contract": pnl_futures_cents_batch(entry, exit_, side, 1, tick, dpt, fee, slip) / 100,
+        }
+    return {
+        "fees_rt": round_cents(fees_rt),
+        "slippage_usd": round_cents(slip_usd),
+        "pnl": pnl_futures_batch(entry, exit_, side, contracts, tick, dpt, fee, slip),
+        "pnl_per_contract": net_per_contract_batch(entry, exit_, side, tick, dpt, fee, slip),
+    }
+
+def _add_exact(p) -> None:
+    p.add_argument("--exact", action="store_true",
+                   help="integer tick/cent P&L (needs position-aggregator); prices must be on the tick grid")
+
+def main(argv=None):
+    csv_main(argv, "pnl_futures_batch", "Futures P&L for a CSV trade log", OUT_COLUMNS,
+             lambda rows, args: compute_rows(rows, args.exact), add_args=_add_exact)
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,18 @@ class ContractSpec:
     dollars_per_tick: float = 1.25  # MES $/tick
     contracts: int = 1
 
+def spec_for_symbol(symbol: str, contracts: int = 1) -> ContractSpec:
+    # Shared instrument registry from posagg (position-aggregator/); "MESZ5", "MNQ", "6EH6", ...
+    from posagg.instruments import default_registry
+    inst = default_registry().resolve(symbol)
+    return ContractSpec(tick_size=inst.tick_size, dollars_per_tick=inst.dollars_per_tick, contracts=contracts)
+
+def fees_for(symbol: str, plan: str = "free") -> FuturesFees:
+    # Per-root broker fees from the posagg fee catalog (data/fee_plans.csv); plan "free" / "no_commission"
+    from posagg.catalog import default_catalog
+    p = default_catalog().fee_plan(symbol, plan)
+    return FuturesFees(p.exchange_per_side, p.clearing_per_side, p.nfa_per_side, p.commission_per_side)
+
 def ask_float(prompt: str, default: float | None = None) -> float:
     while True:
         raw = input(f"{prompt}" + (f" [{default}]" if default is not None else "") + ": ").strip()
@@ -46,6 +58,18 @@ def ask_side() -> str:
             return s
         print("  Type 'long' or 'short'.")
 
+def ask_symbol(default: str = "MES") -> tuple[str, ContractSpec]:
+    while True:
+        raw = input(f"Contract (root or symbol) [{default}]: ").strip().upper() or default
+        try:
+            return raw, spec_for_symbol(raw)
+        except ImportError:
+            # posagg not installed: only the built-in MES spec is available
+            print("  Instrument registry unavailable (install position-aggregator); using MES.")
+            return "MES", ContractSpec()
+        except KeyError:
+            print(f"  Unknown contract '{raw}'.")
+
 def ask_yes_no(prompt: str, default_yes: bool | None = None) -> bool:
     suffix = ""
     if default_yes is True: suffix = " [Y/n]"
@@ -79,8 +103,17 @@ def net_per_contract(entry: float, exit: float, side: str, spec: ContractSpec, f
     slip_usd_one = slippage_ticks_rt * spec.dollars_per_tick
     return round(gross - rt_fees_one - slip_usd_one, 2)
 
+def breakeven_ticks(spec: ContractSpec, fees: FuturesFees, slippage_ticks_rt: float) -> float:
+    """Ticks the market must move in your favour for the trade to net $0 (any size)."""
+    return (2 * per_side_total(fees) + slippage_ticks_rt * spec.dollars_per_tick) / spec.dollars_per_tick
+
+def breakeven_exit(entry: float, side: str, spec: ContractSpec, fees: FuturesFees, slippage_ticks_rt: float) -> float:
+    sign = 1 if side == "long" else -1
+    return entry + sign * breakeven_ticks(spec, fees, slippage_ticks_rt) * spec.tick_size
+
 def main():
     print("=== FUTURES P&L (MES / Tradovate) ===")
+    symbol, base_spec = ask_symbol()
     entry = ask_float("Entry price")
     exit_ = ask_float("Exit price")
     side = ask_side()
@@ -88,13 +121,17 @@ def main():
 
     has_no_commission = ask_yes_no('Do you have the "No Commission Membership"?', default_yes=False)
 
-    spec = ContractSpec(contracts=contracts)
+    spec = ContractSpec(tick_size=base_spec.tick_size, dollars_per_tick=base_spec.dollars_per_tick, contracts=contracts)
     if has_no_commission:
-        fees = FuturesFees(commission_per_side=0.00)
+        plan, fees = "no_commission", FuturesFees(commission_per_side=0.00)
         plan_label = "No Commission Membership"
     else:
-        fees = FuturesFees()
+        plan, fees = "free", FuturesFees()
         plan_label = "Free plan (commissioned)"
+    try:
+        fees = fees_for(symbol, plan)
+    except (ImportError, KeyError):
+        pass  # no catalog entry: MES defaults above
 
     slippage_ticks_rt = ask_float("Round-trip slippage (ticks)", default=1.0)
 
@@ -104,13 +141,15 @@ def main():
     slip_usd = slippage_ticks_rt * spec.dollars_per_tick * contracts
 
     print("\n--- RESULT (FUTURES) ---")
-    print(f"Contract: MES   Side: {side.upper()}  Contracts: {contracts}")
+    print(f"Contract: {symbol}   Side: {side.upper()}  Contracts: {contracts}")
     print(f"Entry: {entry:.2f}  Exit: {exit_:.2f}  Tick: {spec.tick_size}  $/tick: {spec.dollars_per_tick}")
     print(f"Plan: {plan_label}")
     print(f"Fees RT (exch+clr+nfa+comm): ${rt_fees:.2f}")
     print(f"Slippage RT: {slippage_ticks_rt} ticks (= ${slip_usd:.2f})")
     print(f"P&L per contract: ${per_ct:.2f}")
     print(f"P&L total:        ${total:.2f}")
+    print(f"Breakeven: {breakeven_ticks(spec, fees, slippage_ticks_rt):.2f} ticks "
+          f"(exit {breakeven_exit(entry, side, spec, fees, slippage_ticks_rt):.2f})")
 
 if __name__ == "__main__":
     main()
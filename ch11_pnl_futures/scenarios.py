@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Scenario grid and breakeven for futures trades.
+
+    python -m ch11_pnl_futures.scenarios 5000 --side long --symbol MES
+
+pnl_grid() evaluates pnl_futures() over every exit x contracts x slippage x
+plan combination in one broadcast (axes in that order); breakeven comes
+straight from the cost formula, no search.
+"""
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+import numpy as np
+from .batch import PLANS, round_cents
+from .pnl_futures import ContractSpec, breakeven_exit, per_side_total
+
+PLAN_LABELS = {"free": "Free plan (commissioned)", "no_commission": "No Commission Membership"}
+
+@dataclass(frozen=True)
+class ScenarioGrid:
+    exits: np.ndarray            # (E,)
+    contracts: np.ndarray        # (K,)
+    slippage_ticks: np.ndarray   # (S,)
+    plans: Tuple[str, ...]       # (P,)
+    pnl: np.ndarray              # (E, K, S, P), rounded to cents like pnl_futures()
+    breakeven_ticks: np.ndarray  # (S, P), ticks of favourable move to net $0
+
+    def at(self, exit: float, contracts: int, slippage_ticks: float, plan: str) -> float:
+        e = int(np.flatnonzero(self.exits == exit)[0])
+        k = int(np.flatnonzero(self.contracts == contracts)[0])
+        s = int(np.flatnonzero(self.slippage_ticks == slippage_ticks)[0])
+        return float(self.pnl[e, k, s, self.plans.index(plan)])
+
+def _plan_fees(plans) -> Tuple[Tuple[str, ...], np.ndarray]:
+    if isinstance(plans, dict):
+        items = list(plans.items())
+    else:
+        items = [(p, PLANS[p]) for p in plans]
+    return tuple(n for n, _ in items), np.array([per_side_total(f) for _, f in items])
+
+def breakeven_grid(slippage_ticks: Sequence[float], plans=PLANS,
+                   spec: ContractSpec = ContractSpec()) -> np.ndarray:
+    """breakeven_ticks() for every slippage x plan, shape (S, P)."""
+    _, fee = _plan_fees(plans)
+    slip = np.asarray(slippage_ticks, dtype=np.float64)
+    return (2 * fee[None, :] + slip[:, None] * spec.dollars_per_tick) / spec.dollars_per_tick
+
+def pnl_grid(entry: float, exits: Sequence[float], side: str = "long", contracts: Sequence[int] = (1,),
+             slippage_ticks: Sequence[float] = (1.0,), plans=PLANS,
+             spec: ContractSpec = ContractSpec()) -> ScenarioGrid:
+    """Net P&L for every exit x contracts x slippage x plan.
+
+    `plans` is a list of PLANS names or a {name: FuturesFees} dict. Each
+    cell equals pnl_futures() for that scenario: the same operations in the
+    same order, broadcast instead of looped, then round_cents().
+    """
+    names, fee = _plan_fees(plans)
+    exits = np.asarray(exits, dtype=np.float64)
+    k = np.asarray(contracts, dtype=np.int64)
+    slip = np.asarray(slippage_ticks, dtype=np.float64)
+    sign = 1 if side == "long" else -1
+    kf = k.astype(np.float64)
+
+    per_ct = sign * (exits - entry) * (1.0 / spec.tick_size) * spec.dollars_per_tick      # (E,)
+    gross = per_ct[:, None] * kf[None, :]                                                 # (E, K)
+    fees_rt = 2 * fee[None, :] * kf[:, None]                                              # (K, P)
+    slip_usd = slip[None, :] * spec.dollars_per_tick * kf[:, None]                         # (K, S)
+    costs = fees_rt[:, None, :] + slip_usd[:, :, None]                                    # (K, S, P)
+    pnl = round_cents(gross[:, :, None, None] - costs[None])
+    return ScenarioGrid(exits, k, slip, names, pnl, breakeven_grid(slip, plans, spec))
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="pnl_futures_scenarios", description="Breakeven and P&L ladder per fee plan")
+    p.add_argument("entry", type=float)
+    p.add_argument("--side", choices=("long", "short"), default="long")
+    p.add_argument("--symbol", default="", help="root or contract (needs position-aggregator); default MES")
+    p.add_argument("--contracts", type=int, default=1)
+    p.add_argument("--slippage", type=float, nargs="+", default=[1.0], help="round-trip slippage ticks")
+    p.add_argument("--ticks", type=int, default=8, help="ladder half-width in ticks")
+    args = p.parse_args(argv)
+
+    spec, plans = ContractSpec(), PLANS
+    if args.symbol:
+        # contract and fees from the same posagg catalog, as batch._specs does
+        from .pnl_futures import fees_for, spec_for_symbol
+        spec = spec_for_symbol(args.symbol)
+        plans = {name: fees_for(args.symbol, name) for name in PLANS}
+    exits = args.entry + np.arange(-args.ticks, args.ticks + 1) * spec.tick_size
+    grid = pnl_grid(args.entry, exits, args.side, [args.contracts], args.slippage, plans, spec)
+
+    for s, slip in enumerate(grid.slippage_ticks):
+        print(f"\nSlippage RT: {slip:g} ticks   Contracts: {args.contracts}")
+        for j, plan in enumerate(grid.plans):
+            be = grid.breakeven_ticks[s, j]
+            px = breakeven_exit(args.entry, args.side, spec, plans[plan], slip)
+            print(f"  {PLAN_LABELS.get(plan, plan)}: breakeven {be:.2f} ticks (exit {px:.2f})")
+        print("  exit      " + "  ".join(f"{n:>14}" for n in grid.plans))
+        for e, px in enumerate(grid.exits):
+            print(f"  {px:<9.2f} " + "  ".join(f"{grid.pnl[e, 0, s, j]:>14.2f}" for j in range(len(grid.plans))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Batch stock/ETF P&L over a trade log (NumPy columns in, NumPy columns out).
+
+    python -m ch11_pnl_stocks.batch trades.csv -o pnl.csv      # "-" = stdin/stdout
+
+CSV columns: entry, exit, side (long/short), shares; optional
+commission_per_share (default 0.00), slippage_per_share_rt (default 0.02).
+Output appends costs, pnl, pnl_per_share.
+"""
+from __future__ import annotations
+from typing import Dict, List
+import numpy as np
+from ch11_pnl_common.batch import csv_main, round_cents, side_sign
+from .pnl_stocks import StockCosts
+
+OUT_COLUMNS = ("costs", "pnl", "pnl_per_share")
+
+def stock_costs_batch(shares, commission_per_share=StockCosts.commission_per_share,
+                      slippage_per_share_rt=StockCosts.slippage_per_share_rt) -> np.ndarray:
+    """Round-trip costs per row (commission + slippage, per share x shares)."""
+    per_share = np.asarray(commission_per_share, dtype=np.float64) + slippage_per_share_rt
+    return np.asarray(shares, dtype=np.float64) * per_share
+
+def pnl_stocks_batch(entry, exit, side, shares, commission_per_share=StockCosts.commission_per_share,
+                     slippage_per_share_rt=StockCosts.slippage_per_share_rt) -> np.ndarray:
+    """Vectorized pnl_stocks(): net P&L per trade, rounded to cents.
+
+    Every argument is an array or a scalar broadcast over the rows; results
+    equal pnl_stocks() row by row.
+    """
+    sign = side_sign(side)
+    shares = np.asarray(shares, dtype=np.float64)
+    gross = sign * (np.asarray(exit, dtype=np.float64) - np.asarray(entry, dtype=np.float64)) * shares
+    return round_cents(gross - stock_costs_batch(shares, commission_per_share, slippage_per_share_rt))
+
+def net_per_share_batch(entry, exit, side, commission_per_share=StockCosts.commission_per_share,
+                        slippage_per_share_rt=StockCosts.slippage_per_share_rt) -> np.ndarray:
+    """Vectorized net_per_share()."""
+    sign = side_sign(side)
+    gross = sign * (np.asarray(exit, dtype=np.float64) - np.asarray(entry, dtype=np.float64))
+    per_share = np.asarray(commission_per_share, dtype=np.float64) + slippage_per_share_rt
+    return round_cents(gross - per_share)
+
+def compute_rows(rows: List[dict]) -> Dict[str, np.ndarray]:
+    entry = np.array([float(r["entry"]) for r in rows])
+    exit_ = np.array([float(r["exit"]) for r in rows])
+    side = [r["side"] for r in rows]
+    shares = np.array([int(r["shares"]) for r in rows])
+    comm = np.array([float(r.get("commission_per_share") or StockCosts.commission_per_share) for r in rows])
+    slip = np.array([float(r.get("slippage_per_share_rt") or StockCosts.slippage_per_share_rt) for r in rows])
+    return {
+        "costs": round_cents(stock_costs_batch(shares, comm, slip)),
+        "pnl": pnl_stocks_batch(entry, exit_, side, shares, comm, slip),
+        "pnl_per_share": net_per_share_batch(entry, exit_, side, comm, slip),
+    }
+
+def main(argv=None):
+    csv_main(argv, "pnl_stocks_batch", "Stock/ETF P&L for a CSV trade log", OUT_COLUMNS,
+             lambda rows, args: compute_rows(rows))
+
+if __name__ == "__main__":
+    main()
@@ -49,6 +49,14 @@ def net_per_share(entry: float, exit: float, side: str, costs: StockCosts) -> fl
     per_share_costs = costs.commission_per_share + costs.slippage_per_share_rt
     return round(gross - per_share_costs, 2)
 
+def breakeven_per_share(costs: StockCosts) -> float:
+    """Price move per share (in your favour) for the trade to net $0, any size."""
+    return costs.commission_per_share + costs.slippage_per_share_rt
+
+def breakeven_exit(entry: float, side: str, costs: StockCosts) -> float:
+    sign = 1 if side == "long" else -1
+    return entry + sign * breakeven_per_share(costs)
+
 def main():
     print("=== STOCKS/ETF P&L ===")
     entry = ask_float("Entry (buy) price")
@@ -69,6 +77,7 @@ def main():
     print(f"Costs: commission/share=${commission:.4f}, slippage RT/share=${slippage_rt:.4f}")
     print(f"P&L per share: ${per_share:.2f}")
     print(f"P&L total:     ${total:.2f}")
+    print(f"Breakeven: {breakeven_per_share(costs):.4f}/share (exit {breakeven_exit(entry, side, costs):.4f})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Scenario grid and breakeven for stock/ETF trades.
+
+    python -m ch11_pnl_stocks.scenarios 100 --side long --shares 25
+
+pnl_grid() evaluates pnl_stocks() over every exit x shares x slippage x
+commission combination in one broadcast (axes in that order); breakeven
+comes straight from the cost formula, no search.
+"""
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+from typing import Sequence
+import numpy as np
+from .batch import round_cents
+from .pnl_stocks import StockCosts, breakeven_exit
+
+@dataclass(frozen=True)
+class ScenarioGrid:
+    exits: np.ndarray                 # (E,)
+    shares: np.ndarray                # (N,)
+    slippage_per_share_rt: np.ndarray # (S,)
+    commission_per_share: np.ndarray  # (C,)
+    pnl: np.ndarray                   # (E, N, S, C), rounded to cents like pnl_stocks()
+    breakeven_per_share: np.ndarray   # (S, C), favourable move per share to net $0
+
+def pnl_grid(entry: float, exits: Sequence[float], side: str = "long", shares: Sequence[int] = (1,),
+             slippage_per_share_rt: Sequence[float] = (StockCosts.slippage_per_share_rt,),
+             commission_per_share: Sequence[float] = (StockCosts.commission_per_share,)) -> ScenarioGrid:
+    """Net P&L for every exit x shares x slippage x commission.
+
+    Each cell equals pnl_stocks() for that scenario: the same operations in
+    the same order, broadcast instead of looped, then round_cents().
+    """
+    exits = np.asarray(exits, dtype=np.float64)
+    n = np.asarray(shares, dtype=np.int64)
+    slip = np.asarray(slippage_per_share_rt, dtype=np.float64)
+    comm = np.asarray(commission_per_share, dtype=np.float64)
+    sign = 1 if side == "long" else -1
+    nf = n.astype(np.float64)
+
+    gross = (sign * (exits - entry))[:, None] * nf[None, :]          # (E, N)
+    per_share = comm[None, :] + slip[:, None]                        # (S, C)
+    costs = nf[:, None, None] * per_share[None]                      # (N, S, C)
+    pnl = round_cents(gross[:, :, None, None] - costs[None])
+    return ScenarioGrid(exits, n, slip, comm, pnl, per_share)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="pnl_stocks_scenarios", description="Breakeven and P&L ladder")
+    p.add_argument("entry", type=float)
+    p.add_argument("--side", choices=("long", "short"), default="long")
+    p.add_argument("--shares", type=int, default=25)
+    p.add_argument("--commission", type=float, nargs="+", default=[StockCosts.commission_per_share],
+                   help="commission per share")
+    p.add_argument("--slippage", type=float, default=StockCosts.slippage_per_share_rt,
+                   help="round-trip slippage per share")
+    p.add_argument("--steps", type=int, default=5, help="ladder half-width in cents")
+    args = p.parse_args(argv)
+
+    exits = args.entry + np.arange(-args.steps, args.steps + 1) * 0.01
+    grid = pnl_grid(args.entry, exits, args.side, [args.shares], [args.slippage], args.commission)
+    print(f"Shares: {args.shares}   Slippage RT/share: {args.slippage:.4f}")
+    for c, comm in enumerate(grid.commission_per_share):
+        px = breakeven_exit(args.entry, args.side, StockCosts(comm, args.slippage))
+        print(f"  commission {comm:.4f}/sh: breakeven {grid.breakeven_per_share[0, c]:.4f}/sh (exit {px:.4f})")
+    print("  exit      " + "  ".join(f"{c:>12.4f}" for c in grid.commission_per_share))
+    for e, px in enumerate(grid.exits):
+        print(f"  {px:<9.2f} " + "  ".join(f"{grid.pnl[e, 0, 0, c]:>12.2f}" for c in range(grid.pnl.shape[3])))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+apply_fill (per row) vs apply_fills_batch (columnar) on the same random fills.
+Checks both paths end with the same positions, then prints timings.
+
+    python benchmarks/bench_batch.py --n 1000000
+"""
+from __future__ import annotations
+import argparse, math, random, time
+import numpy as np
+from posagg.engine import PositionEngine
+from posagg.models import Fill
+
+SYMBOLS = {"MESZ5": (6000.0, 0.25), "MCLX5": (70.0, 0.01), "MESH6": (6050.0, 0.25), "MCLZ5": (71.0, 0.01)}
+
+def make_columns(n: int, seed: int):
+    rng = random.Random(seed)
+    syms = list(SYMBOLS)
+    symbol, side, qty, price, fees = [], [], [], [], []
+    for _ in range(n):
+        s = rng.choice(syms)
+        base, tick = SYMBOLS[s]
+        symbol.append(s)
+        side.append(rng.choice(("BUY", "SELL")))
+        qty.append(rng.randint(1, 5))
+        price.append(base + tick * rng.randint(-400, 400))
+        fees.append(0.95 * qty[-1])
+    return symbol, side, qty, price, fees
+
+def same_positions(a: PositionEngine, b: PositionEngine) -> bool:
+    if a.positions.keys() != b.positions.keys():
+        return False
+    for sym, pa in a.positions.items():
+        pb = b.positions[sym]
+        if pa.net_qty != pb.net_qty:
+            return False
+        for x, y in ((pa.avg_price, pb.avg_price), (pa.realized_pnl, pb.realized_pnl), (pa.fees_cum, pb.fees_cum)):
+            if not math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6):
+                return False
+    return True
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--n", type=int, default=200_000)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    symbol, side, qty, price, fees = make_columns(args.n, args.seed)
+    fills = [Fill(ts="", symbol=s, side=sd, qty=q, price=px, fees=f)
+             for s, sd, q, px, f in zip(symbol, side, qty, price, fees)]
+    cols = (np.array(symbol), np.array(side), np.array(qty), np.array(price), np.array(fees))
+
+    per_fill = PositionEngine()
+    t0 = time.perf_counter()
+    for f in fills:
+        per_fill.apply_fill(f)
+    t_fill = time.perf_counter() - t0
+
+    batch = PositionEngine()
+    t0 = time.perf_counter()
+    batch.apply_fills_batch(*cols)
+    t_batch = time.perf_counter() - t0
+
+    print(f"fills:             {args.n}")
+    print(f"apply_fill:        {t_fill:8.3f}s  {args.n / t_fill:>12,.0f} fills/s")
+    print(f"apply_fills_batch: {t_batch:8.3f}s  {args.n / t_batch:>12,.0f} fills/s  (x{t_fill / t_batch:.1f})")
+    print(f"positions match:   {same_positions(per_fill, batch)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Replay a synthetic mark stream through ReplayMarkFeed -> StreamingMarkProvider
+-> IncrementalBlotter over a Unix socket and report throughput and coalescing.
+
+    python benchmarks/bench_marks.py --n 500000 --symbols 200
+"""
+from __future__ import annotations
+import argparse, asyncio, os, random, tempfile, time
+from posagg.blotter import IncrementalBlotter
+from posagg.engine import PositionEngine
+from posagg.markfeed import ReplayMarkFeed, StreamingMarkProvider
+from posagg.models import Fill
+
+def write_marks(path: str, n: int, symbols: list[str], seed: int) -> None:
+    rng = random.Random(seed)
+    t = 1_760_000_000.0
+    with open(path, "w") as f:
+        for _ in range(n):
+            t += rng.expovariate(1000.0)
+            f.write(f"{rng.choice(symbols)} {6000 + 0.25 * rng.randint(-200, 200)} {t:.6f}\n")
+
+async def run(args) -> None:
+    symbols = [f"MES{m}{y}" for y in range(5, 10) for m in "FGHJKMNQUVXZ"][: args.symbols]
+    with tempfile.TemporaryDirectory() as tmp:
+        marks_path = os.path.join(tmp, "marks.txt")
+        sock = os.path.join(tmp, "feed.sock")
+        write_marks(marks_path, args.n, symbols, args.seed)
+
+        provider = StreamingMarkProvider(coalesce_ms=args.coalesce_ms)
+        engine = PositionEngine(mark_provider=provider)
+        for sym in symbols:
+            engine.apply_fill(Fill(ts="", symbol=sym, side="BUY", qty=1, price=6000.0))
+        blotter = IncrementalBlotter(engine)
+        pushes = [0]
+        blotter.subscribe(lambda lines: pushes.__setitem__(0, pushes[0] + len(lines)))
+
+        feed = ReplayMarkFeed(marks_path, sock, speed=0)
+        await feed.start()
+        provider.start()
+        t0 = time.perf_counter()
+        consumer = asyncio.create_task(provider.consume_unix(sock))
+        while not consumer.done():
+            await asyncio.sleep(args.coalesce_ms / 1000.0)
+            blotter.refresh()
+        elapsed = time.perf_counter() - t0
+        await provider.stop()
+        blotter.refresh()
+        await feed.stop()
+
+    print(f"marks in:        {provider.received}")
+    print(f"marks published: {provider.published}  (coalesced x{provider.received / max(provider.published, 1):.1f})")
+    print(f"blotter pushes:  {pushes[0]}")
+    print(f"elapsed:         {elapsed:.3f}s  {provider.received / elapsed:,.0f} marks/s")
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--n", type=int, default=200_000)
+    p.add_argument("--symbols", type=int, default=50)
+    p.add_argument("--coalesce-ms", dest="coalesce_ms", type=float, default=50.0)
+    p.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(p.parse_args()))
+
+if __name__ == "__main__":
+    main()
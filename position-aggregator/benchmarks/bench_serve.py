@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Start `posagg serve` on a temp socket and measure per-fill round-trip latency
+(one fill in flight) and pipelined throughput.
+
+    python benchmarks/bench_serve.py --n 20000
+"""
+from __future__ import annotations
+import argparse, os, random, subprocess, sys, tempfile, time
+from posagg.models import Fill
+from posagg.server import Client
+
+def make_fills(n: int, seed: int, tag: str) -> list[Fill]:
+    rng = random.Random(seed)
+    return [Fill(ts="", symbol=rng.choice(("MESZ5", "MCLX5", "MNQZ5")), side=rng.choice(("BUY", "SELL")),
+                 qty=rng.randint(1, 5), price=6000 + 0.25 * rng.randint(-200, 200), fees=0.62,
+                 account=f"acct{rng.randint(0, 9)}", exec_id=f"{tag}{i}") for i in range(n)]
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--n", type=int, default=20_000)
+    p.add_argument("--window", type=int, default=1024, help="pipelined fills in flight")
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sock = os.path.join(tmp, "posagg.sock")
+        proc = subprocess.Popen([sys.executable, "-m", "posagg.cli", "serve", "--socket", sock],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(sock):
+                time.sleep(0.01)
+            c = Client(sock)
+
+            lat = []
+            for fill in make_fills(args.n, args.seed, "rt"):
+                t0 = time.perf_counter()
+                c.send_fill(fill)
+                lat.append(time.perf_counter() - t0)
+            lat.sort()
+
+            fills = make_fills(args.n * 5, args.seed + 1, "pl")
+            t0 = time.perf_counter()
+            c.send_fills(fills, window=args.window)
+            elapsed = time.perf_counter() - t0
+            stats = c.stats()
+            c.close()
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    pct = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1e6
+    print(f"round trip:  p50 {pct(0.50):.0f}us  p99 {pct(0.99):.0f}us  max {lat[-1] * 1e6:.0f}us")
+    print(f"pipelined:   {len(fills) / elapsed:,.0f} fills/s (window {args.window})")
+    print(f"server:      {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+aggregate_sharded wall time vs worker count on a multi-account fills CSV,
+against the single-process batch path (iter_fill_chunks + apply_fills_batch).
+
+    python benchmarks/bench_shard.py --n 2000000 --accounts 5000 --workers 1,2,4,8
+"""
+from __future__ import annotations
+import argparse, os, tempfile, time
+from posagg.csvload import iter_fill_chunks
+from posagg.engine import PositionEngine
+from posagg.shard import aggregate_sharded
+from posagg.synth import write_fills_csv
+
+def single(path):
+    engine = PositionEngine()
+    for c in iter_fill_chunks(path):
+        engine.apply_fills_batch(c.symbol, c.side, c.qty, c.price, c.fees, c.exec_id, ts=c.ts, account=c.account)
+    return engine
+
+def best(fn, reps):
+    out, t = None, float("inf")
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        out = fn()
+        t = min(t, time.perf_counter() - t0)
+    return out, t
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--n", type=int, default=1_000_000)
+    p.add_argument("--accounts", type=int, default=5000)
+    p.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    p.add_argument("--shard-by", dest="shard_by", default="account")
+    p.add_argument("--reps", type=int, default=2)
+    args = p.parse_args()
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "fills.csv")
+        write_fills_csv(path, args.n, accounts=args.accounts)
+        ref, t1 = best(lambda: single(path), args.reps)
+        print(f"cpus={os.cpu_count()} fills={args.n} accounts={args.accounts}")
+        print(f"single process  {t1:7.2f} s  {args.n / t1 / 1e3:7.0f} K fills/s")
+        for w in (int(x) for x in args.workers.split(",")):
+            eng, t = best(lambda: aggregate_sharded([path], workers=w, shard_by=args.shard_by), args.reps)
+            same = all(eng.positions[k].net_qty == pos.net_qty for k, pos in ref.positions.items())
+            print(f"workers={w:<3}     {t:7.2f} s  {args.n / t / 1e3:7.0f} K fills/s  "
+                  f"x{t1 / t:.2f}  {'same book' if same and len(eng.positions) == len(ref.positions) else 'MISMATCH'}")
+
+if __name__ == "__main__":
+    main()
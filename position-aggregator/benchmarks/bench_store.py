@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+dict-of-Position vs ArrayPositionStore: memory per position (tracemalloc) and
+full-book revaluation time (engine.revalue) for the same book.
+
+    python benchmarks/bench_store.py --keys 50000
+"""
+from __future__ import annotations
+import argparse, gc, random, time, tracemalloc
+import numpy as np
+from posagg.engine import PositionEngine
+from posagg.marks import StaticMarkProvider
+from posagg.models import Position
+from posagg.store import ArrayPositionStore
+from posagg.synth import SYMBOLS
+
+def build(positions, keys, seed: int):
+    rng = random.Random(seed)
+    for acct, sym in keys:
+        # fresh objects, as the engine would create them
+        positions[(acct, sym)] = Position(symbol=sym, account=acct, net_qty=rng.randint(-20, 20),
+                                          avg_price=SYMBOLS[sym] + rng.randint(-40, 40) * 0.25,
+                                          realized_pnl=rng.uniform(-1e4, 1e4), fees_cum=rng.uniform(0, 500))
+    return positions
+
+def measure(make, keys, seed):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    positions = build(make(), keys, seed)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return positions, used
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--keys", type=int, default=50_000)
+    p.add_argument("--reps", type=int, default=20)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    syms = list(SYMBOLS)
+    keys = [(f"ACC{i // len(syms):06d}", syms[i % len(syms)]) for i in range(args.keys)]
+    # key strings are shared by both stores; only the position storage is measured
+    marks = StaticMarkProvider({s: px + 1.0 for s, px in SYMBOLS.items()})
+
+    results = {}
+    for name, make in (("dict", dict), ("array", ArrayPositionStore)):
+        positions, used = measure(make, keys, args.seed)
+        engine = PositionEngine(mark_provider=marks, positions=positions)
+        engine.revalue()  # warm the instrument cache
+        t0 = time.perf_counter()
+        for _ in range(args.reps):
+            _, upl = engine.revalue()
+        results[name] = (used, (time.perf_counter() - t0) / args.reps, upl)
+
+    assert np.allclose(results["dict"][2], results["array"][2])
+    for name, (used, t, _) in results.items():
+        print(f"{name:<6} {used / args.keys:8.1f} B/position  revalue {t * 1e3:8.2f} ms"
+              f"  ({args.keys / t:,.0f} positions/s)")
+    d, a = results["dict"], results["array"]
+    print(f"memory x{d[0] / a[0]:.1f} smaller, revalue x{d[1] / a[1]:.1f} faster")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Integer tick kernel (posagg.ticks) vs the float path, checked against a
+Decimal reference.
+
+  round trips: float formula + round() vs ticks.round_trip_cents, 1M trades
+  engine:      PositionEngine float WAC vs exact=True on a synthetic fill
+               stream (apply_fills_batch), realized P&L per position in cents
+
+    python benchmarks/bench_ticks.py --trades 1000000 --fills 200000
+"""
+from __future__ import annotations
+import argparse, time
+from decimal import ROUND_HALF_EVEN, Decimal
+import numpy as np
+from posagg.engine import PositionEngine
+from posagg.instruments import default_registry
+from posagg.synth import generate_fill_chunks
+from posagg.ticks import prices_to_ticks, round_trip_cents, slippage_to_units
+
+CENT = Decimal("0.01")
+
+def best(fn, reps):
+    out, t = None, float("inf")
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        out = fn()
+        t = min(t, time.perf_counter() - t0)
+    return out, t
+
+def decimal_round_trip(entry, exit_, sign, qty, tick, dpt, fee_side, slip):
+    gross = sign * (Decimal(repr(exit_)) - Decimal(repr(entry))) / tick * dpt * qty
+    costs = 2 * fee_side * qty + Decimal(repr(slip)) * dpt * qty
+    return int((gross - costs).quantize(CENT, ROUND_HALF_EVEN) * 100)
+
+def decimal_engine(cols) -> dict:
+    # same WAC rules as ticks.TickPosition, in Decimal: (net, cost ticks, realized ticks)
+    reg = default_registry()
+    book = {}
+    for acct, sym, q, px in cols:
+        inst = reg.resolve(sym)
+        t = Decimal(repr(px)) / Decimal(repr(inst.tick_size))
+        assert t == t.to_integral_value()
+        net, cost, rpl = book.get((acct, sym), (0, Decimal(0), Decimal(0)))
+        if net == 0 or (net > 0) == (q > 0):
+            book[(acct, sym)] = (net + q, cost + t * abs(q), rpl)
+            continue
+        close = min(abs(net), abs(q))
+        rel = cost if close == abs(net) else (cost * close / abs(net)).quantize(Decimal(1), ROUND_HALF_EVEN)
+        rpl += (t * close - rel) if net > 0 else (rel - t * close)
+        rem = net + q
+        cost = Decimal(0) if rem == 0 else (cost - rel if (rem > 0) == (net > 0) else t * abs(rem))
+        book[(acct, sym)] = (rem, cost, rpl)
+    return {k: int((r * Decimal(repr(reg.resolve(k[1]).dollars_per_tick))).quantize(CENT, ROUND_HALF_EVEN) * 100)
+            for k, (_, _, r) in book.items()}
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--trades", type=int, default=1_000_000)
+    p.add_argument("--fills", type=int, default=200_000)
+    p.add_argument("--check", type=int, default=50_000, help="round trips checked against Decimal")
+    p.add_argument("--reps", type=int, default=3)
+    p.add_argument("--seed", type=int, default=11)
+    args = p.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    # --- round trips (ZN: 1/64 tick, $15.625/tick, so half cents are common) ---
+    tick, dpt, fee_side, n = 0.015625, 15.625, 0.95, args.trades
+    entry = 110.0 + rng.integers(-2000, 2000, n) * tick
+    exit_ = entry + rng.integers(-200, 200, n) * tick
+    sign = rng.choice([1, -1], n)
+    qty = rng.integers(1, 50, n)
+    slip = rng.choice([0.0, 0.5, 1.0, 1.5], n)
+
+    def float_path():
+        gross = sign * (exit_ - entry) / tick * dpt * qty
+        return np.round(gross - (2 * fee_side * qty + slip * dpt * qty), 2)
+
+    # ingest once: prices -> int64 ticks, slippage -> 1/100 ticks
+    (e, x, su), ti = best(lambda: (prices_to_ticks(entry, tick), prices_to_ticks(exit_, tick),
+                                   slippage_to_units(slip)), args.reps)
+    f, tf = best(float_path, args.reps)
+    c, tc = best(lambda: round_trip_cents(e, x, sign, qty, dpt, round(fee_side * 100), su), args.reps)
+    ref = np.array([decimal_round_trip(*row, Decimal(repr(tick)), Decimal(repr(dpt)), Decimal(repr(fee_side)), s)
+                    for *row, s in zip(entry[:args.check].tolist(), exit_[:args.check].tolist(),
+                                       sign[:args.check].tolist(), qty[:args.check].tolist(),
+                                       slip[:args.check].tolist())])
+    f_bad = int((np.rint(f[:args.check] * 100).astype(np.int64) != ref).sum())
+    c_bad = int((c[:args.check] != ref).sum())
+    print(f"round trips  n={n}: float {tf * 1e3:7.1f} ms ({f_bad} of {args.check} off the Decimal result)  "
+          f"int {tc * 1e3:7.1f} ms ({c_bad} off)  x{tf / tc:.2f}  [tick ingest {ti * 1e3:.1f} ms]")
+
+    # --- engine: float WAC vs exact ---
+    chunks = list(generate_fill_chunks(args.fills, seed=args.seed))
+
+    def run(exact):
+        eng = PositionEngine(exact=exact)
+        for ch in chunks:
+            eng.apply_fills_batch(ch.symbol, ch.side, ch.qty, ch.price, ch.fees, account=ch.account)
+        return eng
+
+    fe, tfe = best(lambda: run(False), args.reps)
+    xe, txe = best(lambda: run(True), args.reps)
+    cols = [(a, s, q if sd > 0 else -q, px) for ch in chunks
+            for a, s, sd, q, px in zip(ch.account, ch.symbol, ch.side, ch.qty, ch.price)]
+    ref = decimal_engine(cols)
+    x_bad = sum(xe.positions[k].realized_cents != v for k, v in ref.items())
+    f_bad = sum(round(fe.positions[k].realized_pnl * 100) != v for k, v in ref.items())
+    print(f"engine fills={args.fills}: float {tfe * 1e3:7.1f} ms ({f_bad} of {len(ref)} positions off)  "
+          f"exact {txe * 1e3:7.1f} ms ({x_bad} off)")
+
+if __name__ == "__main__":
+    main()
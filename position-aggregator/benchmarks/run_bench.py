@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Reproducible posagg benchmark: seeded synthetic fills (posagg.synth) at several
+sizes, per-stage timings and peak RSS, written as a JSON baseline.
+
+    python benchmarks/run_bench.py --sizes 1K,10K,100K,1M --out baseline.json
+    python benchmarks/run_bench.py --sizes 1K,10K,100K,1M --compare baseline.json
+
+Each size runs in its own child process so peak RSS is per size; every stage
+keeps its best time over --repeat runs. Stages:
+  parse        iter_fill_chunks over the CSV (typed chunked loader)
+  apply_batch  apply_fills_batch over the parsed chunks (apply time only)
+  parse_fill   csv.DictReader + cli.parse_fill per row   (first --per-row-max rows)
+  apply_fill   PositionEngine.apply_fill per row         (same rows)
+  blotter      all_blotter() with a mark on every symbol (rate = lines/s)
+"""
+from __future__ import annotations
+import argparse, csv, json, os, platform, resource, subprocess, sys, tempfile, time
+from itertools import islice
+
+SCHEMA = 1
+
+def parse_size(s: str) -> int:
+    s = s.strip().upper()
+    mult = {"K": 1_000, "M": 1_000_000}.get(s[-1:], 1)
+    return int(float(s.rstrip("KM")) * mult)
+
+def _stage(seconds: float, count: int) -> dict:
+    return {"seconds": round(seconds, 6), "count": count, "per_s": round(count / seconds, 1) if seconds else None}
+
+def _run_stages(path: str, n: int, per_row_max: int) -> dict:
+    from posagg.cli import parse_fill
+    from posagg.csvload import iter_fill_chunks
+    from posagg.engine import PositionEngine
+    from posagg.marks import StaticMarkProvider
+
+    stages = {}
+    t0 = time.perf_counter()
+    for _ in iter_fill_chunks(path):
+        pass
+    stages["parse"] = _stage(time.perf_counter() - t0, n)
+
+    engine = PositionEngine(mark_provider=StaticMarkProvider())
+    spent = 0.0
+    for c in iter_fill_chunks(path):
+        t0 = time.perf_counter()
+        engine.apply_fills_batch(c.symbol, c.side, c.qty, c.price, c.fees, c.exec_id,
+                                 ts=c.ts, account=c.account)
+        spent += time.perf_counter() - t0
+    stages["apply_batch"] = _stage(spent, n)
+
+    m = min(n, per_row_max)
+    with open(path, newline="") as f:
+        t0 = time.perf_counter()
+        fills = [parse_fill(row) for row in islice(csv.DictReader(f), m)]
+        stages["parse_fill"] = _stage(time.perf_counter() - t0, m)
+    per_fill = PositionEngine()
+    t0 = time.perf_counter()
+    for fill in fills:
+        per_fill.apply_fill(fill)
+    stages["apply_fill"] = _stage(time.perf_counter() - t0, m)
+    del fills, per_fill
+
+    for sym in {s for _, s in engine.positions}:
+        engine.mark_provider.set_mark(sym, 100.0)
+    lines = len(engine.positions)
+    reps = max(1, 200_000 // max(lines, 1))
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        engine.all_blotter()
+    stages["blotter"] = _stage(time.perf_counter() - t0, reps * lines)
+    stages["blotter"]["lines"] = lines
+    return stages
+
+def run_one(n: int, seed: int, accounts: int, per_row_max: int, repeat: int = 1) -> dict:
+    from posagg.synth import write_fills_csv
+
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fills.csv")
+        write_fills_csv(path, n, seed=seed, accounts=accounts)
+
+        for _ in range(repeat):
+            for name, st in _run_stages(path, n, per_row_max).items():
+                if name not in stages or st["seconds"] < stages[name]["seconds"]:
+                    stages[name] = st  # best of `repeat`: least disturbed by other load
+    return {
+        "n": n,
+        "positions": stages["blotter"]["lines"],
+        "stages": stages,
+        "fills_per_s": round(n / (stages["parse"]["seconds"] + stages["apply_batch"]["seconds"]), 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),  # KiB on Linux
+    }
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+def compare(base: dict, cur: dict, tol: float) -> bool:
+    """Print per-stage rate ratios; True if any stage slowed down by more than tol."""
+    old = {r["n"]: r for r in base["runs"]}
+    worse = False
+    print(f"{'N':>10}  {'STAGE':<12} {'BASE/s':>14} {'NOW/s':>14}  RATIO")
+    for run in cur["runs"]:
+        ref = old.get(run["n"])
+        if ref is None:
+            continue
+        for name, st in run["stages"].items():
+            b = ref["stages"].get(name, {}).get("per_s")
+            if not b or not st["per_s"]:
+                continue
+            ratio = st["per_s"] / b
+            flag = "  <-- slower" if ratio < 1 - tol else ""
+            worse |= bool(flag)
+            print(f"{run['n']:>10}  {name:<12} {b:>14,.0f} {st['per_s']:>14,.0f}  {ratio:5.2f}{flag}")
+    return worse
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", default="1K,10K,100K,1M", help="comma list, K/M suffixes (up to 10M)")
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--accounts", type=int, default=100)
+    p.add_argument("--per-row-max", dest="per_row_max", type=int, default=1_000_000,
+                   help="cap for the per-row parse_fill/apply_fill stages")
+    p.add_argument("--repeat", type=int, default=3, help="runs per size; the fastest time per stage is kept")
+    p.add_argument("--out", default=None, help="write the JSON baseline here (default: stdout)")
+    p.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    p.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before flagging")
+    p.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_one(args.child, args.seed, args.accounts, args.per_row_max, args.repeat)))
+        return
+
+    runs = []
+    for n in map(parse_size, args.sizes.split(",")):
+        out = subprocess.run([sys.executable, __file__, "--child", str(n), "--seed", str(args.seed),
+                              "--accounts", str(args.accounts), "--per-row-max", str(args.per_row_max),
+                              "--repeat", str(args.repeat)],
+                             capture_output=True, text=True, check=True)
+        run = json.loads(out.stdout)
+        runs.append(run)
+        st = run["stages"]
+        print(f"{n:>10,} fills  {run['fills_per_s']:>12,.0f} fills/s  parse {st['parse']['seconds']:.3f}s  "
+              f"apply {st['apply_batch']['seconds']:.3f}s  blotter {st['blotter']['per_s']:,.0f} lines/s  "
+              f"rss {run['peak_rss_mb']} MB", file=sys.stderr)
+
+    result = {
+        "schema": SCHEMA,
+        "git": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "accounts": args.accounts,
+        "runs": runs,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=1)
+    elif not args.compare:
+        print(json.dumps(result, indent=1))
+    if args.compare:
+        with open(args.compare) as f:
+            sys.exit(1 if compare(json.load(f), result, args.tolerance) else 0)
+
+if __name__ == "__main__":
+    main()
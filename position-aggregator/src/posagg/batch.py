@@ -0,0 +1,307 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+import numpy as np
+from .journal import journal_rows
+from .lots import apply_lot_fill
+from .models import DEFAULT_ACCOUNT, PosKey
+from .ticks import div_half_even, prices_to_ticks
+
+if TYPE_CHECKING:
+    from .engine import PositionEngine
+
+def _signed_qty(side, qty: np.ndarray) -> np.ndarray:
+    side_arr = np.asarray(side)
+    if side_arr.dtype.kind in "iuf":
+        # already numeric: >0 is BUY, anything else SELL
+        return np.where(side_arr > 0, qty, -qty)
+    side_arr = side_arr.astype(str)
+    is_buy = side_arr == "BUY"
+    odd = ~is_buy & (side_arr != "SELL")
+    if odd.any():
+        # only case-fold the rows that are not already canonical
+        folded = np.char.upper(side_arr[odd])
+        is_buy[odd] = folded == "BUY"
+        bad = (folded != "BUY") & (folded != "SELL")
+        if bad.any():
+            i = int(np.flatnonzero(odd)[np.argmax(bad)])
+            raise ValueError(f"bad side {str(side_arr[i])!r} (row {i})")
+    return np.where(is_buy, qty, -qty)
+
+def _validate(engine: PositionEngine, sym_arr: np.ndarray, qty_arr: np.ndarray, price_arr: np.ndarray,
+              ts: Optional[Sequence[str]]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    # everything that can reject a row, checked before dedup or the journal see it; hands back
+    # the prices in ticks (exact mode) and the session days (day_sessions) so each is computed once
+    if (qty_arr < 0).any():
+        i = int(np.argmax(qty_arr < 0))
+        raise ValueError(f"qty must not be negative (side gives the direction), got {int(qty_arr[i])} (row {i})")
+    days = None
+    if engine.day_sessions is not None and ts is not None:
+        from .daypnl import session_days
+        days = session_days(engine.day_sessions, ts)
+    if not engine.exact:
+        for sym in set(sym_arr.tolist()):
+            engine._tickmath(sym)     # UnknownInstrumentError for symbols the registry can't resolve
+        return None, days
+    sym_u, inv = np.unique(sym_arr, return_inverse=True)
+    tick = np.array([engine._tickmath(sym)[0] for sym in sym_u.tolist()])
+    return prices_to_ticks(price_arr, tick[inv]), days
+
+def _keep_mask(engine: PositionEngine, exec_id: Optional[Sequence], ts: Optional[Sequence], n: int) -> np.ndarray:
+    keep = np.ones(n, dtype=bool)
+    if exec_id is None:
+        return keep
+    check = engine.dedup.check_and_add
+    for i, eid in enumerate(exec_id):
+        if eid and check(eid, ts[i] if ts is not None else ""):
+            keep[i] = False
+    return keep
+
+def _group_keys(account: Optional[np.ndarray], symbol: np.ndarray) -> Tuple[List[PosKey], np.ndarray]:
+    # dense group id per row for the (account, symbol) pair, plus the pairs themselves
+    sym_u, sym_inv = np.unique(symbol, return_inverse=True)
+    if account is None:
+        return [(DEFAULT_ACCOUNT, s) for s in sym_u.tolist()], sym_inv
+    acct_u, acct_inv = np.unique(account, return_inverse=True)
+    code = acct_inv.astype(np.int64) * len(sym_u) + sym_inv
+    code_u, inv = np.unique(code, return_inverse=True)
+    accts, syms = acct_u.tolist(), sym_u.tolist()
+    keys = [(accts[c // len(sym_u)], syms[c % len(sym_u)]) for c in code_u.tolist()]
+    return keys, inv
+
+def _affine_scan(alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+    # Inclusive scan of x_i = alpha_i * x_{i-1} + beta_i (Hillis-Steele doubling).
+    # alpha == 0 starts a new segment, so symbol boundaries and flat/flip resets
+    # need no extra bookkeeping.
+    a = alpha.copy()
+    b = beta.copy()
+    n = a.shape[0]
+    d = 1
+    while d < n:
+        b[d:] = a[d:] * b[:-d] + b[d:]
+        a[d:] = a[d:] * a[:-d]
+        d <<= 1
+    return b
+
+def apply_fills_batch(
+    engine: PositionEngine,
+    symbol: Sequence[str],
+    side,
+    qty,
+    price,
+    fees=None,
+    exec_id: Optional[Sequence] = None,
+    ts: Optional[Sequence[str]] = None,
+    account: Optional[Sequence[str]] = None,
+    note: Optional[Sequence[str]] = None,
+    return_mask: bool = False,
+):
+    """Apply columnar fills; same WAC / lot / realized / flip rules as apply_fill.
+
+    Rows are applied in the given order within each (account, symbol); a
+    missing account column books everything to the default account. Returns
+    the number of rows applied after exec_id dedup, or with return_mask the
+    boolean mask of applied rows (False = duplicate).
+    """
+    sym_arr = np.asarray(symbol)
+    n = sym_arr.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=bool) if return_mask else 0
+    qty_arr = np.asarray(qty, dtype=np.int64)
+    price_arr = np.asarray(price, dtype=np.float64)
+    fees_arr = np.zeros(n) if fees is None else np.asarray(fees, dtype=np.float64)
+
+    sq = _signed_qty(side, qty_arr)
+    px_ticks, days = _validate(engine, sym_arr, qty_arr, price_arr, ts)
+    keep = _keep_mask(engine, exec_id, ts, n)
+    if engine.journal is not None:
+        # write-ahead: log the rows that passed dedup before touching positions
+        engine.journal.append_rows(journal_rows(np.flatnonzero(keep), ts, sym_arr, sq, price_arr, fees_arr,
+                                                account=account, exec_id=exec_id, note=note))
+    acct_arr = np.asarray(account) if account is not None else None
+    if not keep.all():
+        sym_arr, sq, price_arr, fees_arr = sym_arr[keep], sq[keep], price_arr[keep], fees_arr[keep]
+        if px_ticks is not None:
+            px_ticks = px_ticks[keep]
+        if acct_arr is not None:
+            acct_arr = acct_arr[keep]
+        n = sym_arr.shape[0]
+    if not n:
+        return keep if return_mask else n
+    runs = []
+    if days is not None:
+        from .daypnl import session_runs
+        runs = session_runs(days[keep], engine.session_date)
+    # apply up to each session boundary, roll the day buckets, carry on
+    px = price_arr if px_ticks is None else px_ticks
+    a = 0
+    for row, session in runs + [(n, None)]:
+        if row > a:
+            acct = acct_arr[a:row] if acct_arr is not None else None
+            _apply_rows(engine, sym_arr[a:row], acct, sq[a:row], px[a:row], fees_arr[a:row])
+        if session is not None:
+            engine.roll_day(session)
+        a = row
+    return keep if return_mask else n
+
+def _apply_rows(engine: PositionEngine, sym_arr, acct_arr, sq, px, fees_arr) -> None:
+    # px is in ticks in exact mode (see _validate), prices otherwise
+    if engine.exact:
+        _apply_ticks_rows(engine, sym_arr, acct_arr, sq, px, fees_arr)
+    elif engine.accounting != "wac":
+        _apply_lots_rows(engine, sym_arr, acct_arr, sq, px, fees_arr)
+    else:
+        _apply_wac_rows(engine, sym_arr, acct_arr, sq, px, fees_arr)
+
+def _apply_wac_rows(engine: PositionEngine, sym_arr, acct_arr, sq, price_arr, fees_arr) -> None:
+    n = sym_arr.shape[0]
+    # group rows by (account, symbol), preserving fill order inside each group
+    uniq, inv = _group_keys(acct_arr, sym_arr)
+    order = np.argsort(inv, kind="stable")
+    inv = inv[order]
+    sq, px, fe = sq[order], price_arr[order], fees_arr[order]
+    starts = np.flatnonzero(np.r_[True, inv[1:] != inv[:-1]])
+    ends = np.r_[starts[1:], n]
+    seg_len = ends - starts
+
+    # carry-in state and tick math per symbol
+    k = len(uniq)
+    net0 = np.empty(k, dtype=np.int64)
+    avg0 = np.empty(k)
+    rpl0 = np.empty(k)
+    fee0 = np.empty(k)
+    tick = np.empty(k)
+    dpt = np.empty(k)
+    positions = []
+    for j, (acct, sym) in enumerate(uniq):
+        pos = engine._get_pos(sym, acct)
+        positions.append(pos)
+        net0[j], avg0[j], rpl0[j], fee0[j] = pos.net_qty, pos.avg_price, pos.realized_pnl, pos.fees_cum
+        tick[j], dpt[j] = engine._tickmath(sym)
+
+    # net position before/after each fill (segmented cumsum)
+    csum = np.cumsum(sq)
+    seg_base = np.repeat(csum[starts] - sq[starts] - net0, seg_len)
+    net_after = csum - seg_base
+    net_before = net_after - sq
+    nb = np.abs(net_before)
+    na = np.abs(net_after)
+
+    opening = (net_before == 0) & (sq != 0)    # a qty-0 fill only books its fees
+    adding = (net_before != 0) & (np.sign(net_before) == np.sign(sq))
+    reducing = ~opening & ~adding & (sq != 0)
+    flipping = reducing & (net_after != 0) & (np.sign(net_after) != np.sign(net_before))
+
+    # avg price recurrence: avg_i = alpha_i * avg_{i-1} + beta_i
+    alpha = np.ones(n)
+    beta = np.zeros(n)
+    alpha[opening] = 0.0
+    beta[opening] = px[opening]
+    alpha[adding] = nb[adding] / na[adding]
+    beta[adding] = px[adding] * np.abs(sq[adding]) / na[adding]
+    to_flat = reducing & (net_after == 0)
+    alpha[to_flat | flipping] = 0.0
+    beta[flipping] = px[flipping]
+
+    # fold the carry-in average into the first row of every symbol
+    beta[starts] = alpha[starts] * avg0 + beta[starts]
+    alpha[starts] = 0.0
+    avg = _affine_scan(alpha, beta)
+
+    avg_before = np.empty(n)
+    avg_before[1:] = avg[:-1]
+    avg_before[starts] = avg0
+
+    tick_r = np.repeat(tick, seg_len)
+    dpt_r = np.repeat(dpt, seg_len)
+    close_qty = np.minimum(nb, np.abs(sq))
+    direction = np.sign(net_before)
+    realized = np.where(
+        reducing,
+        direction * (px - avg_before) / tick_r * dpt_r * close_qty,
+        0.0,
+    )
+
+    last = ends - 1
+    rpl_sum = np.add.reduceat(realized, starts)
+    fee_sum = np.add.reduceat(fe, starts)
+    for j, pos in enumerate(positions):
+        i = last[j]
+        pos.net_qty = int(net_after[i])
+        pos.avg_price = float(avg[i])
+        pos.realized_pnl = float(rpl0[j] + rpl_sum[j])
+        pos.fees_cum = float(fee0[j] + fee_sum[j])
+    if engine.fill_listeners:
+        for key in uniq:
+            for listener in engine.fill_listeners:
+                listener(key)
+
+def _apply_lots_rows(engine: PositionEngine, sym_arr, acct_arr, sq, price_arr, fees_arr) -> None:
+    # lot queues are inherently sequential: walk the rows, O(1) amortized each
+    lifo = engine.accounting == "lifo"
+    accts = acct_arr.tolist() if acct_arr is not None else None
+    touched = {}
+    for i, (sym, q, px, fee) in enumerate(zip(sym_arr.tolist(), sq.tolist(), price_arr.tolist(), fees_arr.tolist())):
+        key = (accts[i] if accts is not None else DEFAULT_ACCOUNT, sym)
+        hit = touched.get(key)
+        if hit is None:
+            hit = touched[key] = (engine._get_pos(sym, key[0]), *engine._tickmath(sym))
+        pos, tick_size, dollars_per_tick = hit
+        pos.realized_pnl += apply_lot_fill(pos, q, px, lifo) / tick_size * dollars_per_tick
+        pos.fees_cum += fee
+    if engine.fill_listeners:
+        for key in touched:
+            for listener in engine.fill_listeners:
+                listener(key)
+
+def _apply_ticks_rows(engine: PositionEngine, sym_arr, acct_arr, sq, px_ticks, fees_arr) -> None:
+    # exact mode: prices arrive as int64 ticks (_validate) and fees go to cents
+    # in one vectorized pass, then each (account, symbol) run is booked with plain
+    # integer math; same rules as ticks.TickPosition.apply_ticks, inlined for speed
+    uniq, inv = _group_keys(acct_arr, sym_arr)
+    fee_cents = np.rint(fees_arr * 100).astype(np.int64)
+    order = np.argsort(inv, kind="stable")
+    inv = inv[order]
+    starts = np.flatnonzero(np.r_[True, inv[1:] != inv[:-1]])
+    bounds = np.r_[starts, len(inv)].tolist()
+    fee_sum = np.add.reduceat(fee_cents[order], starts).tolist()
+    sq_l, px_l = sq[order].tolist(), px_ticks[order].tolist()
+    for j, (acct, sym) in enumerate(uniq):
+        pos = engine._get_pos(sym, acct)
+        net, cost, rpl = pos.net_qty, pos.cost_ticks, pos.realized_ticks
+        for i in range(bounds[j], bounds[j + 1]):
+            q, px = sq_l[i], px_l[i]
+            if net > 0:
+                if q > 0:
+                    cost += px * q
+                    net += q
+                    continue
+                # long reduced by -q
+                close = -q if -q < net else net
+                released = cost if close == net else div_half_even(cost * close, net)
+                rpl += px * close - released
+            elif net < 0:
+                if q < 0:
+                    cost -= px * q
+                    net += q
+                    continue
+                close = q if q < -net else -net
+                released = cost if close == -net else div_half_even(cost * close, -net)
+                rpl += released - px * close
+            else:
+                cost = px * (q if q > 0 else -q)
+                net = q
+                continue
+            remaining = net + q
+            if remaining == 0:
+                cost = 0
+            elif (remaining > 0) == (net > 0):
+                cost -= released
+            else:
+                cost = px * (remaining if remaining > 0 else -remaining)
+            net = remaining
+        pos.net_qty, pos.cost_ticks, pos.realized_ticks = net, cost, rpl
+        pos.fees_cents += fee_sum[j]
+    if engine.fill_listeners:
+        for key in uniq:
+            for listener in engine.fill_listeners:
+                listener(key)
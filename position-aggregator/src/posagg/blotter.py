@@ -0,0 +1,77 @@
+from __future__ import annotations
+from bisect import insort
+from typing import Callable, Dict, List, Set
+from .engine import PositionEngine
+from .models import BlotterLine, PosKey
+
+BlotterListener = Callable[[List[BlotterLine]], None]
+
+class IncrementalBlotter:
+    """Blotter that only rebuilds lines for positions touched by a fill or a mark.
+
+    Fills and mark changes just mark (account, symbol) keys dirty; refresh()
+    rebuilds the dirty lines, keeps the key order sorted incrementally and
+    pushes the lines that actually changed to subscribers. With auto_refresh
+    the push happens on every event instead of batching until the next
+    refresh().
+    """
+    def __init__(self, engine: PositionEngine, auto_refresh: bool = False):
+        self.engine = engine
+        self.auto_refresh = auto_refresh
+        self._lines: Dict[PosKey, BlotterLine] = {}
+        self._order: List[PosKey] = []
+        self._dirty: Set[PosKey] = set()
+        self._keys_by_symbol: Dict[str, Set[PosKey]] = {}
+        self._listeners: List[BlotterListener] = []
+        for key in engine.positions:
+            self._track(key)
+        engine.fill_listeners.append(self._touch)
+        if engine.mark_provider is not None:
+            engine.mark_provider.subscribe(self._on_mark)
+
+    def _track(self, key: PosKey) -> None:
+        self._dirty.add(key)
+        self._keys_by_symbol.setdefault(key[1], set()).add(key)
+
+    def _touch(self, key: PosKey) -> None:
+        self._track(key)
+        if self.auto_refresh:
+            self.refresh()
+
+    def _on_mark(self, symbol: str, price: float) -> None:
+        # one mark moves every account holding the symbol; others are ignored
+        keys = self._keys_by_symbol.get(symbol)
+        if keys:
+            self._dirty.update(keys)
+            if self.auto_refresh:
+                self.refresh()
+
+    def subscribe(self, listener: BlotterListener) -> None:
+        self._listeners.append(listener)
+
+    def refresh(self) -> List[BlotterLine]:
+        """Rebuild dirty lines; returns (and pushes) only the ones that changed."""
+        if not self._dirty:
+            return []
+        dirty, self._dirty = self._dirty, set()
+        changed: List[BlotterLine] = []
+        for key in sorted(dirty):
+            if key not in self.engine.positions:
+                continue
+            line = self.engine.blotter_line(key[1], key[0])
+            old = self._lines.get(key)
+            if old is None:
+                insort(self._order, key)
+            elif old == line:
+                continue
+            self._lines[key] = line
+            changed.append(line)
+        if changed:
+            for listener in self._listeners:
+                listener(changed)
+        return changed
+
+    def lines(self) -> List[BlotterLine]:
+        """Full blotter in (account, symbol) order (same content as engine.all_blotter())."""
+        self.refresh()
+        return [self._lines[key] for key in self._order]
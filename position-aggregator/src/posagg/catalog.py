@@ -0,0 +1,151 @@
+from __future__ import annotations
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .instruments import InstrumentRegistry, default_registry
+
+FEES_FILE = Path(__file__).with_name("data") / "fee_plans.csv"
+DEFAULT_PLAN = "free"
+
+class UnknownFeePlanError(KeyError):
+    pass
+
+@dataclass(frozen=True)
+class FeePlan:
+    plan: str                   # "free", "no_commission", ...
+    root: str
+    exchange_per_side: float
+    clearing_per_side: float
+    nfa_per_side: float
+    commission_per_side: float
+
+    @property
+    def per_side(self) -> float:
+        # same summation order as ch11 per_side_total(), so results match to the bit
+        return self.exchange_per_side + self.clearing_per_side + self.nfa_per_side + self.commission_per_side
+
+@dataclass(frozen=True)
+class CostEntry:
+    """Per-contract constants for one (root, plan), computed once at load."""
+    root: str
+    plan: str
+    tick_size: float
+    dollars_per_tick: float
+    usd_per_point: float        # dollars_per_tick / tick_size
+    per_side: float             # fees per contract per side
+    round_trip: float           # 2 * per_side
+    round_trip_ticks: float     # round_trip / dollars_per_tick: ticks to cover fees
+
+class FeeCatalog:
+    """Contract specs x broker fee plans, flattened into lookup tables.
+
+    Every (root, plan) pair gets a CostEntry plus a row in NumPy tables
+    indexed [root_id, plan_id], so bulk P&L over mixed instruments is one
+    symbol -> root id resolve per distinct symbol and fancy indexing after
+    that.
+    """
+    def __init__(self, plans: Sequence[FeePlan], registry: Optional[InstrumentRegistry] = None):
+        self.registry = registry or default_registry()
+        self.roots: List[str] = sorted(self.registry.roots)
+        self.plans: List[str] = sorted({p.plan for p in plans}, key=lambda n: (n != DEFAULT_PLAN, n))
+        self._root_id = {r: i for i, r in enumerate(self.roots)}
+        self._plan_id = {p: i for i, p in enumerate(self.plans)}
+        self.fee_plans: Dict[Tuple[str, str], FeePlan] = {}
+
+        nr, np_ = len(self.roots), len(self.plans)
+        self.tick_size = np.array([self.registry.roots[r].tick_size for r in self.roots])
+        self.dollars_per_tick = np.array([self.registry.roots[r].dollars_per_tick for r in self.roots])
+        self.usd_per_point = self.dollars_per_tick / self.tick_size
+        self.per_side = np.full((nr, np_), np.nan)   # NaN: no fee row for that pair
+        self.entries: Dict[Tuple[str, str], CostEntry] = {}
+        for p in plans:
+            i = self._root_id.get(p.root)
+            if i is None:
+                continue  # fee row for a root the registry does not know
+            self.fee_plans[(p.root, p.plan)] = p
+            self.per_side[i, self._plan_id[p.plan]] = p.per_side
+            spec = self.registry.roots[p.root]
+            self.entries[(p.root, p.plan)] = CostEntry(
+                root=p.root, plan=p.plan, tick_size=spec.tick_size, dollars_per_tick=spec.dollars_per_tick,
+                usd_per_point=spec.dollars_per_tick / spec.tick_size, per_side=p.per_side,
+                round_trip=2 * p.per_side, round_trip_ticks=2 * p.per_side / spec.dollars_per_tick)
+        self.round_trip = 2 * self.per_side
+        self._sym_root: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = FEES_FILE,
+             registry: Optional[InstrumentRegistry] = None) -> "FeeCatalog":
+        # CSV columns: plan,root,exchange_per_side,clearing_per_side,nfa_per_side,commission_per_side
+        plans = []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                plans.append(FeePlan(
+                    plan=row["plan"].strip(),
+                    root=row["root"].strip().upper(),
+                    exchange_per_side=float(row["exchange_per_side"]),
+                    clearing_per_side=float(row["clearing_per_side"]),
+                    nfa_per_side=float(row["nfa_per_side"]),
+                    commission_per_side=float(row["commission_per_side"]),
+                ))
+        return cls(plans, registry)
+
+    # --- scalar ---
+    def root_id(self, symbol: str) -> int:
+        rid = self._sym_root.get(symbol)
+        if rid is None:
+            rid = self._sym_root[symbol] = self._root_id[self.registry.root_of(symbol)]
+        return rid
+
+    def plan_id(self, plan: str) -> int:
+        try:
+            return self._plan_id[plan]
+        except KeyError:
+            raise UnknownFeePlanError(f"unknown fee plan '{plan}' (known: {', '.join(self.plans)})") from None
+
+    def cost(self, symbol: str, plan: str = DEFAULT_PLAN) -> CostEntry:
+        root = self.roots[self.root_id(symbol)]
+        entry = self.entries.get((root, plan))
+        if entry is None:
+            self.plan_id(plan)
+            raise UnknownFeePlanError(f"no '{plan}' fees for {root}")
+        return entry
+
+    def fee_plan(self, symbol: str, plan: str = DEFAULT_PLAN) -> FeePlan:
+        self.cost(symbol, plan)
+        return self.fee_plans[(self.roots[self.root_id(symbol)], plan)]
+
+    # --- bulk ---
+    def root_ids(self, symbols) -> np.ndarray:
+        """Root id per row: one registry resolve per distinct symbol."""
+        sym_u, inv = np.unique(np.asarray(symbols, dtype=str), return_inverse=True)
+        return np.array([self.root_id(s) for s in sym_u.tolist()], dtype=np.intp)[inv]
+
+    def plan_ids(self, plans) -> np.ndarray:
+        plan_u, inv = np.unique(np.asarray(plans, dtype=str), return_inverse=True)
+        return np.array([self.plan_id(p) for p in plan_u.tolist()], dtype=np.intp)[inv]
+
+    def pnl_batch(self, symbols, sign, qty, entry, exit, plan=DEFAULT_PLAN, slippage_ticks_rt=0.0) -> np.ndarray:
+        """Net $ P&L of round trips over mixed instruments (not rounded).
+
+        sign is +1 long / -1 short; plan is one name or a name per row.
+        Per-row constants ($/point, $/tick, round-trip fees) come from the
+        precomputed tables.
+        """
+        rid = self.root_ids(symbols)
+        pid = self.plan_ids(plan) if np.ndim(plan) else self.plan_id(plan)
+        rt = self.round_trip[rid, pid]
+        if np.isnan(rt).any():
+            i = int(np.flatnonzero(np.isnan(rt))[0])
+            raise UnknownFeePlanError(f"no fees for row {i} ({self.roots[rid[i]]})")
+        qty = np.asarray(qty, dtype=np.float64)
+        gross = np.asarray(sign) * (np.asarray(exit, dtype=np.float64) - np.asarray(entry, dtype=np.float64)) \
+            * self.usd_per_point[rid] * qty
+        return gross - (rt + np.asarray(slippage_ticks_rt, dtype=np.float64) * self.dollars_per_tick[rid]) * qty
+
+@lru_cache(maxsize=None)
+def default_catalog() -> FeeCatalog:
+    """Process-wide catalog: packaged fee_plans.csv over the default instrument registry."""
+    return FeeCatalog.load()
@@ -1,9 +1,16 @@
 from __future__ import annotations
-import argparse, csv, sys
+import argparse, sys
 from pathlib import Path
+from typing import Optional
 from .models import Fill
 from .engine import PositionEngine
 from .marks import StaticMarkProvider
+from .csvload import DEFAULT_CHUNK_ROWS, iter_fill_chunks
+from .dedup import DEDUP_KINDS, make_dedup
+from .journal import StateStore
+from .store import ArrayPositionStore
+from .lots import ACCOUNTING
+from .merge import expand_paths, iter_merged_chunks
 
 def parse_fill(row: dict) -> Fill:
     # CSV columns: ts,symbol,side,qty,price,fees,account,exec_id,note
@@ -19,16 +26,79 @@ def parse_fill(row: dict) -> Fill:
         note=row.get("note",""),
     )
 
-def cmd_load_csv(args) -> None:
-    engine = PositionEngine(mark_provider=StaticMarkProvider())
-    with open(args.path, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            engine.apply_fill(parse_fill(row))
+def _engine_kwargs(args) -> dict:
+    positions = ArrayPositionStore() if args.store == "array" else {}
+    kw = dict(mark_provider=StaticMarkProvider(), accounting=args.accounting, positions=positions,
+              exact=args.exact)
+    if args.day_pnl:
+        from .daypnl import session_calendar
+        kw["day_sessions"] = session_calendar()
+    return kw
+
+def _make_engine(args) -> tuple[PositionEngine, Optional[StateStore]]:
+    dedup = make_dedup(args.dedup, path=args.dedup_path)
+    if args.state_dir is None:
+        engine, store = PositionEngine(dedup=dedup, **_engine_kwargs(args)), None
+    else:
+        # resume from snapshot + journal tail; new fills are journaled
+        store = StateStore(args.state_dir, snapshot_every=args.snapshot_every)
+        engine = store.open(dedup=dedup, **_engine_kwargs(args))
+    if args.metrics:
+        engine.instrument()
+    return engine, store
+
+def _finish(engine: PositionEngine, store: Optional[StateStore], args) -> None:
+    if store is not None:
+        store.close()
+    else:
+        engine.dedup.close()
     _print_blotter(engine)
+    if args.dedup_stats:
+        stats = engine.dedup.stats.as_dict()
+        print("dedup: " + "  ".join(f"{k}={v}" for k, v in stats.items()))
+    if args.metrics and engine.metrics is not None:
+        text = engine.metrics.dump(args.metrics)
+        if args.metrics_out is None:
+            sys.stderr.write(text)
+        else:
+            args.metrics_out.write_text(text)
+
+def cmd_load_csv(args) -> None:
+    paths = expand_paths(args.paths)
+    if len(paths) == 1 and args.workers > 1:
+        if args.state_dir is not None or args.dedup != "exact" or str(paths[0]) == "-" or args.day_pnl:
+            sys.exit("--workers needs a local file, the exact dedup index, no --state-dir and no --day-pnl")
+        from .shard import aggregate_sharded
+        from .metrics import Metrics
+        metrics = Metrics()
+        with metrics.timer("aggregate_sharded"):
+            engine = aggregate_sharded(paths, workers=args.workers, shard_by=args.shard_by,
+                                       chunk_rows=args.chunk_rows, **_engine_kwargs(args))
+        if args.metrics:
+            engine.instrument(metrics)
+        _finish(engine, None, args)
+        return
+    if len(paths) > 1:
+        if Path("-") in paths:
+            sys.exit('stdin ("-") can only be loaded on its own')
+        # several exports: k-way merge on ts, parsed ahead by --workers processes
+        chunks = iter_merged_chunks(paths, chunk_rows=args.chunk_rows,
+                                    workers=args.workers if args.workers > 1 else 0)
+    else:
+        chunks = iter_fill_chunks(paths[0], chunk_rows=args.chunk_rows)
+    engine, store = _make_engine(args)
+    if engine.metrics is not None:
+        chunks = engine.metrics.timed_iter("parse", chunks, rows_counter="rows")
+    # bounded memory: one typed chunk in flight at a time
+    for chunk in chunks:
+        engine.apply_fills_batch(chunk.symbol, chunk.side, chunk.qty, chunk.price, chunk.fees,
+                                 chunk.exec_id, ts=chunk.ts, account=chunk.account, note=chunk.note)
+        if store is not None:
+            store.maybe_snapshot()
+    _finish(engine, store, args)
 
 def cmd_add_fill(args) -> None:
-    engine = PositionEngine(mark_provider=StaticMarkProvider())
+    engine, store = _make_engine(args)
     # allow a single manual fill for quick testing
     fill = Fill(
         ts=args.ts,
@@ -41,25 +111,83 @@ def cmd_add_fill(args) -> None:
         exec_id=args.exec_id,
     )
     engine.apply_fill(fill)
-    _print_blotter(engine)
+    _finish(engine, store, args)
+
+def cmd_serve(args) -> None:
+    import asyncio
+    from .server import FillServer
+    engine, store = _make_engine(args)
+    server = FillServer(engine, store, max_batch=args.max_batch)
+    print(f"posagg serving on {args.socket}", file=sys.stderr)
+    asyncio.run(server.serve(args.socket))
+    _finish(engine, store, args)
 
 def _print_blotter(engine: PositionEngine) -> None:
     lines = engine.all_blotter()
     if not lines:
         print("No positions.")
         return
-    print("SYMBOL  NET  AVG_PRICE   MARK      UPL       RPL       FEES     NLV_DELTA")
+    # account column only when the book holds more than one account
+    multi = len({bl.account for bl in lines}) > 1
+    acct_w = max(len("ACCOUNT"), *(len(bl.account) for bl in lines)) if multi else 0
+    day = engine.day_sessions is not None
+    if day:
+        print(f"session {engine.session_date or '--'}")
+    print(("ACCOUNT".ljust(acct_w) + "  " if multi else "") +
+          "SYMBOL  NET  AVG_PRICE   MARK      UPL       RPL       FEES     NLV_DELTA" +
+          ("   DAY_RPL  DAY_FEES" if day else ""))
     for bl in lines:
         mark_str = f"{bl.mark:.2f}" if bl.mark is not None else "--"
-        print(f"{bl.symbol:<6} {bl.net_qty:>4}  {bl.avg_price:>9.2f}  {mark_str:>7}  "
-              f"{bl.upl:>8.2f}  {bl.rpl:>8.2f}  {bl.fees:>8.2f}  {bl.nlv_delta:>10.2f}")
+        if bl.stale:
+            mark_str += "*"
+        acct = f"{bl.account:<{acct_w}}  " if multi else ""
+        print(f"{acct}{bl.symbol:<6} {bl.net_qty:>4}  {bl.avg_price:>9.2f}  {mark_str:>7}  "
+              f"{bl.upl:>8.2f}  {bl.rpl:>8.2f}  {bl.fees:>8.2f}  {bl.nlv_delta:>10.2f}" +
+              (f"  {bl.day_rpl:>8.2f}  {bl.day_fees:>8.2f}" if day else ""))
+
+def _add_dedup_args(sp) -> None:
+    sp.add_argument("--dedup", choices=DEDUP_KINDS, default="exact", help="exec_id dedup index")
+    sp.add_argument("--dedup-path", dest="dedup_path", type=Path, default=None,
+                    help="SQLite file for --dedup sqlite/bloom (persists across runs)")
+    sp.add_argument("--dedup-stats", dest="dedup_stats", action="store_true", help="print dedup metrics")
+
+def _add_engine_args(sp) -> None:
+    sp.add_argument("--accounting", choices=ACCOUNTING, default="wac",
+                    help="cost basis: weighted average, or FIFO/LIFO lots")
+    sp.add_argument("--store", choices=["dict", "array"], default="dict",
+                    help="position storage: dict of Position objects, or struct-of-arrays")
+    sp.add_argument("--exact", action="store_true",
+                    help="integer tick/cent positions: no float drift in realized P&L (WAC, dict store)")
+    sp.add_argument("--day-pnl", dest="day_pnl", action="store_true",
+                    help="bucket realized P&L / fees by CME trading session (needs trading_calendar_mini)")
+    sp.add_argument("--metrics", choices=["json", "prom"], default=None,
+                    help="time parse/apply/dedup/mark/blotter stages and dump histograms at exit")
+    sp.add_argument("--metrics-out", dest="metrics_out", type=Path, default=None,
+                    help="write the --metrics dump here instead of stderr")
+
+def _add_state_args(sp) -> None:
+    sp.add_argument("--state-dir", dest="state_dir", type=Path, default=None,
+                    help="keep positions across runs (snapshot + fill journal)")
+    sp.add_argument("--snapshot-every", dest="snapshot_every", type=int, default=50_000,
+                    help="journaled fills between snapshots")
 
 def main():
     p = argparse.ArgumentParser(prog="posagg", description="Position Aggregator")
     sub = p.add_subparsers(dest="cmd", required=True)
 
     p_csv = sub.add_parser("load-csv", help="Load fills from CSV and show blotter")
-    p_csv.add_argument("path", type=Path)
+    p_csv.add_argument("paths", type=Path, nargs="+", metavar="path",
+                       help='fills CSV(s) or glob; several files are merged in ts order ("-" for stdin)')
+    p_csv.add_argument("--chunk-rows", dest="chunk_rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                       help="rows parsed and applied per chunk")
+    p_csv.add_argument("--workers", type=int, default=1,
+                       help="N processes: one file is aggregated as a sharded book; "
+                            "several files are parsed in parallel ahead of the merge")
+    p_csv.add_argument("--shard-by", dest="shard_by", choices=["account", "account-symbol"],
+                       default="account", help="how --workers splits the book")
+    _add_dedup_args(p_csv)
+    _add_state_args(p_csv)
+    _add_engine_args(p_csv)
     p_csv.set_defaults(func=cmd_load_csv)
 
     p_add = sub.add_parser("add-fill", help="Add a single fill and show blotter")
@@ -70,8 +198,20 @@ def main():
     p_add.add_argument("--price", required=True, type=float)
     p_add.add_argument("--fees", type=float, default=0.0)
     p_add.add_argument("--exec-id", dest="exec_id", default=None)
+    _add_dedup_args(p_add)
+    _add_state_args(p_add)
+    _add_engine_args(p_add)
     p_add.set_defaults(func=cmd_add_fill)
 
+    p_srv = sub.add_parser("serve", help="Keep the engine resident and take fills/queries on a Unix socket")
+    p_srv.add_argument("--socket", type=Path, default=Path("posagg.sock"), help="Unix socket path")
+    p_srv.add_argument("--max-batch", dest="max_batch", type=int, default=4096,
+                       help="apply queued fills once this many are waiting")
+    _add_dedup_args(p_srv)
+    _add_state_args(p_srv)
+    _add_engine_args(p_srv)
+    p_srv.set_defaults(func=cmd_serve)
+
     args = p.parse_args()
     args.func(args)
 
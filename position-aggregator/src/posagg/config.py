@@ -6,10 +6,19 @@ class SymbolConfig:
     tick_size: float         # price increment (e.g., MES = 0.25, MCL = 0.01)
     dollars_per_tick: float  # tick value in USD (MES ≈ 1.25, MCL = 1.00)
 
-DEFAULTS = {
-    "MES": SymbolConfig(symbol_root="MES", tick_size=0.25, dollars_per_tick=1.25),
-    "MCL": SymbolConfig(symbol_root="MCL", tick_size=0.01, dollars_per_tick=1.00),
-}
+# One entry per root in data/instruments.csv (engine tick math resolves through
+# instruments.default_registry(); per-root fee plans live in catalog.default_catalog()).
+def _defaults() -> dict:
+    from .instruments import default_registry
+    return {r: SymbolConfig(symbol_root=r, tick_size=s.tick_size, dollars_per_tick=s.dollars_per_tick)
+            for r, s in default_registry().roots.items()}
 
-DAY_RESET_HOUR_ET = 17  # CME typical session close; day P&L reset marker if you want to use it later
+DEFAULTS = _defaults()
+
+# Day P&L rolls to the next trading session at this hour, New York time (see daypnl).
+# 17:00 ET is CME's 16:00 CT close; nothing trades before the 17:00 CT reopen.
+DAY_RESET_HOUR_ET = 17
+DAY_RESET_TZ = "America/New_York"
+DAY_CALENDAR_MARKET = "cme_es"  # trading_calendar market whose weekends / holidays are skipped
+FILL_TS_TZ = "UTC"              # zone for fill timestamps without an offset
 
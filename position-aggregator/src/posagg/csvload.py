@@ -0,0 +1,161 @@
+from __future__ import annotations
+import csv, io, itertools, mmap, os, sys
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+from .models import Fill
+
+# CSV columns: ts,symbol,side,qty,price,fees,account,exec_id,note
+COLUMNS = ("ts", "symbol", "side", "qty", "price", "fees", "account", "exec_id", "note")
+REQUIRED = ("symbol", "side", "qty", "price")
+
+DEFAULT_CHUNK_ROWS = 65_536
+_MMAP_BLOCK = 4 << 20  # bytes decoded per slice of the mapped file
+_SIDES = {"BUY": 1, "SELL": -1}
+
+@dataclass
+class FillChunk:
+    """One chunk of fills as typed columns (side is +1 BUY / -1 SELL)."""
+    ts: List[str] = field(default_factory=list)
+    symbol: List[str] = field(default_factory=list)
+    side: array = field(default_factory=lambda: array("b"))
+    qty: array = field(default_factory=lambda: array("q"))
+    price: array = field(default_factory=lambda: array("d"))
+    fees: array = field(default_factory=lambda: array("d"))
+    account: List[str] = field(default_factory=list)
+    exec_id: List[Optional[str]] = field(default_factory=list)
+    note: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.qty)
+
+    def iter_fills(self) -> Iterator[Fill]:
+        for i in range(len(self.qty)):
+            yield Fill(
+                ts=self.ts[i],
+                symbol=self.symbol[i],
+                side="BUY" if self.side[i] > 0 else "SELL",
+                qty=self.qty[i],
+                price=self.price[i],
+                fees=self.fees[i],
+                account=self.account[i],
+                exec_id=self.exec_id[i],
+                note=self.note[i],
+            )
+
+class _RowParser:
+    """Maps header positions once, then appends split rows into a FillChunk."""
+    def __init__(self, header: List[str]):
+        names = [h.strip() for h in header]
+        missing = [c for c in REQUIRED if c not in names]
+        if missing:
+            raise ValueError(f"CSV header missing column(s): {', '.join(missing)}")
+        self.width = len(names)
+        self.idx = {c: (names.index(c) if c in names else None) for c in COLUMNS}
+
+    def add(self, chunk: FillChunk, line: str) -> None:
+        cells = line.split(",")
+        if len(cells) != self.width or '"' in line:
+            # quoted or ragged row: let the csv module sort it out
+            cells = next(csv.reader([line]))
+            cells += [""] * (self.width - len(cells))
+        ix = self.idx
+        chunk.symbol.append(cells[ix["symbol"]].strip())
+        side = cells[ix["side"]].strip().upper()
+        if side not in _SIDES:
+            raise ValueError(f"bad side {cells[ix['side']]!r}")
+        chunk.side.append(_SIDES[side])
+        chunk.qty.append(int(cells[ix["qty"]]))
+        chunk.price.append(float(cells[ix["price"]]))
+        chunk.ts.append(cells[ix["ts"]] if ix["ts"] is not None else "")
+        chunk.fees.append(float(cells[ix["fees"]] or 0) if ix["fees"] is not None else 0.0)
+        chunk.account.append(cells[ix["account"]] if ix["account"] is not None else "default")
+        chunk.exec_id.append((cells[ix["exec_id"]] or None) if ix["exec_id"] is not None else None)
+        chunk.note.append(cells[ix["note"]] if ix["note"] is not None else "")
+
+def _mmap_lines(path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    # lines that *start* in [start, stop); a line straddling stop belongs to this range
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        stop = size if stop is None else min(stop, size)
+        pos = 0
+        if start > 0:
+            nl = mm.find(b"\n", start - 1)
+            if nl < 0:
+                return
+            pos = nl + 1
+        while pos < stop:
+            end = mm.find(b"\n", min(pos + _MMAP_BLOCK, stop) - 1)
+            end = size if end < 0 else end + 1
+            text = mm[pos:end].decode("utf-8-sig" if pos == 0 else "utf-8")
+            # only \n / \r\n end a line (splitlines() would also split on U+2028 and friends)
+            if "\r" in text:
+                text = text.replace("\r\n", "\n")
+            lines = text.split("\n")
+            if not lines[-1]:
+                lines.pop()
+            yield from lines
+            pos = end
+
+def _join_quoted(lines: Iterator[str]) -> Iterator[str]:
+    # a quoted field may span lines: glue them back until the quotes balance
+    for line in lines:
+        if '"' in line and line.count('"') % 2:
+            parts = [line]
+            quotes = line.count('"')
+            for more in lines:
+                parts.append(more)
+                quotes += more.count('"')
+                if not quotes % 2:
+                    break
+            line = "\n".join(parts)
+        yield line
+
+def _stream_lines(f: io.TextIOBase) -> Iterator[str]:
+    for line in f:
+        yield line.rstrip("\r\n")
+
+def _iter_lines(path: Union[str, Path]) -> Iterator[str]:
+    if str(path) == "-":
+        yield from _stream_lines(sys.stdin)
+        return
+    path = Path(path)
+    if path.is_file() and os.path.getsize(path) > 0:
+        # local regular file: map it and decode in large slices
+        yield from _mmap_lines(path)
+        return
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from _stream_lines(f)
+
+def split_ranges(path: Union[str, Path], parts: int) -> List[Tuple[int, int]]:
+    """Cut a local file into `parts` byte ranges for parallel parsing."""
+    size = os.path.getsize(path)
+    step = max(1, -(-size // max(parts, 1)))
+    return [(lo, min(lo + step, size)) for lo in range(0, size, step)]
+
+def iter_fill_chunks(path: Union[str, Path], chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     byte_range: Optional[Tuple[int, int]] = None) -> Iterator[FillChunk]:
+    """Stream a fills CSV as FillChunks of at most chunk_rows rows ("-" reads stdin).
+
+    byte_range=(start, stop) parses only the rows starting in that slice of a
+    local file (see split_ranges); the header is always taken from line one.
+    """
+    if byte_range is not None and byte_range[0] > 0:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            header = f.readline().rstrip("\r\n")
+        lines = (ln for ln in _join_quoted(_mmap_lines(Path(path), *byte_range)) if ln.strip())
+    else:
+        src = _mmap_lines(Path(path), 0, byte_range[1]) if byte_range is not None else _iter_lines(path)
+        lines = (ln for ln in _join_quoted(src) if ln.strip())
+        header = next(lines, None)
+    if header is None:
+        return
+    parser = _RowParser(next(csv.reader([header])))
+    while True:
+        chunk = FillChunk()
+        for line in itertools.islice(lines, chunk_rows):
+            parser.add(chunk, line)
+        if not len(chunk):
+            return
+        yield chunk
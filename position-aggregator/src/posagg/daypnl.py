@@ -0,0 +1,73 @@
+"""
+Day P&L by trading session (needs trading_calendar_mini installed).
+
+    engine = PositionEngine(day_sessions=session_calendar())
+
+Each fill's ts is mapped to its trading-session date. When that date moves
+past engine.session_date, every position's day bucket restarts
+(reset_day), so day_realized / day_fees are kept incrementally instead of
+being recomputed from the session's fills. Fills stamped before the current
+session (late prints) count towards the current one; fills without a ts
+never roll the day.
+"""
+from __future__ import annotations
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from .config import DAY_CALENDAR_MARKET, DAY_RESET_HOUR_ET, DAY_RESET_TZ, FILL_TS_TZ
+
+_EPOCH_ORD = date(1970, 1, 1).toordinal()
+_NO_DAY = np.iinfo(np.int64).min
+_FILL_TZ = timezone.utc if FILL_TS_TZ == "UTC" else None   # resolved on first use otherwise
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+def session_calendar(market: str = DAY_CALENDAR_MARKET, rollover: Optional[time] = None,
+                     tz: str = DAY_RESET_TZ):
+    """trading_calendar SessionDates for a packaged market, rolling at DAY_RESET_HOUR_ET by default."""
+    from trading_calendar.config_loader import builtin_market_path, load_market_config
+    from trading_calendar.trading_day import SessionDates
+    cfg = load_market_config(builtin_market_path(market))
+    return SessionDates(cfg, rollover or time(DAY_RESET_HOUR_ET), tz)
+
+def fill_ts_us(ts: str) -> int:
+    """UTC epoch microseconds of a fill ts (ISO or "YYYY-MM-DD HH:MM:SS"; naive = FILL_TS_TZ)."""
+    global _FILL_TZ
+    dt = datetime.fromisoformat(ts[:-1] + "+00:00" if ts.endswith("Z") else ts)
+    if dt.tzinfo is None:
+        if _FILL_TZ is timezone.utc:
+            return (dt - _EPOCH) // _US    # no aware datetime needed
+        if _FILL_TZ is None:
+            from zoneinfo import ZoneInfo
+            _FILL_TZ = ZoneInfo(FILL_TS_TZ)
+        dt = dt.replace(tzinfo=_FILL_TZ)
+    return (dt - _EPOCH_UTC) // _US
+
+def fill_session(calendar, ts: str) -> Optional[date]:
+    """Session date of one fill timestamp; None when the fill has no ts."""
+    # per-fill hot path: one ISO parse, then usually a single range check in date_of_us
+    return calendar.date_of_us(fill_ts_us(ts)) if ts else None
+
+def session_days(calendar, ts: Sequence[str]) -> np.ndarray:
+    """Session date per row as int64 days since the epoch (_NO_DAY where ts is empty); raises on a bad ts."""
+    from trading_calendar.classify import parse_timestamps
+    ts = np.asarray(ts, dtype=str)
+    has = ts != ""
+    days = np.full(ts.shape, _NO_DAY, dtype=np.int64)
+    if has.any():
+        days[has] = calendar.dates(parse_timestamps(ts[has].tolist(), "iso", FILL_TS_TZ)).view(np.int64)
+    return days
+
+def session_runs(days: np.ndarray, current: Optional[date]) -> List[Tuple[int, date]]:
+    """(row, session) at each row where the running session date (session_days) first moves past current.
+
+    The rows in between belong to the session before them, so a batch is
+    applied as len(runs) + 1 slices with a roll at each boundary.
+    """
+    if not days.size or days.max() == _NO_DAY:
+        return []
+    run = np.maximum.accumulate(days)
+    floor = _NO_DAY if current is None else current.toordinal() - _EPOCH_ORD
+    rows = np.flatnonzero(run > np.r_[floor, run[:-1]])
+    return [(i, date.fromordinal(d + _EPOCH_ORD)) for i, d in zip(rows.tolist(), run[rows].tolist())]
@@ -0,0 +1,301 @@
+from __future__ import annotations
+import hashlib, math, sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Union
+
+@dataclass
+class DedupStats:
+    lookups: int = 0
+    hits: int = 0          # duplicates rejected
+    inserts: int = 0
+    evictions: int = 0     # ids dropped by windowing/pruning
+    bloom_skips: int = 0   # lookups answered by the Bloom front alone
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+def session_bucket(ts: str) -> str:
+    # "2025-10-01 09:30:00" -> "2025-10-01"; a trading-session key works just as well
+    return ts[:10]
+
+class DedupIndex:
+    """Interface for exec_id idempotency checks."""
+    stats: DedupStats
+
+    def check_and_add(self, exec_id: str, ts: str = "") -> bool:
+        """Record exec_id; True if it was already seen (fill must be skipped)."""
+        raise NotImplementedError
+
+    def add(self, exec_id: str, ts: str = "") -> None:
+        # record an id already known to be new
+        self.check_and_add(exec_id, ts)
+
+    def __iter__(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def state(self) -> Any:
+        """JSON-able contents for a snapshot (None if the index persists itself)."""
+        return None
+
+    def restore(self, state: Any) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+class ExactDedupIndex(DedupIndex):
+    """Unbounded in-memory set. O(1) lookups; memory grows ~100 B per id forever."""
+    def __init__(self):
+        self.ids: Set[str] = set()
+        self.stats = DedupStats()
+
+    def check_and_add(self, exec_id: str, ts: str = "") -> bool:
+        self.stats.lookups += 1
+        if exec_id in self.ids:
+            self.stats.hits += 1
+            return True
+        self.ids.add(exec_id)
+        self.stats.inserts += 1
+        return False
+
+    def add(self, exec_id: str, ts: str = "") -> None:
+        self.ids.add(exec_id)
+        self.stats.inserts += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def state(self) -> Any:
+        return sorted(self.ids)
+
+    def restore(self, state: Any) -> None:
+        if state:
+            self.ids.update(state)
+
+class WindowedDedupIndex(DedupIndex):
+    """Exact sets for the last `max_buckets` time/session buckets.
+
+    bucket_key maps a fill ts to its bucket (calendar day by default); keys must
+    sort in time order. When a new bucket opens beyond the window the oldest key
+    is dropped whole, so memory is bounded by the busiest `max_buckets` buckets;
+    a lookup costs at most `max_buckets` set probes. A late fill older than a
+    full window is recorded in the oldest bucket rather than evicting a newer one.
+    """
+    def __init__(self, max_buckets: int = 2, bucket_key: Callable[[str], str] = session_bucket):
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be >= 1")
+        self.max_buckets = max_buckets
+        self.bucket_key = bucket_key
+        self.buckets: Dict[str, Set[str]] = {}
+        self.stats = DedupStats()
+
+    def _bucket(self, ts: str) -> Set[str]:
+        key = self.bucket_key(ts)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_buckets:
+                oldest = min(self.buckets)
+                if key < oldest:
+                    return self.buckets[oldest]   # late fill: don't evict a bucket still in the window
+                self.stats.evictions += len(self.buckets.pop(oldest))
+            bucket = self.buckets[key] = set()
+        return bucket
+
+    def check_and_add(self, exec_id: str, ts: str = "") -> bool:
+        self.stats.lookups += 1
+        for ids in self.buckets.values():
+            if exec_id in ids:
+                self.stats.hits += 1
+                return True
+        self.add(exec_id, ts)
+        return False
+
+    def add(self, exec_id: str, ts: str = "") -> None:
+        self._bucket(ts).add(exec_id)
+        self.stats.inserts += 1
+
+    def __iter__(self) -> Iterator[str]:
+        for ids in list(self.buckets.values()):
+            yield from ids
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.buckets.values())
+
+    def state(self) -> Any:
+        return [[key, sorted(ids)] for key, ids in self.buckets.items()]
+
+    def restore(self, state: Any) -> None:
+        for key, ids in state or []:
+            self.buckets.setdefault(key, set()).update(ids)
+        while len(self.buckets) > self.max_buckets:
+            del self.buckets[min(self.buckets)]
+
+class SqliteDedupIndex(DedupIndex):
+    """On-disk index that survives restarts (SQLite, one B-tree probe per lookup).
+
+    Memory is SQLite's page cache only. Inserts are committed every
+    `commit_every` new ids and on flush()/close(). With `retain_buckets`, ids
+    older than the newest N buckets are pruned when a new bucket appears.
+    """
+    def __init__(self, path: Union[str, Path], commit_every: int = 1000,
+                 retain_buckets: Optional[int] = None,
+                 bucket_key: Callable[[str], str] = session_bucket):
+        self.path = str(path)
+        self.commit_every = commit_every
+        self.retain_buckets = retain_buckets
+        self.bucket_key = bucket_key
+        self.stats = DedupStats()
+        self._pending = 0
+        self._last_bucket: Optional[str] = None
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS exec_ids (exec_id TEXT PRIMARY KEY, bucket TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS exec_ids_bucket ON exec_ids(bucket)")
+        self._db.commit()
+
+    def _prune(self, bucket: str) -> None:
+        keep = [r[0] for r in self._db.execute(
+            "SELECT DISTINCT bucket FROM exec_ids ORDER BY bucket DESC LIMIT ?", (self.retain_buckets,))]
+        if keep:
+            cur = self._db.execute("DELETE FROM exec_ids WHERE bucket < ?", (min(keep),))
+            self.stats.evictions += cur.rowcount
+
+    def check_and_add(self, exec_id: str, ts: str = "") -> bool:
+        self.stats.lookups += 1
+        bucket = self.bucket_key(ts)
+        cur = self._db.execute("INSERT OR IGNORE INTO exec_ids (exec_id, bucket) VALUES (?, ?)", (exec_id, bucket))
+        if cur.rowcount == 0:
+            self.stats.hits += 1
+            return True
+        self.stats.inserts += 1
+        if self.retain_buckets and bucket != self._last_bucket:
+            self._last_bucket = bucket
+            self._prune(bucket)
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        # stream from the cursor: seeding a Bloom front must not load every id at once
+        return (r[0] for r in self._db.execute("SELECT exec_id FROM exec_ids"))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM exec_ids").fetchone()[0]
+
+    def flush(self) -> None:
+        self._db.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+class BloomDedupIndex(DedupIndex):
+    """Bloom filter in front of an exact index.
+
+    A Bloom miss proves the id is new, so the exact index (typically the
+    SQLite one) is only probed on a Bloom hit. The filter is seeded from the
+    exact index at startup so a persisted index stays authoritative across
+    restarts. Filter memory is fixed at ~1.44*log2(1/fp_rate) bits per
+    expected id; past `capacity` the false positive rate (and so the
+    fallback probe rate) climbs.
+    """
+    def __init__(self, capacity: int = 1_000_000, fp_rate: float = 0.001,
+                 exact: Optional[DedupIndex] = None):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.nbits = max(8, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.nhashes = max(1, round(self.nbits / capacity * math.log(2)))
+        self.bits = bytearray((self.nbits + 7) // 8)
+        self.exact = exact if exact is not None else ExactDedupIndex()
+        self.stats = DedupStats()
+        for exec_id in self.exact:
+            self._mark(exec_id)
+
+    def _positions(self, exec_id: str):
+        d = hashlib.blake2b(exec_id.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        m = self.nbits
+        return [(h1 + i * h2) % m for i in range(self.nhashes)]
+
+    def _mark(self, exec_id: str) -> bool:
+        # set the id's bits; True if they were all set already (maybe seen)
+        bits = self.bits
+        maybe_seen = True
+        for p in self._positions(exec_id):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                maybe_seen = False
+                bits[byte] |= mask
+        return maybe_seen
+
+    def check_and_add(self, exec_id: str, ts: str = "") -> bool:
+        self.stats.lookups += 1
+        if not self._mark(exec_id):
+            # definitely new: record it in the exact index without a lookup
+            self.stats.bloom_skips += 1
+            self.exact.add(exec_id, ts)
+            self.stats.inserts += 1
+            return False
+        if self.exact.check_and_add(exec_id, ts):
+            self.stats.hits += 1
+            return True
+        self.stats.inserts += 1
+        return False
+
+    def add(self, exec_id: str, ts: str = "") -> None:
+        self._mark(exec_id)
+        self.exact.add(exec_id, ts)
+        self.stats.inserts += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.exact)
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def state(self) -> Any:
+        return self.exact.state()
+
+    def restore(self, state: Any) -> None:
+        self.exact.restore(state)
+        for exec_id in self.exact:
+            self._mark(exec_id)
+
+    def flush(self) -> None:
+        self.exact.flush()
+
+    def close(self) -> None:
+        self.exact.close()
+
+DEDUP_KINDS = ("exact", "window", "bloom", "sqlite")
+
+def make_dedup(kind: str = "exact", path: Optional[Union[str, Path]] = None, **kwargs) -> DedupIndex:
+    """CLI-friendly factory; `bloom` with a path uses SQLite as its exact fallback."""
+    if kind == "exact":
+        return ExactDedupIndex()
+    if kind == "window":
+        return WindowedDedupIndex(**kwargs)
+    if kind == "sqlite":
+        if path is None:
+            raise ValueError("sqlite dedup needs a path")
+        return SqliteDedupIndex(path, **kwargs)
+    if kind == "bloom":
+        exact = SqliteDedupIndex(path) if path is not None else None
+        return BloomDedupIndex(exact=exact, **kwargs)
+    raise ValueError(f"unknown dedup kind '{kind}' (choose from {', '.join(DEDUP_KINDS)})")
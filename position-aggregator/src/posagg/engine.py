@@ -1,47 +1,97 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Tuple
-from .models import Fill, Position, BlotterLine
-from .config import DEFAULTS
+from datetime import date
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from .models import DEFAULT_ACCOUNT, Fill, Position, PosKey, BlotterLine
+from .instruments import InstrumentRegistry, UnknownInstrumentError, default_registry
 from .marks import MarkProvider
+from .dedup import BloomDedupIndex, DedupIndex, ExactDedupIndex
+from .lots import ACCOUNTING, apply_lot_fill
+from .ticks import TickPosition, price_to_ticks
+from .daypnl import fill_session
+
+if TYPE_CHECKING:
+    from .journal import Journal
+    from .metrics import Metrics
 
 def symbol_root(sym: str) -> str:
     # "MESZ5" -> "MES"; "MCLX5" -> "MCL"
-    for root in DEFAULTS.keys():
-        if sym.startswith(root):
-            return root
-    return sym  # fallback
+    try:
+        return default_registry().root_of(sym)
+    except UnknownInstrumentError:
+        return sym  # fallback
 
 @dataclass
 class PositionEngine:
     mark_provider: Optional[MarkProvider] = None
-    positions: Dict[str, Position] = field(default_factory=dict)
-    seen_exec_ids: set[str] = field(default_factory=set)
+    positions: Dict[PosKey, Position] = field(default_factory=dict)  # (account, symbol) -> Position
+    dedup: DedupIndex = field(default_factory=ExactDedupIndex)
+    journal: Optional[Journal] = None  # write-ahead log of accepted fills (see journal.StateStore)
+    fill_listeners: List[Callable[[PosKey], None]] = field(default_factory=list)  # called with each touched key
+    registry: InstrumentRegistry = field(default_factory=default_registry)
+    accounting: str = "wac"  # "wac" (weighted average) or "fifo"/"lifo" lots
+    exact: bool = False  # integer tick/cent positions (ticks.TickPosition); WAC, dict store only
+    day_sessions: Optional[object] = None  # trading_calendar SessionDates: roll day P&L per session (see daypnl)
+    session_date: Optional[date] = None  # trading session the day buckets belong to
+    _metrics: Optional[Metrics] = field(default=None, init=False, repr=False)  # set by instrument()
+
+    def __post_init__(self):
+        if self.accounting not in ACCOUNTING:
+            raise ValueError(f"accounting must be one of {ACCOUNTING}")
+        if self.exact and (self.accounting != "wac" or type(self.positions) is not dict):
+            raise ValueError("exact mode needs wac accounting and the dict position store")
 
-    def _get_pos(self, symbol: str) -> Position:
-        if symbol not in self.positions:
-            self.positions[symbol] = Position(symbol=symbol)
-        return self.positions[symbol]
+    def _get_pos(self, symbol: str, account: str = DEFAULT_ACCOUNT) -> Position:
+        key = (account, symbol)
+        pos = self.positions.get(key)
+        if pos is None:
+            if self.exact:
+                self.positions[key] = TickPosition(symbol, account, *self._tickmath(symbol))
+            else:
+                self.positions[key] = Position(symbol=symbol, account=account)
+            pos = self.positions[key]  # array stores hand back a view, not the object stored
+        return pos
 
     def _tickmath(self, symbol: str) -> Tuple[float, float]:
-        root = symbol_root(symbol)
-        cfg = DEFAULTS[root]
-        return (cfg.tick_size, cfg.dollars_per_tick)
-
-    def apply_fill(self, fill: Fill) -> None:
-        # idempotency
-        if fill.exec_id and fill.exec_id in self.seen_exec_ids:
-            return
-        if fill.exec_id:
-            self.seen_exec_ids.add(fill.exec_id)
-
-        pos = self._get_pos(fill.symbol)
+        inst = self.registry.resolve(symbol)
+        return (inst.tick_size, inst.dollars_per_tick)
+
+    def apply_fill(self, fill: Fill) -> bool:
+        # validate first: a rejected fill must not be marked seen, journaled or leave a position behind
         tick_size, dollars_per_tick = self._tickmath(fill.symbol)
+        side = fill.side.upper()
+        if side not in ("BUY", "SELL"):
+            raise ValueError(f"bad side {fill.side!r}")
+        if fill.qty < 0:
+            raise ValueError(f"qty must not be negative (side gives the direction), got {fill.qty}")
+        px_ticks = price_to_ticks(fill.price, tick_size) if self.exact else 0
+        session = fill_session(self.day_sessions, fill.ts) if self.day_sessions is not None else None
+
+        # idempotency: False when exec_id was already seen
+        if fill.exec_id and self.dedup.check_and_add(fill.exec_id, fill.ts):
+            return False
+        if self.journal is not None:
+            self.journal.append(fill)
+        if session is not None:
+            self.roll_day(session)
+
+        pos = self._get_pos(fill.symbol, fill.account)
+        signed_fill_qty = fill.qty if side == "BUY" else -fill.qty
+
+        if self.exact:
+            # Exact mode: price -> int ticks, realized kept in ticks (no float drift)
+            pos.apply_ticks(signed_fill_qty, px_ticks)
 
-        signed_fill_qty = fill.qty if fill.side.upper() == "BUY" else -fill.qty
+        elif self.accounting != "wac":
+            # Lot mode: realize against the FIFO/LIFO lot queue
+            realized_pts = apply_lot_fill(pos, signed_fill_qty, fill.price, self.accounting == "lifo")
+            pos.realized_pnl += realized_pts / tick_size * dollars_per_tick
+
+        elif signed_fill_qty == 0:
+            pass  # fee-only fill (qty 0): the position is untouched
 
         # Case 1: adding in same direction or starting from flat
-        if pos.net_qty == 0 or (pos.net_qty > 0 and signed_fill_qty > 0) or (pos.net_qty < 0 and signed_fill_qty < 0):
+        elif pos.net_qty == 0 or (pos.net_qty > 0 and signed_fill_qty > 0) or (pos.net_qty < 0 and signed_fill_qty < 0):
             # Weighted Average Cost update
             new_qty = pos.net_qty + signed_fill_qty
             if pos.net_qty == 0:
@@ -70,37 +120,119 @@ class PositionEngine:
                 if remaining == 0:
                     pos.net_qty = 0
                     pos.avg_price = 0.0
+                elif (remaining > 0) == (pos.net_qty > 0):
+                    # Partial reduce: open side keeps its average
+                    pos.net_qty = remaining
                 else:
                     # Flip happened: leftover in new direction; average becomes the fill price for the overfill part
                     pos.net_qty = remaining
                     pos.avg_price = fill.price
 
         # Fees always accrue to realized side
-        pos.fees_cum += fill.fees
+        if self.exact:
+            pos.fees_cents += round(fill.fees * 100)
+        else:
+            pos.fees_cum += fill.fees
+        for listener in self.fill_listeners:
+            listener((fill.account, fill.symbol))
+        return True
+
+    def apply_fills_batch(self, symbol, side, qty, price, fees=None, exec_id=None, ts=None,
+                          account=None, note=None, return_mask=False):
+        # columnar fast path (NumPy segmented scan); see batch.apply_fills_batch
+        from .batch import apply_fills_batch
+        return apply_fills_batch(self, symbol, side, qty, price, fees=fees, exec_id=exec_id, ts=ts,
+                                 account=account, note=note, return_mask=return_mask)
+
+    def roll_day(self, session: date) -> bool:
+        """Move to a later trading session: every position starts a new day bucket.
+
+        Earlier or equal sessions are ignored. The first session seen only
+        sets session_date, since there is no prior day to close.
+        """
+        if self.session_date is not None and session <= self.session_date:
+            return False
+        if self.session_date is not None:
+            reset = getattr(self.positions, "reset_day", None)
+            if reset is not None:
+                reset()
+            else:
+                for pos in self.positions.values():
+                    pos.reset_day()
+        self.session_date = session
+        return True
+
+    def instrument(self, metrics=None):
+        # opt-in latency histograms for the hot paths; see metrics.instrument
+        from .metrics import instrument
+        return instrument(self, metrics)
+
+    def uninstrument(self) -> None:
+        from .metrics import uninstrument
+        uninstrument(self)
+
+    @property
+    def seen_exec_ids(self) -> Set[str]:
+        """exec_ids seen so far (this used to be a plain set on the engine).
+
+        The live set of the exact index, also when it sits behind a Bloom
+        front; windowed / SQLite indexes give a copy of what they hold.
+        """
+        dedup = self.dedup
+        if isinstance(dedup, BloomDedupIndex):
+            dedup = dedup.exact
+        if isinstance(dedup, ExactDedupIndex):
+            return dedup.ids
+        return set(dedup)
+
+    @property
+    def metrics(self):
+        return self._metrics
 
     def mark_for(self, symbol: str) -> Optional[float]:
         if not self.mark_provider:
             return None
         return self.mark_provider.get_mark(symbol)
 
-    def upl(self, symbol: str) -> float:
-        pos = self._get_pos(symbol)
-        if pos.net_qty == 0:
+    def _upl_at(self, pos: Position, mark: Optional[float]) -> float:
+        if pos.net_qty == 0 or mark is None:
             return 0.0
-        mark = self.mark_for(symbol)
-        if mark is None:
-            return 0.0
-        tick_size, dollars_per_tick = self._tickmath(symbol)
+        if self.exact:
+            return pos.upl_cents(mark) / 100
+        tick_size, dollars_per_tick = self._tickmath(pos.symbol)
         direction = 1 if pos.net_qty > 0 else -1
         price_delta = (mark - pos.avg_price)
         per_contract = direction * price_delta / tick_size * dollars_per_tick
         return per_contract * abs(pos.net_qty)
 
-    def blotter_line(self, symbol: str) -> BlotterLine:
-        pos = self._get_pos(symbol)
+    def upl(self, symbol: str, account: str = DEFAULT_ACCOUNT) -> float:
+        pos = self._get_pos(symbol, account)
+        if pos.net_qty == 0:
+            return 0.0
+        return self._upl_at(pos, self.mark_for(symbol))
+
+    def revalue(self):
+        """(keys, upl) for the whole book; array stores do it in one vectorized pass."""
+        import numpy as np
+        keys = list(self.positions)
+        revalue = getattr(self.positions, "revalue", None)
+        if revalue is not None:
+            return keys, revalue(self.mark_for, self._tickmath)
+        marks: Dict[str, Optional[float]] = {}
+        upl = np.empty(len(keys))
+        for i, key in enumerate(keys):
+            sym = key[1]
+            if sym not in marks:
+                marks[sym] = self.mark_for(sym)
+            upl[i] = self._upl_at(self.positions[key], marks[sym])
+        return keys, upl
+
+    def blotter_line(self, symbol: str, account: str = DEFAULT_ACCOUNT) -> BlotterLine:
+        pos = self._get_pos(symbol, account)
         mark = self.mark_for(symbol)
-        upl_val = self.upl(symbol)
+        upl_val = self._upl_at(pos, mark)
         nlv_delta = pos.realized_pnl + upl_val - pos.fees_cum
+        stale = mark is not None and self.mark_provider.is_stale(symbol)
         return BlotterLine(
             symbol=symbol,
             net_qty=pos.net_qty,
@@ -110,8 +242,15 @@ class PositionEngine:
             rpl=pos.realized_pnl,
             fees=pos.fees_cum,
             nlv_delta=nlv_delta,
+            stale=stale,
+            account=account,
+            day_rpl=pos.day_realized,
+            day_fees=pos.day_fees,
         )
 
     def all_blotter(self) -> list[BlotterLine]:
-        return [self.blotter_line(sym) for sym in sorted(self.positions.keys())]
+        return [self.blotter_line(sym, acct) for acct, sym in sorted(self.positions.keys())]
+
+    def accounts(self) -> list[str]:
+        return sorted({acct for acct, _ in self.positions})
 
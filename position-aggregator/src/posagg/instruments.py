@@ -0,0 +1,129 @@
+from __future__ import annotations
+import csv, re, sys
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# CME month codes: F=Jan ... Z=Dec
+MONTH_CODES = {c: i for i, c in enumerate("FGHJKMNQUVXZ", start=1)}
+_MONTH_ABBR = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_CONTRACT_RE = re.compile(r"^(?P<root>[A-Z0-9]+?)(?P<month>[FGHJKMNQUVXZ])(?P<year>\d{1,2})$")
+
+DATA_FILE = Path(__file__).with_name("data") / "instruments.csv"
+
+class UnknownInstrumentError(KeyError):
+    pass
+
+@dataclass(frozen=True)
+class RootSpec:
+    root: str
+    tick_size: float
+    dollars_per_tick: float
+    exchange: str = ""
+    description: str = ""
+
+@dataclass(frozen=True)
+class Instrument:
+    symbol: str                        # as traded, e.g. "MESZ5"
+    root: str                          # "MES"
+    tick_size: float
+    dollars_per_tick: float
+    expiry_month: Optional[int] = None  # 12
+    expiry_year: Optional[int] = None   # 2025
+
+    @property
+    def expiry(self) -> str:
+        if self.expiry_month is None:
+            return ""
+        return f"{_MONTH_ABBR[self.expiry_month]} {self.expiry_year}"
+
+def _full_year(digits: str, ref_year: int) -> int:
+    if len(digits) == 2:
+        return 2000 + int(digits)
+    # one digit: the matching year in [ref_year - 1, ref_year + 8]
+    base = ref_year - 1
+    return base + (int(digits) - base) % 10
+
+class InstrumentRegistry:
+    """Root specs plus a per-symbol cache of resolved Instruments.
+
+    The first resolve() of a symbol parses its month/year code and interns the
+    result; every later lookup is a single dict hit.
+    """
+    def __init__(self, roots: Optional[Dict[str, RootSpec]] = None, ref_year: Optional[int] = None):
+        self.roots: Dict[str, RootSpec] = dict(roots or {})
+        self.ref_year = ref_year if ref_year is not None else date.today().year
+        self._cache: Dict[str, Instrument] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DATA_FILE, ref_year: Optional[int] = None) -> "InstrumentRegistry":
+        # CSV columns: root,tick_size,dollars_per_tick[,exchange,description]
+        roots: Dict[str, RootSpec] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                root = row["root"].strip().upper()
+                roots[root] = RootSpec(
+                    root=root,
+                    tick_size=float(row["tick_size"]),
+                    dollars_per_tick=float(row["dollars_per_tick"]),
+                    exchange=(row.get("exchange") or "").strip(),
+                    description=(row.get("description") or "").strip(),
+                )
+        return cls(roots, ref_year=ref_year)
+
+    def register(self, spec: RootSpec) -> None:
+        self.roots[spec.root] = spec
+        # cached instruments of that root may now be stale
+        self._cache = {s: i for s, i in self._cache.items() if i.root != spec.root}
+
+    def resolve(self, symbol: str) -> Instrument:
+        inst = self._cache.get(symbol)
+        if inst is not None:
+            return inst
+        inst = self._parse(symbol)
+        self._cache[sys.intern(symbol)] = inst
+        return inst
+
+    def _parse(self, symbol: str) -> Instrument:
+        key = symbol.strip().upper()
+        spec = self.roots.get(key)
+        if spec is not None:
+            # bare root (continuous / front month)
+            return Instrument(symbol=symbol, root=spec.root, tick_size=spec.tick_size,
+                              dollars_per_tick=spec.dollars_per_tick)
+        m = _CONTRACT_RE.match(key)
+        if m is not None:
+            spec = self.roots.get(m.group("root"))
+        if spec is None:
+            # non-CME spelling ("MES DEC25"...): longest known root prefix, no expiry
+            roots = [r for r in self.roots if key.startswith(r)]
+            if not roots:
+                raise UnknownInstrumentError(f"no instrument spec for '{symbol}' (unknown root)")
+            spec = self.roots[max(roots, key=len)]
+            return Instrument(symbol=symbol, root=spec.root, tick_size=spec.tick_size,
+                              dollars_per_tick=spec.dollars_per_tick)
+        return Instrument(
+            symbol=symbol,
+            root=spec.root,
+            tick_size=spec.tick_size,
+            dollars_per_tick=spec.dollars_per_tick,
+            expiry_month=MONTH_CODES[m.group("month")],
+            expiry_year=_full_year(m.group("year"), self.ref_year),
+        )
+
+    def root_of(self, symbol: str) -> str:
+        return self.resolve(symbol).root
+
+    def __contains__(self, symbol: str) -> bool:
+        try:
+            self.resolve(symbol)
+        except UnknownInstrumentError:
+            return False
+        return True
+
+@lru_cache(maxsize=None)
+def default_registry() -> InstrumentRegistry:
+    """Process-wide registry loaded from the packaged instruments.csv."""
+    return InstrumentRegistry.load()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import csv, json, os, re
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+from .csvload import COLUMNS, iter_fill_chunks
+from .engine import PositionEngine
+from .lots import seed_lots
+from .models import Fill, Position
+from .ticks import TickPosition
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_NAME = "snapshot.json"
+_JOURNAL_RE = re.compile(r"^journal-(\d+)\.csv$")
+
+class Journal:
+    """Append-only log of applied fills, in the same CSV schema load-csv reads.
+
+    Rows are flushed on every append (fsync too if asked), so a crash loses at
+    most what the OS had not written yet.
+    """
+    def __init__(self, path: Union[str, Path], fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.rows = 0
+        fresh = not self.path.exists() or self.path.stat().st_size == 0
+        self._f = open(self.path, "a", newline="")
+        self._w = csv.writer(self._f)
+        if fresh:
+            self._w.writerow(COLUMNS)
+            self._commit()
+
+    def _commit(self) -> None:
+        self._f.flush()
+        if self.fsync:
+            os.fsync(self._f.fileno())
+
+    def append(self, fill: Fill) -> None:
+        self._w.writerow((fill.ts, fill.symbol, fill.side, fill.qty, fill.price, fill.fees,
+                          fill.account, fill.exec_id or "", fill.note))
+        self.rows += 1
+        self._commit()
+
+    def append_rows(self, rows: Sequence[tuple]) -> None:
+        # rows already in COLUMNS order
+        self._w.writerows(rows)
+        self.rows += len(rows)
+        self._commit()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._commit()
+            self._f.close()
+
+class StateStore:
+    """Snapshot + journal persistence for one PositionEngine in `state_dir`.
+
+    Layout: snapshot.json holds positions, dedup state and the journal
+    generation it was taken at; journal-<gen>.csv files hold fills applied
+    since. open() loads the snapshot and replays only the newer journals, so
+    restart cost tracks the tail, not the whole history.
+    """
+    def __init__(self, state_dir: Union[str, Path], snapshot_every: int = 50_000, fsync: bool = False):
+        self.dir = Path(state_dir)
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.gen = 0
+        self.engine: Optional[PositionEngine] = None
+
+    def _journal_path(self, gen: int) -> Path:
+        return self.dir / f"journal-{gen:08d}.csv"
+
+    def _journal_gens(self) -> list[int]:
+        gens = []
+        for p in self.dir.iterdir():
+            m = _JOURNAL_RE.match(p.name)
+            if m:
+                gens.append(int(m.group(1)))
+        return sorted(gens)
+
+    def open(self, **engine_kwargs) -> PositionEngine:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        engine = PositionEngine(**engine_kwargs)
+        snap_path = self.dir / SNAPSHOT_NAME
+        if snap_path.exists():
+            with open(snap_path) as f:
+                snap = json.load(f)
+            if snap.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version {snap.get('version')!r} in {snap_path}")
+            self.gen = snap["gen"]
+            for d in snap["positions"]:
+                ticks = d.pop("ticks", None)
+                if ticks is not None:
+                    # exact-mode position: the integer state is authoritative
+                    pos = TickPosition(d["symbol"], d["account"], net_qty=d["net_qty"], **ticks)
+                else:
+                    pos = Position(**d)
+                    seed_lots(pos, pos.lots)
+                engine.positions[(pos.account, pos.symbol)] = pos
+            engine.dedup.restore(snap.get("dedup"))
+            if snap.get("session_date"):
+                engine.session_date = date.fromisoformat(snap["session_date"])
+
+        replayed = 0
+        for gen in self._journal_gens():
+            if gen >= self.gen:
+                replayed += self._replay(engine, self._journal_path(gen))
+                self.gen = gen
+        self.engine = engine
+        if replayed:
+            # compact right away so the next restart starts from here
+            self.snapshot()
+        else:
+            engine.journal = Journal(self._journal_path(self.gen), fsync=self.fsync)
+        return engine
+
+    @staticmethod
+    def _replay(engine: PositionEngine, path: Path) -> int:
+        # journal rows already passed dedup: apply them as-is, then re-seed the index
+        n = 0
+        for chunk in iter_fill_chunks(path):
+            engine.apply_fills_batch(chunk.symbol, chunk.side, chunk.qty, chunk.price, chunk.fees,
+                                     ts=chunk.ts, account=chunk.account)
+            for eid, ts in zip(chunk.exec_id, chunk.ts):
+                if eid:
+                    engine.dedup.add(eid, ts)
+            n += len(chunk)
+        return n
+
+    def maybe_snapshot(self) -> bool:
+        if self.engine is not None and self.engine.journal is not None \
+                and self.engine.journal.rows >= self.snapshot_every:
+            self.snapshot()
+            return True
+        return False
+
+    def snapshot(self) -> None:
+        engine = self.engine
+        if engine is None:
+            raise RuntimeError("StateStore.open() first")
+        # rotate first: fills arriving after this point land in the new generation
+        if engine.journal is not None:
+            engine.journal.close()
+        self.gen += 1
+        engine.journal = Journal(self._journal_path(self.gen), fsync=self.fsync)
+        if engine.metrics is not None:
+            engine.instrument(engine.metrics)  # re-wrap the new journal
+        engine.dedup.flush()
+
+        snap = {
+            "version": SNAPSHOT_VERSION,
+            "gen": self.gen,
+            "positions": [_position_state(p) for p in engine.positions.values()],
+            "dedup": engine.dedup.state(),
+            "session_date": engine.session_date and engine.session_date.isoformat(),
+        }
+        tmp = self.dir / (SNAPSHOT_NAME + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(snap, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.dir / SNAPSHOT_NAME)
+
+        for gen in self._journal_gens():
+            if gen < self.gen:
+                self._journal_path(gen).unlink()
+
+    def close(self) -> None:
+        if self.engine is not None:
+            if self.engine.journal is not None:
+                self.engine.journal.close()
+            self.engine.dedup.close()
+
+def _position_state(p) -> dict:
+    # field by field so array-store views (store.PositionView) serialize too
+    d = {"symbol": p.symbol, "account": p.account, "net_qty": p.net_qty, "avg_price": p.avg_price,
+         "realized_pnl": p.realized_pnl, "fees_cum": p.fees_cum, "lots": list(p.lots or ())}
+    if isinstance(p, TickPosition):
+        d["ticks"] = p.state()
+    else:
+        d["day_realized_start"], d["day_fees_start"] = p.day_realized_start, p.day_fees_start
+    return d
+
+def journal_rows(idx: Iterable[int], ts: Optional[Sequence], symbol: Sequence, signed_qty: Sequence,
+                 price: Sequence, fees: Sequence, account: Optional[Sequence] = None,
+                 exec_id: Optional[Sequence] = None, note: Optional[Sequence] = None) -> list[tuple]:
+    # gather rows `idx` of a columnar batch into journal tuples
+    rows = []
+    for i in idx:
+        q = int(signed_qty[i])
+        rows.append((
+            ts[i] if ts is not None else "",
+            symbol[i],
+            "BUY" if q > 0 else "SELL",
+            abs(q),
+            float(price[i]),
+            float(fees[i]),
+            account[i] if account is not None else "default",
+            (exec_id[i] or "") if exec_id is not None else "",
+            note[i] if note is not None else "",
+        ))
+    return rows
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from collections import deque
+from .models import Position
+
+ACCOUNTING = ("wac", "fifo", "lifo")
+
+def apply_lot_fill(pos: Position, signed_qty: int, price: float, lifo: bool = False) -> float:
+    """Book one fill against pos.lots; returns realized P&L in price points x contracts.
+
+    Lots are (qty, price) tuples on the open side, oldest on the left. A
+    reducing fill consumes from the left (FIFO) or the right (LIFO); each lot
+    is pushed and popped once, so a fill costs amortized O(1) however many
+    lots are open. net_qty and avg_price (the open lots' average) are kept
+    in step.
+    """
+    if not signed_qty:
+        return 0.0    # fee-only fill: nothing to book, as in WAC
+    lots = pos.lots
+    if lots is None:
+        lots = pos.lots = deque()
+    if pos.net_qty and not lots:
+        # position carried in from WAC state: one lot at the average
+        lots.append((abs(pos.net_qty), pos.avg_price))
+    open_cost = pos.avg_price * abs(pos.net_qty)
+
+    if pos.net_qty == 0 or (pos.net_qty > 0) == (signed_qty > 0):
+        lots.append((abs(signed_qty), price))
+        pos.net_qty += signed_qty
+        pos.avg_price = (open_cost + price * abs(signed_qty)) / abs(pos.net_qty)
+        return 0.0
+
+    direction = 1 if pos.net_qty > 0 else -1
+    left = abs(signed_qty)
+    realized = 0.0
+    take = lots.pop if lifo else lots.popleft
+    while left and lots:
+        q, p = take()
+        if q > left:
+            # partial: put the rest of the lot back where it came from
+            (lots.append if lifo else lots.appendleft)((q - left, p))
+            q = left
+        realized += direction * (price - p) * q
+        open_cost -= p * q
+        left -= q
+
+    if left:
+        # flipped through zero: the overfill opens a lot on the other side
+        lots.append((left, price))
+        pos.net_qty = -direction * left
+        pos.avg_price = price
+    elif lots:
+        pos.net_qty += signed_qty
+        pos.avg_price = open_cost / abs(pos.net_qty)
+    else:
+        pos.net_qty = 0
+        pos.avg_price = 0.0
+    return realized
+
+def seed_lots(pos: Position, lots) -> None:
+    # restore from a snapshot (JSON lists back to tuples)
+    pos.lots = deque((int(q), float(p)) for q, p in lots) if lots else None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+import asyncio, time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+from .marks import MarkProvider
+
+# Feed wire format, one mark per line: "SYMBOL PRICE [EPOCH_SECONDS]" (commas also accepted)
+
+def parse_mark_line(line: str) -> Optional[Tuple[str, float, Optional[float]]]:
+    parts = line.replace(",", " ").split()
+    if len(parts) < 2 or parts[0].startswith("#"):
+        return None
+    try:
+        price = float(parts[1])
+        src_ts = float(parts[2]) if len(parts) > 2 else None
+    except ValueError:
+        return None
+    return parts[0], price, src_ts
+
+class StreamingMarkProvider(MarkProvider):
+    """Marks pushed from an asyncio feed, coalesced and timestamped.
+
+    Updates land in a pending dict (a burst for one symbol collapses to its
+    last price) and are published every `coalesce_ms`; listeners see at most
+    one change per symbol per interval. A mark older than `max_age` seconds
+    (receive time) is stale; crossing that line re-notifies the symbol so an
+    IncrementalBlotter can flag it.
+    """
+    def __init__(self, coalesce_ms: float = 50.0, max_age: float = 5.0):
+        super().__init__()
+        self.coalesce_ms = coalesce_ms
+        self.max_age = max_age
+        self._marks: Dict[str, Tuple[float, float, Optional[float]]] = {}  # symbol -> (price, received, source_ts)
+        self._pending: Dict[str, Tuple[float, float, Optional[float]]] = {}
+        self._stale: Set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+        self.received = 0   # raw updates in
+        self.published = 0  # updates out after coalescing
+
+    # --- MarkProvider ---
+    def get_mark(self, symbol: str) -> Optional[float]:
+        m = self._marks.get(symbol)
+        return m[0] if m is not None else None
+
+    def is_stale(self, symbol: str) -> bool:
+        m = self._marks.get(symbol)
+        return m is not None and time.monotonic() - m[1] > self.max_age
+
+    def mark_age(self, symbol: str) -> Optional[float]:
+        m = self._marks.get(symbol)
+        return time.monotonic() - m[1] if m is not None else None
+
+    def source_ts(self, symbol: str) -> Optional[float]:
+        m = self._marks.get(symbol)
+        return m[2] if m is not None else None
+
+    # --- ingest ---
+    def push(self, symbol: str, price: float, src_ts: Optional[float] = None) -> None:
+        self.received += 1
+        self._pending[symbol] = (price, time.monotonic(), src_ts)
+
+    def flush(self) -> int:
+        """Publish pending marks; returns how many symbols changed."""
+        pending, self._pending = self._pending, {}
+        for symbol, mark in pending.items():
+            old = self._marks.get(symbol)
+            self._marks[symbol] = mark
+            was_stale = symbol in self._stale
+            self._stale.discard(symbol)
+            # a fresh tick clears staleness even at the same price, so listeners hear about it
+            if old is None or old[0] != mark[0] or was_stale:
+                self.published += 1
+                self._notify(symbol, mark[0])
+        now = time.monotonic()
+        for symbol, (price, received, _) in self._marks.items():
+            if symbol not in self._stale and now - received > self.max_age:
+                self._stale.add(symbol)
+                self._notify(symbol, price)
+        return len(pending)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.coalesce_ms / 1000.0)
+            self.flush()
+
+    async def consume(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            parsed = parse_mark_line(line.decode())
+            if parsed is not None:
+                self.push(*parsed)
+
+    async def consume_unix(self, socket_path: Union[str, Path]) -> None:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        try:
+            await self.consume(reader)
+        finally:
+            writer.close()
+
+    async def consume_file(self, path: Union[str, Path], follow: bool = True, poll: float = 0.05) -> None:
+        # tail -f style; a line without its newline yet is held back until complete
+        with open(path) as f:
+            buf = ""
+            while True:
+                chunk = f.readline()
+                if chunk:
+                    buf += chunk
+                    if buf.endswith("\n"):
+                        parsed = parse_mark_line(buf)
+                        if parsed is not None:
+                            self.push(*parsed)
+                        buf = ""
+                    continue
+                if not follow:
+                    break
+                await asyncio.sleep(poll)
+
+    def start(self, source: Optional[Union[str, Path]] = None, unix: bool = False) -> None:
+        """Start the coalescing loop (and a feed reader) on the running event loop."""
+        self._tasks.append(asyncio.create_task(self._flush_loop()))
+        if source is not None:
+            reader = self.consume_unix(source) if unix else self.consume_file(source)
+            self._tasks.append(asyncio.create_task(reader))
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.flush()
+
+def iter_recorded_marks(path: Union[str, Path]) -> Iterator[Tuple[str, float, Optional[float]]]:
+    with open(path) as f:
+        for line in f:
+            parsed = parse_mark_line(line)
+            if parsed is not None:
+                yield parsed
+
+class ReplayMarkFeed:
+    """Local stand-in for a live feed: serves a recorded marks file over a Unix socket.
+
+    Inter-arrival gaps come from the recorded EPOCH column divided by `speed`;
+    speed=0 sends as fast as the socket takes it (benchmarks).
+    """
+    def __init__(self, path: Union[str, Path], socket_path: Union[str, Path], speed: float = 1.0):
+        self.path = Path(path)
+        self.socket_path = str(socket_path)
+        self.speed = speed
+        self.sent = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        prev_ts: Optional[float] = None
+        try:
+            for symbol, price, src_ts in iter_recorded_marks(self.path):
+                if self.speed > 0 and src_ts is not None and prev_ts is not None and src_ts > prev_ts:
+                    await writer.drain()
+                    await asyncio.sleep((src_ts - prev_ts) / self.speed)
+                prev_ts = src_ts if src_ts is not None else prev_ts
+                stamp = f" {src_ts}" if src_ts is not None else ""
+                writer.write(f"{symbol} {price}{stamp}\n".encode())
+                self.sent += 1
+                if self.sent % 1024 == 0:
+                    await writer.drain()
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_unix_server(self._serve_client, path=self.socket_path)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
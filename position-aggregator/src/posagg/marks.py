@@ -1,18 +1,39 @@
 from __future__ import annotations
-from typing import Optional, Dict
+from typing import Callable, Dict, List, Optional
+
+MarkListener = Callable[[str, float], None]
 
 class MarkProvider:
     """Interface for real-time or polled marks."""
+    def __init__(self):
+        self._listeners: List[MarkListener] = []
+
     def get_mark(self, symbol: str) -> Optional[float]:
         raise NotImplementedError
 
+    def is_stale(self, symbol: str) -> bool:
+        # providers that timestamp their marks override this
+        return False
+
+    def subscribe(self, listener: MarkListener) -> None:
+        # listener(symbol, price) is called whenever a mark changes
+        self._listeners.append(listener)
+
+    def _notify(self, symbol: str, price: float) -> None:
+        for listener in self._listeners:
+            listener(symbol, price)
+
 class StaticMarkProvider(MarkProvider):
     """Simple placeholder: set marks manually or by polling a delayed source."""
     def __init__(self, initial: Optional[Dict[str, float]] = None):
+        super().__init__()
         self._marks: Dict[str, float] = dict(initial or {})
 
     def set_mark(self, symbol: str, price: float) -> None:
+        if self._marks.get(symbol) == price:
+            return
         self._marks[symbol] = price
+        self._notify(symbol, price)
 
     def get_mark(self, symbol: str) -> Optional[float]:
         return self._marks.get(symbol)
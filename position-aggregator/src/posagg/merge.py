@@ -0,0 +1,145 @@
+from __future__ import annotations
+import glob, heapq, os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple, Union
+from .csvload import DEFAULT_CHUNK_ROWS, FillChunk, iter_fill_chunks, split_ranges
+
+RANGE_BYTES = 4 << 20  # bytes of one file parsed per worker job
+PREFETCH = 2           # parse jobs kept in flight per file
+
+Keyed = Tuple[FillChunk, array]  # chunk + its row time keys (epoch seconds)
+_EPOCH = datetime(1970, 1, 1)
+
+def expand_paths(patterns: Sequence[Union[str, Path]]) -> List[Path]:
+    """Expand glob patterns (quoted on the shell) into a sorted, de-duplicated path list."""
+    out: List[Path] = []
+    for pat in map(str, patterns):
+        hits = sorted(glob.glob(pat)) if glob.has_magic(pat) else [pat]
+        if not hits:
+            raise FileNotFoundError(f"no files match {pat!r}")
+        out += [Path(h) for h in hits if Path(h) not in out]
+    return out
+
+def ts_key(ts: str) -> float:
+    # ISO-8601 (naive = UTC) or epoch seconds
+    try:
+        dt = datetime.fromisoformat(ts)
+    except ValueError:
+        return float(ts)
+    if dt.tzinfo is None:
+        return (dt - _EPOCH).total_seconds()
+    return dt.timestamp()
+
+def _parse_keyed(job: Tuple[str, Tuple[int, int], int]) -> List[Keyed]:
+    # worker: parse one byte range and compute its time keys
+    path, byte_range, chunk_rows = job
+    out = []
+    last = float("-inf")
+    for chunk in iter_fill_chunks(path, chunk_rows=chunk_rows, byte_range=byte_range):
+        keys = array("d")
+        for ts in chunk.ts:
+            if not ts:
+                raise ValueError(f"{path}: time-ordered merge needs a ts on every row")
+            try:
+                keys.append(ts_key(ts))
+            except ValueError:
+                raise ValueError(f"{path}: unparseable ts {ts!r}") from None
+            if keys[-1] < last:
+                raise ValueError(f"{path}: rows are not in ts order (at {ts!r})")
+            last = keys[-1]
+        out.append((chunk, keys))
+    return out
+
+class _Source:
+    """One file as a stream of keyed chunks, parsed ahead by the executor."""
+    def __init__(self, path: Path, pool: Optional[Executor], chunk_rows: int, range_bytes: int):
+        self.path = path
+        self.pool = pool
+        size = os.path.getsize(path)
+        self.jobs = deque((str(path), r, chunk_rows) for r in split_ranges(path, max(1, -(-size // range_bytes))))
+        self.inflight: Deque = deque()
+        self.ready: Deque[Keyed] = deque()
+        self.chunk: Optional[FillChunk] = None
+        self.keys = array("d")
+        self.pos = 0
+        self.last = float("-inf")
+        self._fill()
+
+    def _fill(self) -> None:
+        while self.jobs and len(self.inflight) < PREFETCH:
+            job = self.jobs.popleft()
+            self.inflight.append(self.pool.submit(_parse_keyed, job) if self.pool else _parse_keyed(job))
+
+    def advance(self) -> bool:
+        """Move to the next non-empty chunk; False once the file is exhausted."""
+        while not self.ready:
+            if not self.inflight:
+                return False
+            res = self.inflight.popleft()
+            self.ready.extend(res.result() if self.pool else res)
+            self._fill()
+        self.chunk, self.keys = self.ready.popleft()
+        self.pos = 0
+        if self.keys[0] < self.last:  # order inside a range is checked by the worker
+            raise ValueError(f"{self.path}: rows are not in ts order (at {self.chunk.ts[0]!r})")
+        self.last = self.keys[-1]
+        return True
+
+def _take(out: FillChunk, src: FillChunk, lo: int, hi: int) -> None:
+    for name in ("ts", "symbol", "side", "qty", "price", "fees", "account", "exec_id", "note"):
+        getattr(out, name).extend(getattr(src, name)[lo:hi])
+
+def iter_merged_chunks(
+    paths: Sequence[Union[str, Path]],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 0,
+    executor: str = "process",
+    range_bytes: int = RANGE_BYTES,
+) -> Iterator[FillChunk]:
+    """Stream several ts-sorted fill CSVs as one time-ordered sequence of FillChunks.
+
+    A heap over the files' head timestamps drives a k-way merge; from the
+    winning file it takes the whole run of rows up to the runner-up's head
+    (one bisect), so heap work scales with interleaving, not rows. Ties go
+    to the file listed first. With workers > 0, byte ranges of every file are
+    parsed ahead in a process (or thread) pool; memory stays at roughly
+    files x PREFETCH x range_bytes.
+    """
+    paths = [Path(p) for p in paths]
+    if workers > 0:
+        pool: Optional[Executor] = (ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor)(workers)
+    else:
+        pool = None
+    try:
+        sources = [_Source(p, pool, chunk_rows, range_bytes) for p in paths]
+        heap = [(s.keys[0], i) for i, s in enumerate(sources) if s.advance()]
+        heapq.heapify(heap)
+        out = FillChunk()
+        while heap:
+            _, i = heapq.heappop(heap)
+            s = sources[i]
+            if heap:
+                k2, j = heap[0]
+                end = (bisect_right if i < j else bisect_left)(s.keys, k2, s.pos)
+                end = max(end, s.pos + 1)
+            else:
+                end = len(s.keys)
+            while end > s.pos:
+                hi = min(end, s.pos + chunk_rows - len(out))
+                _take(out, s.chunk, s.pos, hi)
+                s.pos = hi
+                if len(out) >= chunk_rows:
+                    yield out
+                    out = FillChunk()
+            if s.pos < len(s.keys) or s.advance():
+                heapq.heappush(heap, (s.keys[s.pos], i))
+        if len(out):
+            yield out
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
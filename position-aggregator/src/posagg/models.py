@@ -1,8 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Deque, Optional, Tuple
 
-@dataclass(frozen=True)
+DEFAULT_ACCOUNT = "default"
+PosKey = Tuple[str, str]  # (account, symbol)
+
+@dataclass(frozen=True, slots=True)
 class Fill:
     ts: str            # ISO string or "YYYY-MM-DD HH:MM:SS"
     symbol: str        # e.g., "MESZ5" or "MCLX5"
@@ -10,23 +13,36 @@ class Fill:
     qty: int
     price: float
     fees: float = 0.0
-    account: str = "default"
+    account: str = DEFAULT_ACCOUNT
     exec_id: Optional[str] = None
     note: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
+    account: str = DEFAULT_ACCOUNT
     net_qty: int = 0                  # signed (+ long, - short)
     avg_price: float = 0.0            # WAC for the open side
     realized_pnl: float = 0.0
     fees_cum: float = 0.0
+    lots: Optional[Deque[Tuple[int, float]]] = field(default=None, repr=False)  # (qty, price), FIFO/LIFO mode only
+    day_realized_start: float = 0.0   # realized_pnl / fees_cum when the current session began
+    day_fees_start: float = 0.0
 
     def reset_day(self) -> None:
-        # Day-P&L rolling could be tracked separately later; base ledger persists.
-        pass
+        # start a new day bucket; the cumulative ledger is untouched
+        self.day_realized_start = self.realized_pnl
+        self.day_fees_start = self.fees_cum
+
+    @property
+    def day_realized(self) -> float:
+        return self.realized_pnl - self.day_realized_start
+
+    @property
+    def day_fees(self) -> float:
+        return self.fees_cum - self.day_fees_start
 
-@dataclass
+@dataclass(slots=True)
 class BlotterLine:
     symbol: str
     net_qty: int
@@ -36,4 +52,8 @@ class BlotterLine:
     rpl: float
     fees: float
     nlv_delta: float                   # rpl + upl - fees
+    stale: bool = False                # mark older than the provider's max age
+    account: str = DEFAULT_ACCOUNT
+    day_rpl: float = 0.0               # realized / fees since the current trading session began
+    day_fees: float = 0.0
 
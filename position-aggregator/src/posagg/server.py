@@ -0,0 +1,240 @@
+from __future__ import annotations
+import asyncio, json, os, signal, socket, time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+from .engine import PositionEngine
+from .journal import StateStore
+from .models import Fill
+
+# Line protocol (UTF-8, one request per line, exactly one reply line each, in order):
+#   F ts,symbol,side,qty,price,fees,account,exec_id,note   -> OK | DUP | ERR <msg>
+#   M SYMBOL PRICE                                         -> OK          (set a mark)
+#   Q [ACCOUNT [SYMBOL]]                                   -> JSON list of blotter lines
+#   S                                                      -> JSON server stats
+#   P                                                      -> PONG
+# Fills may be pipelined; they are acked once applied. Any other request first
+# applies the fills queued before it, so replies always reflect prior fills.
+
+MAX_BATCH = 4096
+SMALL_BATCH = 16  # below this, per-fill apply beats the NumPy batch setup cost
+_HIGH_WATER = 1 << 20  # bytes buffered to a client before we wait for it to read
+
+def fill_line(fill: Fill) -> str:
+    return (f"F {fill.ts},{fill.symbol},{fill.side},{fill.qty},{fill.price!r},{fill.fees!r},"
+            f"{fill.account},{fill.exec_id or ''},{fill.note}")
+
+class FillServer:
+    """Holds one PositionEngine in memory and serves the line protocol on a Unix socket.
+
+    Fills read in one event-loop pass (across all clients) are applied as a
+    single apply_fills_batch at the end of the pass, or as soon as MAX_BATCH
+    are queued, so a busy gateway gets batching and an idle one gets a
+    reply within one loop iteration.
+    """
+    def __init__(self, engine: PositionEngine, store: Optional[StateStore] = None, max_batch: int = MAX_BATCH):
+        self.engine = engine
+        self.store = store
+        self.max_batch = max_batch
+        self._cols: List[list] = [[] for _ in range(9)]  # ts, symbol, side, qty, price, fees, account, exec_id, note
+        self._waiting: List[asyncio.StreamWriter] = []
+        self._scheduled = False
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: set = set()
+        self.clients = 0
+        self.fills = 0
+        self.dups = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.apply_s = 0.0
+
+    # --- batching ---
+    def _queue(self, body: str, writer: asyncio.StreamWriter) -> None:
+        cells = body.split(",", 8)
+        if len(cells) < 5:
+            raise ValueError("fill needs at least ts,symbol,side,qty,price")
+        cells += [""] * (9 - len(cells))
+        side = cells[2].strip().upper()
+        if side not in ("BUY", "SELL"):
+            raise ValueError(f"bad side {cells[2]!r}")
+        row = (cells[0], cells[1].strip(), side, int(cells[3]), float(cells[4]), float(cells[5] or 0),
+               cells[6] or "default", cells[7] or None, cells[8])
+        # unknown symbols are rejected on their own line, before they can sink a batch
+        self.engine.registry.resolve(row[1])
+        for col, v in zip(self._cols, row):
+            col.append(v)
+        self._waiting.append(writer)
+        if len(self._waiting) >= self.max_batch:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self) -> int:
+        """Apply queued fills as one batch and ack each; returns the batch size."""
+        self._scheduled = False
+        waiting, self._waiting = self._waiting, []
+        if not waiting:
+            return 0
+        ts, symbol, side, qty, price, fees, account, exec_id, note = self._cols
+        self._cols = [[] for _ in range(9)]
+        # columns are in Fill field order
+        rows = zip(ts, symbol, side, qty, price, fees, account, exec_id, note)
+        t0 = time.perf_counter()
+        if len(waiting) < SMALL_BATCH:
+            replies = [self._apply_one(row) for row in rows]
+        else:
+            try:
+                kept = self.engine.apply_fills_batch(symbol, side, qty, price, fees, exec_id, ts=ts,
+                                                     account=account, note=note, return_mask=True).tolist()
+                replies = [b"OK\n" if ok else b"DUP\n" for ok in kept]
+            except (ValueError, KeyError):
+                # the batch validates every row (ts included) before it dedups, journals or
+                # applies anything, so nothing is half-done: retry per fill to get one reply each
+                replies = [self._apply_one(row) for row in rows]
+        if self.store is not None:
+            self.store.maybe_snapshot()
+        self.apply_s += time.perf_counter() - t0
+        for writer, reply in zip(waiting, replies):
+            writer.write(reply)
+        n = len(waiting)
+        self.fills += n
+        self.dups += replies.count(b"DUP\n")
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, n)
+        return n
+
+    def _apply_one(self, row: tuple) -> bytes:
+        try:
+            return b"OK\n" if self.engine.apply_fill(Fill(*row)) else b"DUP\n"
+        except (ValueError, KeyError) as e:
+            return f"ERR {e}\n".encode()
+
+    # --- requests ---
+    def _answer(self, line: str) -> str:
+        op, _, rest = line.partition(" ")
+        op = op.upper()
+        if op == "Q":
+            args = rest.split()
+            lines = self.engine.all_blotter()
+            if args:
+                lines = [bl for bl in lines if bl.account == args[0] and (len(args) < 2 or bl.symbol == args[1])]
+            return json.dumps([asdict(bl) for bl in lines], separators=(",", ":"))
+        if op == "M":
+            sym, px = rest.split()
+            self.engine.mark_provider.set_mark(sym, float(px))
+            return "OK"
+        if op == "S":
+            return json.dumps(self.stats(), separators=(",", ":"))
+        if op == "P":
+            return "PONG"
+        raise ValueError(f"unknown request {op!r}")
+
+    def stats(self) -> dict:
+        return {
+            "clients": self.clients, "fills": self.fills, "dups": self.dups, "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "avg_batch": self.fills / self.batches if self.batches else 0.0,
+            "apply_us_per_fill": 1e6 * self.apply_s / self.fills if self.fills else 0.0,
+            "positions": len(self.engine.positions),
+        }
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clients += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode().rstrip("\r\n")
+                if not line:
+                    continue
+                reply = None
+                try:
+                    if line[:2] in ("F ", "f "):
+                        self._queue(line[2:], writer)
+                    else:
+                        self.flush()  # keep replies in request order
+                        reply = self._answer(line)
+                except (ValueError, KeyError, AttributeError) as e:
+                    self.flush()
+                    reply = f"ERR {e}"
+                if reply is not None:
+                    writer.write(reply.encode() + b"\n")
+                if writer.transport.get_write_buffer_size() > _HIGH_WATER:
+                    await writer.drain()
+        finally:
+            self.flush()
+            self.clients -= 1
+            self._writers.discard(writer)
+            writer.close()
+
+    async def serve(self, socket_path: Union[str, Path]) -> None:
+        """Serve until SIGINT/SIGTERM; queued fills are applied before returning."""
+        path = str(socket_path)
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._client, path=path)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            await stop.wait()
+        finally:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()  # wait_closed() waits for connections on newer Pythons
+            await self._server.wait_closed()
+            self.flush()
+            os.unlink(path)
+
+class Client:
+    """Blocking client for FillServer (one request in flight unless send_fills pipelines)."""
+    def __init__(self, socket_path: Union[str, Path]):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(str(socket_path))
+        self._r = self._sock.makefile("rb")
+
+    def _call(self, line: str) -> str:
+        self._sock.sendall(line.encode() + b"\n")
+        return self._r.readline().decode().rstrip("\n")
+
+    def send_fill(self, fill: Fill) -> bool:
+        """True if applied, False if the exec_id was a duplicate."""
+        reply = self._call(fill_line(fill))
+        if reply.startswith("ERR"):
+            raise ValueError(reply[4:])
+        return reply == "OK"
+
+    def send_fills(self, fills: Iterable[Fill], window: int = 1024) -> List[str]:
+        # pipelined: up to `window` fills on the wire before reading acks
+        replies: List[str] = []
+        buf: List[str] = []
+        for fill in fills:
+            buf.append(fill_line(fill))
+            if len(buf) == window:
+                replies += self._send_many(buf)
+                buf = []
+        if buf:
+            replies += self._send_many(buf)
+        return replies
+
+    def _send_many(self, lines: List[str]) -> List[str]:
+        self._sock.sendall(("\n".join(lines) + "\n").encode())
+        return [self._r.readline().decode().rstrip("\n") for _ in lines]
+
+    def mark(self, symbol: str, price: float) -> None:
+        self._call(f"M {symbol} {price!r}")
+
+    def blotter(self, account: Optional[str] = None, symbol: Optional[str] = None) -> List[dict]:
+        args = " ".join(a for a in (account, symbol) if a)
+        return json.loads(self._call(f"Q {args}".rstrip()))
+
+    def stats(self) -> dict:
+        return json.loads(self._call("S"))
+
+    def close(self) -> None:
+        self._r.close()
+        self._sock.close()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+import os, pickle, tempfile, zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .csvload import DEFAULT_CHUNK_ROWS, FillChunk, iter_fill_chunks, split_ranges
+from .engine import PositionEngine
+from .models import Position, PosKey
+
+SHARD_BY = ("account", "account-symbol")
+
+# A shard's slice of one parsed chunk, as plain arrays (cheap to pickle to a spill file)
+Piece = Dict[str, np.ndarray]
+
+def shard_of(account: str, symbol: str, nshards: int, by: str = "account") -> int:
+    # stable across processes (str hash() is salted per interpreter)
+    key = account if by == "account" else f"{account}\x1f{symbol}"
+    return zlib.crc32(key.encode()) % nshards
+
+def _split_chunk(chunk: FillChunk, nshards: int, by: str, memo: dict) -> List[Tuple[int, Piece]]:
+    keys = chunk.account if by == "account" else list(zip(chunk.account, chunk.symbol))
+    sid = np.empty(len(chunk), dtype=np.int32)
+    for i, key in enumerate(keys):
+        k = memo.get(key)
+        if k is None:
+            acct, sym = (key, "") if by == "account" else key
+            k = memo[key] = shard_of(acct, sym, nshards, by)
+        sid[i] = k
+    cols = {
+        "symbol": np.asarray(chunk.symbol),
+        "side": np.frombuffer(chunk.side, dtype=np.int8),
+        "qty": np.frombuffer(chunk.qty, dtype=np.int64),
+        "price": np.frombuffer(chunk.price, dtype=np.float64),
+        "fees": np.frombuffer(chunk.fees, dtype=np.float64),
+        "account": np.asarray(chunk.account),
+        "exec_id": np.asarray(chunk.exec_id, dtype=object),
+        "ts": np.asarray(chunk.ts),
+    }
+    out = []
+    for k in np.unique(sid).tolist():
+        idx = np.flatnonzero(sid == k)
+        out.append((k, {name: col[idx] for name, col in cols.items()}))
+    return out
+
+def _spill_path(spill_dir: str, job: int, shard: int) -> str:
+    return os.path.join(spill_dir, f"{job:05d}-{shard:05d}.pkl")
+
+def _parse_range(job: Tuple[int, str, Tuple[int, int], int, str, int, str]) -> List[int]:
+    # phase 1 (worker): parse one byte range, appending each chunk's pieces to its shard's
+    # spill file as they come (memory stays one chunk); returns the shards written, so no
+    # rows travel back through the parent
+    j, path, byte_range, nshards, by, chunk_rows, spill_dir = job
+    files: Dict[int, BinaryIO] = {}
+    memo: dict = {}
+    try:
+        for chunk in iter_fill_chunks(path, chunk_rows=chunk_rows, byte_range=byte_range):
+            for k, piece in _split_chunk(chunk, nshards, by, memo):
+                f = files.get(k)
+                if f is None:
+                    f = files[k] = open(_spill_path(spill_dir, j, k), "wb")
+                pickle.dump(piece, f, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for f in files.values():
+            f.close()
+    return sorted(files)
+
+def _iter_spill(path: str) -> Iterator[Piece]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+def _apply_shard(job: Tuple[int, List[int], str, int, str, bool]) -> Dict[PosKey, Position]:
+    # phase 2 (worker): one engine per shard, reading its spill files piece by piece in file
+    # order and applying them in batches of up to chunk_rows rows
+    k, jobs, spill_dir, chunk_rows, accounting, exact = job
+    engine = PositionEngine(accounting=accounting, exact=exact)
+
+    def apply(pieces: List[Piece]) -> None:
+        p = pieces[0] if len(pieces) == 1 else {c: np.concatenate([q[c] for q in pieces]) for c in pieces[0]}
+        engine.apply_fills_batch(p["symbol"], p["side"], p["qty"], p["price"], p["fees"],
+                                 p["exec_id"], ts=p["ts"], account=p["account"])
+
+    pending: List[Piece] = []
+    rows = 0
+    for j in jobs:
+        for piece in _iter_spill(_spill_path(spill_dir, j, k)):
+            pending.append(piece)
+            rows += len(piece["qty"])
+            if rows >= chunk_rows:
+                apply(pending)
+                pending, rows = [], 0
+    if pending:
+        apply(pending)
+    return engine.positions
+
+def aggregate_sharded(
+    paths: Sequence[Union[str, Path]],
+    workers: Optional[int] = None,
+    shard_by: str = "account",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    **engine_kwargs,
+) -> PositionEngine:
+    """Aggregate fill CSVs across a process pool; returns one engine with the merged book.
+
+    Phase 1 parses byte ranges of every file in parallel, buckets rows by
+    shard (crc32 of the account, or of account+symbol) and spills each
+    bucket to a temp file. Phase 2 applies each shard's files, in file
+    order, in its own engine; only shard numbers and the finished books
+    pass through the parent. Shards own disjoint (account, symbol) keys, so
+    merging is a dict update. Exec-id dedup runs
+    per shard: a resent fill always hashes to the shard of the original, but
+    one exec_id reused across accounts (or symbols, with "account-symbol")
+    is no longer caught.
+    """
+    if shard_by not in SHARD_BY:
+        raise ValueError(f"shard_by must be one of {SHARD_BY}")
+    workers = workers or os.cpu_count() or 1
+    nshards = workers * 4  # a few shards per worker evens out skewed accounts
+    ranges = [(str(p), r) for p in paths for r in split_ranges(p, workers)]
+
+    merged = PositionEngine(**engine_kwargs)
+    with tempfile.TemporaryDirectory(prefix="posagg-shard-") as spill_dir, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [(j, path, r, nshards, shard_by, chunk_rows, spill_dir) for j, (path, r) in enumerate(ranges)]
+        per_shard: List[List[int]] = [[] for _ in range(nshards)]
+        for j, written in enumerate(pool.map(_parse_range, jobs)):
+            for k in written:
+                per_shard[k].append(j)
+        shards = [(k, js, spill_dir, chunk_rows, merged.accounting, merged.exact)
+                  for k, js in enumerate(per_shard) if js]
+        for positions in pool.map(_apply_shard, shards):
+            merged.positions.update(positions)
+    return merged
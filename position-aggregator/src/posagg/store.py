@@ -0,0 +1,189 @@
+from __future__ import annotations
+from array import array
+from collections.abc import MutableMapping
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import sys
+import numpy as np
+from .models import Position, PosKey
+
+_COLUMNS = ("net_qty", "avg_price", "realized_pnl", "fees_cum", "day_realized_start", "day_fees_start")
+
+def _column(name: str) -> property:
+    def get(self):
+        return getattr(self._store, name)[self._i]
+    def set(self, value):
+        getattr(self._store, name)[self._i] = value
+    return property(get, set)
+
+class PositionView:
+    """Position-like handle on one row of an ArrayPositionStore.
+
+    Reads and writes go straight to the store's arrays, so engine code that
+    does `pos.net_qty += q` works unchanged. A view is only valid until its
+    key is deleted from the store (rows are swap-removed).
+    """
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: ArrayPositionStore, i: int):
+        self._store = store
+        self._i = i
+
+    net_qty = _column("net_qty")
+    avg_price = _column("avg_price")
+    realized_pnl = _column("realized_pnl")
+    fees_cum = _column("fees_cum")
+    day_realized_start = _column("day_realized_start")
+    day_fees_start = _column("day_fees_start")
+
+    @property
+    def account(self) -> str:
+        return self._store._keys[self._i][0]
+
+    @property
+    def symbol(self) -> str:
+        return self._store._keys[self._i][1]
+
+    @property
+    def lots(self) -> Optional[Deque[Tuple[int, float]]]:
+        return self._store._lots.get(self._i)
+
+    @lots.setter
+    def lots(self, value) -> None:
+        if value is None:
+            self._store._lots.pop(self._i, None)
+        else:
+            self._store._lots[self._i] = value
+
+    def reset_day(self) -> None:
+        s, i = self._store, self._i
+        s.day_realized_start[i] = s.realized_pnl[i]
+        s.day_fees_start[i] = s.fees_cum[i]
+
+    @property
+    def day_realized(self) -> float:
+        return self.realized_pnl - self.day_realized_start
+
+    @property
+    def day_fees(self) -> float:
+        return self.fees_cum - self.day_fees_start
+
+    def to_position(self) -> Position:
+        return Position(symbol=self.symbol, account=self.account, net_qty=self.net_qty, avg_price=self.avg_price,
+                        realized_pnl=self.realized_pnl, fees_cum=self.fees_cum, lots=self.lots,
+                        day_realized_start=self.day_realized_start, day_fees_start=self.day_fees_start)
+
+    def __repr__(self) -> str:
+        return repr(self.to_position()).replace("Position(", "PositionView(", 1)
+
+class ArrayPositionStore(MutableMapping):
+    """(account, symbol) -> position, stored as parallel typed arrays.
+
+    Drop-in for PositionEngine.positions: one int64 and five float64 slots
+    per key plus interned key strings, instead of a dataclass object (and its
+    boxed numbers) per key. revalue() marks the whole book with NumPy in one
+    pass. Lot queues (FIFO/LIFO mode) live in a side dict, only for keys
+    that have them.
+    """
+    def __init__(self):
+        self._index: Dict[PosKey, int] = {}
+        self._keys: List[PosKey] = []
+        self._sym_index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self.sym_id = array("q")
+        self.net_qty = array("q")
+        self.avg_price = array("d")
+        self.realized_pnl = array("d")
+        self.fees_cum = array("d")
+        self.day_realized_start = array("d")
+        self.day_fees_start = array("d")
+        self._lots: Dict[int, Deque[Tuple[int, float]]] = {}
+
+    # --- mapping protocol ---
+    def __getitem__(self, key: PosKey) -> PositionView:
+        return PositionView(self, self._index[key])
+
+    def get(self, key: PosKey, default=None):
+        i = self._index.get(key)
+        return default if i is None else PositionView(self, i)
+
+    def __setitem__(self, key: PosKey, pos) -> None:
+        i = self._index.get(key)
+        if i is None:
+            acct, sym = sys.intern(key[0]), sys.intern(key[1])
+            if acct is not key[0] or sym is not key[1]:
+                key = (acct, sym)
+            i = self._index[key] = len(self._keys)
+            self._keys.append(key)
+            sid = self._sym_index.get(key[1])
+            if sid is None:
+                sid = self._sym_index[key[1]] = len(self._symbols)
+                self._symbols.append(key[1])
+            self.sym_id.append(sid)
+            for name in _COLUMNS:
+                getattr(self, name).append(getattr(pos, name))
+        else:
+            for name in _COLUMNS:
+                getattr(self, name)[i] = getattr(pos, name)
+        if pos.lots:
+            self._lots[i] = pos.lots
+        else:
+            self._lots.pop(i, None)
+
+    def __delitem__(self, key: PosKey) -> None:
+        i = self._index.pop(key)
+        last = len(self._keys) - 1
+        if i != last:
+            # move the last row into the hole
+            moved = self._keys[last]
+            self._keys[i] = moved
+            self._index[moved] = i
+            for name in ("sym_id",) + _COLUMNS:
+                col = getattr(self, name)
+                col[i] = col[last]
+            if last in self._lots:
+                self._lots[i] = self._lots.pop(last)
+            else:
+                self._lots.pop(i, None)
+        else:
+            self._lots.pop(i, None)
+        self._keys.pop()
+        for name in ("sym_id",) + _COLUMNS:
+            getattr(self, name).pop()
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[PosKey]:
+        return iter(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # --- bulk ---
+    def reset_day(self) -> None:
+        """Position.reset_day() for every row, as two array copies."""
+        self.day_realized_start[:] = self.realized_pnl
+        self.day_fees_start[:] = self.fees_cum
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Copies of the position columns as NumPy arrays (row order = iteration order)."""
+        out = {name: np.array(getattr(self, name)) for name in _COLUMNS}
+        out["sym_id"] = np.array(self.sym_id)
+        return out
+
+    def revalue(self, mark_for: Callable[[str], Optional[float]],
+                tickmath: Callable[[str], Tuple[float, float]]) -> np.ndarray:
+        """UPL of every row: one mark and tick lookup per symbol, then vector math."""
+        mark = np.empty(len(self._symbols))
+        scale = np.empty(len(self._symbols))
+        for j, sym in enumerate(self._symbols):
+            m = mark_for(sym)
+            tick_size, dollars_per_tick = tickmath(sym)
+            mark[j] = np.nan if m is None else m
+            scale[j] = dollars_per_tick / tick_size
+        sid = np.frombuffer(self.sym_id, dtype=np.int64)
+        net = np.frombuffer(self.net_qty, dtype=np.int64)
+        avg = np.frombuffer(self.avg_price, dtype=np.float64)
+        upl = (mark[sid] - avg) * scale[sid] * net
+        upl[(net == 0) | np.isnan(upl)] = 0.0
+        return upl
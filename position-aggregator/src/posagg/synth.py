@@ -0,0 +1,102 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+import numpy as np
+from .csvload import COLUMNS, DEFAULT_CHUNK_ROWS, FillChunk
+from .instruments import default_registry
+
+# Seeded synthetic fills for benchmarks: MES/MCL-style contracts, skewed account activity
+# and a controllable add / reduce / close / flip mix.
+
+SYMBOLS: Dict[str, float] = {
+    "MESZ5": 6000.0, "MESH6": 6050.0, "MNQZ5": 21000.0, "M2KZ5": 2200.0,
+    "MCLX5": 70.0, "MCLZ5": 70.5, "MGCZ5": 2650.0, "MYMZ5": 44000.0,
+}
+MIX: Dict[str, float] = {"add": 0.40, "reduce": 0.30, "close": 0.15, "flip": 0.15}
+FEE_PER_CONTRACT = 0.62
+
+def generate_fill_chunks(
+    n: int,
+    seed: int = 7,
+    accounts: int = 100,
+    symbols: Optional[Dict[str, float]] = None,
+    mix: Optional[Dict[str, float]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    start: str = "2025-10-01T13:30:00",
+) -> Iterator[FillChunk]:
+    """Yield n fills as FillChunks; the same arguments always give the same fills.
+
+    Each row picks an (account, symbol); a flat key opens, an open one adds,
+    reduces, closes or flips per `mix`. Prices walk on each symbol's tick grid.
+    """
+    symbols = symbols or SYMBOLS
+    mix = mix or MIX
+    p_add = mix["add"]
+    p_red = p_add + mix["reduce"]
+    p_close = p_red + mix["close"]
+    names = list(symbols)
+    ticks = [default_registry().resolve(s).tick_size for s in names]
+    level = [round(px / t) for px, t in zip(symbols.values(), ticks)]  # price in ticks
+    acct_names = [f"ACC{i:05d}" for i in range(accounts)]
+    nets = [0] * (accounts * len(names))
+    rng = np.random.default_rng(seed)
+    t0 = np.datetime64(start, "ms")
+    done = 0
+    while done < n:
+        m = min(chunk_rows, n - done)
+        # activity is skewed: a few accounts trade most of the flow
+        acct = (accounts * rng.random(m) ** 3).astype(np.int64).tolist()
+        sym = rng.integers(0, len(names), m).tolist()
+        act = rng.random(m).tolist()
+        size = rng.integers(1, 6, m).tolist()
+        buy = (rng.random(m) < 0.5).tolist()
+        step = rng.integers(-3, 4, m).tolist()
+        t0 = t0 + np.cumsum(rng.exponential(20.0, m).astype(np.int64) + 1).astype("timedelta64[ms]")
+        ts = np.datetime_as_string(t0, unit="ms").tolist()
+        t0 = t0[-1]
+
+        chunk = FillChunk()
+        chunk.ts = ts
+        for j in range(m):
+            s = sym[j]
+            k = acct[j] * len(names) + s
+            net = nets[k]
+            q = size[j]
+            if net == 0:
+                d = q if buy[j] else -q
+            else:
+                sgn = 1 if net > 0 else -1
+                u = act[j]
+                if u < p_add:
+                    d = sgn * q
+                elif u < p_red and abs(net) > 1:
+                    d = -sgn * (1 + (q - 1) % (abs(net) - 1))
+                elif u < p_close:  # also a reduce of a 1-lot
+                    d = -net
+                else:
+                    d = -net - sgn * q
+            nets[k] = net + d
+            level[s] += step[j]
+            chunk.symbol.append(names[s])
+            chunk.side.append(1 if d > 0 else -1)
+            chunk.qty.append(abs(d))
+            chunk.price.append(round(level[s] * ticks[s], 6))
+            chunk.fees.append(FEE_PER_CONTRACT * abs(d))
+            chunk.account.append(acct_names[acct[j]])
+        chunk.exec_id = [f"S{seed}-{i}" for i in range(done, done + m)]
+        chunk.note = [""] * m
+        done += m
+        yield chunk
+
+def write_fills_csv(path: Union[str, Path], n: int, **kw) -> int:
+    """Write generate_fill_chunks(n, **kw) as a fills CSV; returns rows written."""
+    rows = 0
+    with open(path, "w", newline="") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        for c in generate_fill_chunks(n, **kw):
+            side = ["BUY" if s > 0 else "SELL" for s in c.side]
+            f.writelines(f"{t},{s},{sd},{q},{p!r},{fe:.2f},{a},{e},\n"
+                         for t, s, sd, q, p, fe, a, e in zip(c.ts, c.symbol, side, c.qty, c.price, c.fees,
+                                                            c.account, c.exec_id))
+            rows += len(c)
+    return rows
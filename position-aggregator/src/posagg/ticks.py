@@ -0,0 +1,218 @@
+from __future__ import annotations
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+from typing import Deque, Optional, Tuple
+import numpy as np
+from .models import DEFAULT_ACCOUNT
+
+GRID_TOL = 1e-6       # |price / tick - nearest tick| beyond this is off-grid
+SLIP_SCALE = 100      # slippage is carried in 1/100 ticks (0.5, 1.25 ticks ... stay exact)
+
+class OffGridPriceError(ValueError):
+    pass
+
+@lru_cache(maxsize=None)
+def cents_per_tick(dollars_per_tick: float) -> Tuple[int, int]:
+    """$/tick x 100 as an exact (num, den) of its decimal spelling: 1.25 -> (125, 1), 15.625 -> (3125, 2)."""
+    f = Fraction(repr(float(dollars_per_tick))) * 100
+    return f.numerator, f.denominator
+
+def div_half_even(num: int, den: int) -> int:
+    # num / den rounded to the nearest integer, ties to even (den > 0):
+    # with 0 <= r < den, 2r + (q odd) > den is exactly "round up"
+    q = num // den
+    return q + (2 * (num - q * den) + (q & 1) > den)
+
+def div_half_even_array(num: np.ndarray, den) -> np.ndarray:
+    if den == 1:
+        return num
+    if num.size and np.abs(num).max() < 2 ** 52:
+        # |num| < 2**52: num / den stays on the right side of every half-integer
+        # and exact halves are representable, so rint (half-even) is exact
+        return np.rint(num / den).astype(np.int64)
+    q = num // den
+    r = num - q * den
+    r *= 2
+    r += q & 1
+    q += r > den
+    return q
+
+def price_to_ticks(price: float, tick_size: float) -> int:
+    t = price / tick_size
+    n = round(t)
+    if abs(t - n) > GRID_TOL:
+        raise OffGridPriceError(f"price {price!r} is not on the {tick_size!r} tick grid")
+    return n
+
+def prices_to_ticks(prices, tick_size) -> np.ndarray:
+    """int64 ticks for a price column (tick_size scalar or per row); raises on off-grid prices."""
+    t = np.asarray(prices, dtype=np.float64) / tick_size
+    n = np.rint(t)
+    bad = np.abs(t - n) > GRID_TOL
+    if bad.any():
+        i = int(np.flatnonzero(bad)[0])
+        tick = np.broadcast_to(tick_size, t.shape)[i]
+        raise OffGridPriceError(f"price {np.asarray(prices).reshape(-1)[i]!r} (row {i}) "
+                                f"is not on the {float(tick)!r} tick grid")
+    return n.astype(np.int64)
+
+def ticks_to_cents(tick_qty: int, dollars_per_tick: float) -> int:
+    """Exact dollar value of tick_qty ticks (x contracts), in cents, half-even."""
+    num, den = cents_per_tick(dollars_per_tick)
+    return div_half_even(tick_qty * num, den)
+
+def ticks_to_cents_array(tick_qty, dollars_per_tick: float) -> np.ndarray:
+    num, den = cents_per_tick(dollars_per_tick)
+    return div_half_even_array(np.asarray(tick_qty, dtype=np.int64) * num, den)
+
+def slippage_to_units(slippage_ticks):
+    # slippage ticks -> int64 1/SLIP_SCALE ticks
+    s = np.asarray(slippage_ticks, dtype=np.float64) * SLIP_SCALE
+    n = np.rint(s)
+    if s.size and np.abs(s - n).max() > GRID_TOL * SLIP_SCALE:
+        raise ValueError(f"slippage must be a multiple of 1/{SLIP_SCALE} tick")
+    return n.astype(np.int64)
+
+def round_trip_cents(entry_ticks, exit_ticks, sign, qty, dollars_per_tick: float,
+                     fee_cents_per_side=0, slippage_units=0) -> np.ndarray:
+    """Net P&L of round trips in int64 cents (vectorized; scalars broadcast).
+
+    All inputs are integers from ingest: prices in ticks (prices_to_ticks),
+    round-trip slippage in 1/SLIP_SCALE ticks (slippage_to_units), fees in
+    cents per side per contract. Gross move less slippage turns into cents
+    once, half-even: pnl_futures() without any float rounding on the way.
+    """
+    num, den = cents_per_tick(dollars_per_tick)
+    den *= SLIP_SCALE
+    g = gcd(num, den)
+    num, den = num // g, den // g
+    qty = np.asarray(qty, dtype=np.int64)
+    units = np.subtract(exit_ticks, entry_ticks, dtype=np.int64)
+    units *= SLIP_SCALE
+    units *= np.asarray(sign, dtype=np.int64)
+    units -= slippage_units
+    units *= qty
+    if num != 1:
+        units *= num
+    cents = div_half_even_array(units, den)
+    cents -= 2 * np.asarray(fee_cents_per_side, dtype=np.int64) * qty
+    return cents
+
+class TickPosition:
+    """WAC position held in integers: net contracts, open cost in ticks,
+    realized P&L in ticks and fees in cents.
+
+    Float fields (avg_price, realized_pnl, fees_cum) are derived on read, so
+    they never accumulate rounding error however many fills are applied. A
+    partial close releases cost * closed / open ticks of basis (half-even);
+    the remainder stays with the open contracts, so a full round trip always
+    realizes exactly its tick P&L.
+    """
+    __slots__ = ("symbol", "account", "net_qty", "cost_ticks", "realized_ticks", "fees_cents",
+                 "tick_size", "dollars_per_tick", "day_realized_ticks_start", "day_fees_cents_start")
+
+    def __init__(self, symbol: str, account: str = DEFAULT_ACCOUNT, tick_size: float = 0.25,
+                 dollars_per_tick: float = 1.25, net_qty: int = 0, cost_ticks: int = 0,
+                 realized_ticks: int = 0, fees_cents: int = 0, day_realized_ticks_start: int = 0,
+                 day_fees_cents_start: int = 0):
+        self.symbol = symbol
+        self.account = account
+        self.tick_size = tick_size
+        self.dollars_per_tick = dollars_per_tick
+        self.net_qty = net_qty
+        self.cost_ticks = cost_ticks
+        self.realized_ticks = realized_ticks
+        self.fees_cents = fees_cents
+        self.day_realized_ticks_start = day_realized_ticks_start
+        self.day_fees_cents_start = day_fees_cents_start
+
+    lots: Optional[Deque[Tuple[int, float]]] = None  # WAC only; keeps the Position interface
+
+    def apply_ticks(self, signed_qty: int, px: int) -> int:
+        """Book one fill at px ticks; returns the realized ticks x contracts."""
+        net = self.net_qty
+        if net == 0 or (net > 0) == (signed_qty > 0):
+            self.cost_ticks += px * (signed_qty if signed_qty > 0 else -signed_qty)
+            self.net_qty = net + signed_qty
+            return 0
+        open_qty = net if net > 0 else -net
+        close = signed_qty if signed_qty > 0 else -signed_qty
+        if close >= open_qty:
+            close, released = open_qty, self.cost_ticks
+        else:
+            released = div_half_even(self.cost_ticks * close, open_qty)
+        realized = (px * close - released) if net > 0 else (released - px * close)
+        self.realized_ticks += realized
+        remaining = net + signed_qty
+        if remaining == 0:
+            self.cost_ticks = 0
+        elif (remaining > 0) == (net > 0):
+            self.cost_ticks -= released
+        else:
+            # flipped: the overfill opens at the fill price
+            self.cost_ticks = px * (remaining if remaining > 0 else -remaining)
+        self.net_qty = remaining
+        return realized
+
+    def apply(self, signed_qty: int, price: float) -> int:
+        return self.apply_ticks(signed_qty, price_to_ticks(price, self.tick_size))
+
+    def upl_cents(self, mark: float) -> int:
+        if self.net_qty == 0:
+            return 0
+        try:
+            mark_ticks = price_to_ticks(mark, self.tick_size)
+        except OffGridPriceError:
+            # mid/settlement marks may sit between ticks: exact from the mark's decimal spelling
+            mark_ticks = Fraction(repr(mark)) / Fraction(repr(self.tick_size))
+        upl = mark_ticks * abs(self.net_qty) - self.cost_ticks
+        if self.net_qty < 0:
+            upl = -upl
+        if isinstance(upl, int):
+            return ticks_to_cents(upl, self.dollars_per_tick)
+        num, den = cents_per_tick(self.dollars_per_tick)
+        return round(upl * num / den)
+
+    # --- Position interface (floats derived from the integer state) ---
+    @property
+    def avg_price(self) -> float:
+        if self.net_qty == 0:
+            return 0.0
+        return self.cost_ticks * self.tick_size / abs(self.net_qty)
+
+    @property
+    def realized_cents(self) -> int:
+        return ticks_to_cents(self.realized_ticks, self.dollars_per_tick)
+
+    @property
+    def realized_pnl(self) -> float:
+        return self.realized_cents / 100
+
+    @property
+    def fees_cum(self) -> float:
+        return self.fees_cents / 100
+
+    def reset_day(self) -> None:
+        self.day_realized_ticks_start = self.realized_ticks
+        self.day_fees_cents_start = self.fees_cents
+
+    @property
+    def day_realized(self) -> float:
+        # ticks since the session began -> cents once, like realized_pnl
+        return ticks_to_cents(self.realized_ticks - self.day_realized_ticks_start, self.dollars_per_tick) / 100
+
+    @property
+    def day_fees(self) -> float:
+        return (self.fees_cents - self.day_fees_cents_start) / 100
+
+    def state(self) -> dict:
+        return {"tick_size": self.tick_size, "dollars_per_tick": self.dollars_per_tick,
+                "cost_ticks": self.cost_ticks, "realized_ticks": self.realized_ticks,
+                "fees_cents": self.fees_cents, "day_realized_ticks_start": self.day_realized_ticks_start,
+                "day_fees_cents_start": self.day_fees_cents_start}
+
+    def __repr__(self) -> str:
+        return (f"TickPosition(symbol={self.symbol!r}, account={self.account!r}, net_qty={self.net_qty}, "
+                f"cost_ticks={self.cost_ticks}, realized_ticks={self.realized_ticks}, "
+                f"fees_cents={self.fees_cents})")
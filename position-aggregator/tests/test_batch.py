@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from posagg.engine import PositionEngine
+from posagg.models import Fill
+from posagg.store import ArrayPositionStore
+from posagg.synth import generate_fill_chunks
+
+def _state(eng):
+    return {k: (p.net_qty, p.avg_price, p.realized_pnl, p.fees_cum, list(p.lots or ()))
+            for k, p in eng.positions.items()}
+
+def _assert_same(a, b):
+    # by key (the WAC batch creates positions in sorted key order); floats differ in summation order
+    sa, sb = _state(a), _state(b)
+    assert sorted(sa) == sorted(sb)
+    for k in sa:
+        x, y = sa[k], sb[k]
+        assert x[0] == y[0] and x[4] == y[4], k
+        assert all(math.isclose(u, v, rel_tol=1e-12, abs_tol=1e-6) for u, v in zip(x[1:4], y[1:4])), (k, x, y)
+
+@pytest.mark.parametrize("accounting", ["wac", "fifo", "lifo"])
+@pytest.mark.parametrize("store", [dict, ArrayPositionStore])
+def test_batch_matches_per_fill(accounting, store):
+    one = PositionEngine(accounting=accounting, positions=store())
+    many = PositionEngine(accounting=accounting, positions=store())
+    for ch in generate_fill_chunks(20_000, seed=3, accounts=30, chunk_rows=4_000):
+        for f in ch.iter_fills():
+            one.apply_fill(f)
+        many.apply_fills_batch(ch.symbol, ch.side, ch.qty, ch.price, ch.fees, ch.exec_id,
+                               ts=ch.ts, account=ch.account)
+    _assert_same(one, many)
+
+def test_batch_flip_through_zero():
+    # long 3, sell 5 (flip short 2 at 102), buy 2 (flat): MES is $5 a point
+    fills = [Fill(ts="", symbol="MESZ5", side=s, qty=q, price=px)
+             for s, q, px in (("BUY", 3, 100.0), ("SELL", 5, 102.0), ("BUY", 2, 101.0))]
+    eng = PositionEngine()
+    eng.apply_fills_batch([f.symbol for f in fills], [f.side for f in fills],
+                          [f.qty for f in fills], [f.price for f in fills])
+    p = eng.positions[("default", "MESZ5")]
+    assert (p.net_qty, p.realized_pnl) == (0, 40.0)
+
+def test_batch_skips_seen_exec_ids():
+    eng = PositionEngine()
+    eng.apply_fill(Fill(ts="", symbol="MESZ5", side="BUY", qty=1, price=100.0, exec_id="x1"))
+    eng.apply_fills_batch(["MESZ5", "MESZ5"], ["BUY", "BUY"], [1, 1], [100.0, 100.0],
+                          exec_id=["x1", "x2"])
+    assert eng.positions[("default", "MESZ5")].net_qty == 2
+
+def test_batch_rejects_before_applying():
+    eng = PositionEngine()
+    with pytest.raises(ValueError):
+        eng.apply_fills_batch(["MESZ5", "MESZ5"], ["BUY", "HOLD"], [1, 1], [100.0, 100.0],
+                              exec_id=["a", "b"])
+    assert not eng.positions and "a" not in eng.seen_exec_ids
+
+@pytest.mark.parametrize("accounting, exact", [("wac", False), ("wac", True), ("fifo", False), ("lifo", False)])
+@pytest.mark.parametrize("batch", [False, True])
+@pytest.mark.parametrize("opened", [0, 2])
+def test_zero_qty_fill_only_books_fees(accounting, exact, batch, opened):
+    eng = PositionEngine(accounting=accounting, exact=exact)
+    if opened:
+        eng.apply_fill(Fill(ts="", symbol="MESZ5", side="BUY", qty=opened, price=6000.0))
+    if batch:
+        eng.apply_fills_batch(["MESZ5"], ["SELL"], [0], [6010.0], [1.0], exec_id=["z"])
+    else:
+        eng.apply_fill(Fill(ts="", symbol="MESZ5", side="SELL", qty=0, price=6010.0, fees=1.0, exec_id="z"))
+    p = eng.positions[("default", "MESZ5")]
+    assert (p.net_qty, p.avg_price, p.realized_pnl, p.fees_cum) == (opened, 6000.0 if opened else 0.0, 0.0, 1.0)
+    assert list(p.lots or ()) == ([(opened, 6000.0)] if opened and accounting != "wac" else [])
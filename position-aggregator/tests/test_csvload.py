@@ -0,0 +1,35 @@
+import pytest
+
+from posagg.csvload import iter_fill_chunks, split_ranges
+
+HEADER = "ts,symbol,side,qty,price,fees,account,exec_id,note\r\n"
+
+def _rows(path, **kw):
+    return [f for c in iter_fill_chunks(path, **kw) for f in c.iter_fills()]
+
+def test_quoted_newline_and_unicode_separators(tmp_path):
+    path = tmp_path / "fills.csv"
+    path.write_text(HEADER
+                    + '2025-10-01T14:00:00,MESZ5,BUY,1,6000.0,0.62,a,e1,"multi\nline"\r\n'
+                    + "2025-10-01T14:00:01,MESZ5,sell,2,6000.25,0.62,a,e2,x y\u0085z\r\n"
+                    + "\r\n"
+                    + '2025-10-01T14:00:02,MESZ5,BUY,3,6000.5,0.62,a,e3,"a ""q"" b"\n',
+                    encoding="utf-8", newline="")
+    rows = _rows(path)
+    assert [(f.side, f.qty, f.note) for f in rows] == [
+        ("BUY", 1, "multi\nline"), ("SELL", 2, "x y\u0085z"), ("BUY", 3, 'a "q" b')]
+    assert _rows(path, byte_range=(0, path.stat().st_size)) == rows
+
+def test_byte_ranges_cover_every_row(tmp_path):
+    path = tmp_path / "fills.csv"
+    path.write_text(HEADER + "".join(f"2025-10-01T14:00:{i:02d},MESZ5,BUY,{i + 1},6000.0,0,a,e{i},n {i}\r\n"
+                                     for i in range(50)), encoding="utf-8", newline="")
+    whole = _rows(path)
+    parts = [f for r in split_ranges(path, 7) for f in _rows(path, byte_range=r)]
+    assert parts == whole and len(whole) == 50
+
+def test_unknown_side_is_rejected(tmp_path):
+    path = tmp_path / "fills.csv"
+    path.write_text(HEADER + "2025-10-01T14:00:00,MESZ5,HOLD,1,6000.0,0,a,e1,\n")
+    with pytest.raises(ValueError, match="bad side 'HOLD'"):
+        _rows(path)
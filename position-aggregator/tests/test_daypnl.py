@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("trading_calendar")
+
+from posagg.daypnl import session_calendar
+from posagg.engine import PositionEngine
+from posagg.journal import StateStore
+from posagg.models import Fill
+
+TS = "2025-10-01T14:00:00"
+
+def _fill(ts, exec_id, side="BUY"):
+    return Fill(ts=ts, symbol="MESZ5", side=side, qty=1, price=6000.0, exec_id=exec_id)
+
+def test_bad_ts_rejected_before_dedup_and_journal(tmp_path):
+    cal = session_calendar()
+    store = StateStore(tmp_path)
+    eng = store.open(day_sessions=cal)
+    with pytest.raises(ValueError):
+        eng.apply_fill(_fill("garbage", "X1"))
+    assert not eng.seen_exec_ids and not eng.positions
+    assert eng.apply_fill(_fill(TS, "X1"))    # the corrected resend is not a duplicate
+    store.close()
+    # nothing bad was journaled, so the state dir replays
+    eng = StateStore(tmp_path).open(day_sessions=cal)
+    assert eng.positions[("default", "MESZ5")].net_qty == 1
+
+def test_bad_ts_rejects_the_whole_batch():
+    eng = PositionEngine(day_sessions=session_calendar())
+    with pytest.raises(ValueError):
+        eng.apply_fills_batch(["MESZ5"] * 3, ["BUY"] * 3, [1] * 3, [6000.0] * 3,
+                              exec_id=["a", "b", "c"], ts=[TS, "junk", TS])
+    assert not eng.seen_exec_ids and not eng.positions
+    # per-fill retry (as posagg serve does): the good fills go through
+    assert [eng.apply_fill(_fill(TS, e)) for e in ("a", "c")] == [True, True]
+    assert eng.session_date is not None
@@ -0,0 +1,22 @@
+import math
+
+import pytest
+
+from posagg.csvload import iter_fill_chunks
+from posagg.engine import PositionEngine
+from posagg.shard import aggregate_sharded
+from posagg.synth import write_fills_csv
+
+@pytest.mark.parametrize("shard_by", ["account", "account-symbol"])
+def test_sharded_matches_single_engine(tmp_path, shard_by):
+    path = tmp_path / "fills.csv"
+    write_fills_csv(path, 20_000, accounts=40)
+    ref = PositionEngine()
+    for c in iter_fill_chunks(path):
+        ref.apply_fills_batch(c.symbol, c.side, c.qty, c.price, c.fees, c.exec_id, ts=c.ts, account=c.account)
+    eng = aggregate_sharded([path], workers=2, shard_by=shard_by, chunk_rows=3_000)
+    assert sorted(eng.positions) == sorted(ref.positions)
+    for k, p in ref.positions.items():
+        q = eng.positions[k]
+        assert q.net_qty == p.net_qty, k
+        assert math.isclose(q.realized_pnl, p.realized_pnl, rel_tol=1e-12, abs_tol=1e-6), k
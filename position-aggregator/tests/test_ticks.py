@@ -0,0 +1,76 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+import pytest
+
+from posagg.engine import PositionEngine
+from posagg.instruments import default_registry
+from posagg.synth import generate_fill_chunks
+from posagg.ticks import (OffGridPriceError, div_half_even, div_half_even_array, prices_to_ticks,
+                          round_trip_cents, slippage_to_units)
+
+CENT = Decimal("0.01")
+
+def _cents(x: Decimal) -> int:
+    return int(x.quantize(CENT, ROUND_HALF_EVEN) * 100)
+
+def test_div_half_even():
+    for num in range(-50, 51):
+        for den in (1, 2, 3, 4, 7):
+            want = int((Decimal(num) / den).quantize(Decimal(1), ROUND_HALF_EVEN))
+            assert div_half_even(num, den) == want, (num, den)
+    big = np.array([2 ** 60 + 3, -(2 ** 60) - 3, 5, -5], dtype=np.int64)
+    assert div_half_even_array(big, 2).tolist() == [div_half_even(int(v), 2) for v in big.tolist()]
+
+def test_prices_to_ticks_rejects_off_grid():
+    assert prices_to_ticks([110.015625, 109.984375], 0.015625).tolist() == [7041, 7039]
+    with pytest.raises(OffGridPriceError, match="row 1"):
+        prices_to_ticks([110.0, 110.01], 0.015625)
+
+def test_round_trip_cents_matches_decimal():
+    # ZN: 1/64 tick, $15.625/tick, so half cents are common
+    tick, dpt, fee_side, n = 0.015625, 15.625, 0.95, 20_000
+    rng = np.random.default_rng(3)
+    entry = 110.0 + rng.integers(-2000, 2000, n) * tick
+    exit_ = entry + rng.integers(-200, 200, n) * tick
+    sign = rng.choice([1, -1], n)
+    qty = rng.integers(1, 50, n)
+    slip = rng.choice([0.0, 0.5, 1.0, 1.25], n)
+    got = round_trip_cents(prices_to_ticks(entry, tick), prices_to_ticks(exit_, tick), sign, qty, dpt,
+                           round(fee_side * 100), slippage_to_units(slip))
+    D = lambda x: Decimal(repr(x))
+    want = [_cents(s * (D(x) - D(e)) / D(tick) * D(dpt) * q - (2 * D(fee_side) * q + D(sl) * D(dpt) * q))
+            for e, x, s, q, sl in zip(entry.tolist(), exit_.tolist(), sign.tolist(), qty.tolist(), slip.tolist())]
+    assert got.tolist() == want
+
+def _decimal_engine(rows) -> dict:
+    # TickPosition's WAC rules in Decimal: (net, cost ticks, realized ticks) per key
+    reg = default_registry()
+    book = {}
+    for key, q, px in rows:
+        t = Decimal(repr(px)) / Decimal(repr(reg.resolve(key[1]).tick_size))
+        net, cost, rpl = book.get(key, (0, Decimal(0), Decimal(0)))
+        if net == 0 or (net > 0) == (q > 0):
+            book[key] = (net + q, cost + t * abs(q), rpl)
+            continue
+        close = min(abs(net), abs(q))
+        rel = cost if close == abs(net) else (cost * close / abs(net)).quantize(Decimal(1), ROUND_HALF_EVEN)
+        rpl += (t * close - rel) if net > 0 else (rel - t * close)
+        rem = net + q
+        cost = Decimal(0) if rem == 0 else (cost - rel if (rem > 0) == (net > 0) else t * abs(rem))
+        book[key] = (rem, cost, rpl)
+    return {k: _cents(r * Decimal(repr(reg.resolve(k[1]).dollars_per_tick))) for k, (_, _, r) in book.items()}
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_exact_engine_matches_decimal(batch):
+    chunks = list(generate_fill_chunks(20_000, seed=5, accounts=20, chunk_rows=5_000))
+    eng = PositionEngine(exact=True)
+    for ch in chunks:
+        if batch:
+            eng.apply_fills_batch(ch.symbol, ch.side, ch.qty, ch.price, ch.fees, account=ch.account)
+        else:
+            for f in ch.iter_fills():
+                eng.apply_fill(f)
+    want = _decimal_engine([((a, s), q * sd, px) for ch in chunks
+                            for a, s, sd, q, px in zip(ch.account, ch.symbol, ch.side, ch.qty, ch.price)])
+    assert {k: p.realized_cents for k, p in eng.positions.items()} == want
@@ -3,8 +3,31 @@
 Top-level menu runner:
 - Choose Stocks or Futures
 - After each run, return to this menu ("Back")
+
+Headless: one JSON request per line in, one JSON result per line out.
+
+    python run_pnl.py --jsonl requests.jsonl -o results.jsonl     # "-" = stdin/stdout
+
+Request keys: market (stocks/futures), entry, exit, side (long/short), size
+(shares/contracts); optional id (echoed back) and the batch CSV columns as
+cost overrides (futures: symbol, plan, fee_per_side, slippage_ticks,
+tick_size, dollars_per_tick; stocks: commission_per_share,
+slippage_per_share_rt). Each calculator's batch module is imported once and
+records are priced per market in chunks. Every input line gets one output
+line, in order; a bad record (or a blank line) gets {"error": ...}, with its
+id when the request parsed.
 """
+import argparse, json, math, sys
 from importlib import import_module
+from itertools import islice
+
+CHUNK_ROWS = 65_536
+SIZE_KEY = {"stocks": "shares", "futures": "contracts"}
+FLOAT_KEYS = {  # numeric batch columns, checked per record before a chunk is priced
+    "stocks": ("entry", "exit", "commission_per_share", "slippage_per_share_rt"),
+    "futures": ("entry", "exit", "fee_per_side", "slippage_ticks", "tick_size", "dollars_per_tick"),
+}
+_batch_modules = {}
 
 def ask_choice(prompt: str, options: dict[str, str], allow_quit: bool = True) -> str:
     keys = "/".join(options.keys()) + ("/q" if allow_quit and "q" not in options else "")
@@ -24,6 +47,108 @@ def run_futures():
     mod = import_module("ch11_pnl_futures.pnl_futures")
     mod.main()
 
+def batch_module(market: str):
+    # one import per market per process
+    mod = _batch_modules.get(market)
+    if mod is None:
+        mod = _batch_modules[market] = import_module(f"ch11_pnl_{market}.batch")
+    return mod
+
+def _row(req: dict) -> dict:
+    # request -> batch CSV row; values as strings so defaults/overrides behave exactly as in the CSV CLIs
+    market = req.get("market")
+    if market not in SIZE_KEY:
+        raise ValueError(f"market must be stocks/futures, got {market!r}")
+    size_key = SIZE_KEY[market]
+    row = {k: str(v) for k, v in req.items() if v is not None and k not in ("id", "market", "size")}
+    if "size" in req:
+        row[size_key] = str(req["size"])
+    for k in ("entry", "exit", "side", size_key):
+        if k not in row:
+            raise ValueError(f"missing {k!r}")
+    # the same parses compute_rows() does, so a bad value fails here and not the whole chunk
+    for k in FLOAT_KEYS[market]:
+        if row.get(k):
+            try:
+                ok = math.isfinite(float(row[k]))
+            except ValueError:
+                ok = False
+            if not ok:
+                raise ValueError(f"{k} must be a finite number, got {row[k]!r}")
+    try:
+        int(row[size_key])
+    except ValueError:
+        raise ValueError(f"{size_key} must be an integer, got {row[size_key]!r}") from None
+    if row["side"].strip().lower() not in ("long", "short"):
+        raise ValueError(f"side must be long/short, got {row['side']!r}")
+    return row
+
+def _price(market: str, rows: list) -> list:
+    mod = batch_module(market)
+    try:
+        res = mod.compute_rows(rows)
+    except (ValueError, KeyError, TypeError, ImportError) as e:
+        if len(rows) == 1:
+            return [{"error": str(e)}]
+        # what _row() can't see (unknown symbol / plan, off-grid --exact prices...):
+        # halve until the bad records are isolated, so good rows stay in large calls
+        mid = len(rows) // 2
+        return _price(market, rows[:mid]) + _price(market, rows[mid:])
+    cols = {c: res[c].tolist() for c in mod.OUT_COLUMNS}
+    return [{c: v[i] for c, v in cols.items()} for i in range(len(rows))]
+
+def run_chunk(lines: list) -> list:
+    """Price one chunk of JSONL request lines; returns one result dict per line, in order."""
+    out = [None] * len(lines)
+    groups = {}
+    for i, line in enumerate(lines):
+        req = None
+        try:
+            if not line.strip():
+                raise ValueError("blank line")
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise ValueError("request must be a JSON object")
+            row = _row(req)
+        except (ValueError, TypeError) as e:
+            out[i] = {"id": req["id"], "error": str(e)} if isinstance(req, dict) and "id" in req else {"error": str(e)}
+            continue
+        idx, reqs, rows = groups.setdefault(req["market"], ([], [], []))
+        idx.append(i)
+        reqs.append(req)
+        rows.append(row)
+    for market, (idx, reqs, rows) in groups.items():
+        for i, req, res in zip(idx, reqs, _price(market, rows)):
+            head = {"id": req["id"]} if "id" in req else {}
+            out[i] = {**head, "market": market, **res}
+    return out
+
+def run_jsonl(src, dst, chunk_rows: int = CHUNK_ROWS) -> int:
+    n = 0
+    lines = iter(src)    # blank lines included, so output line i answers input line i
+    while True:
+        chunk = list(islice(lines, chunk_rows))
+        if not chunk:
+            return n
+        dst.write("".join(json.dumps(r) + "\n" for r in run_chunk(chunk)))
+        n += len(chunk)
+
+def main_headless(argv=None):
+    p = argparse.ArgumentParser(prog="run_pnl", description="P&L runner (interactive without --jsonl)")
+    p.add_argument("--jsonl", required=True, help='JSONL requests ("-" for stdin)')
+    p.add_argument("-o", "--out", default="-", help='JSONL results ("-" for stdout)')
+    p.add_argument("--chunk-rows", dest="chunk_rows", type=int, default=CHUNK_ROWS)
+    args = p.parse_args(argv)
+    src = sys.stdin if args.jsonl == "-" else open(args.jsonl)
+    dst = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        run_jsonl(src, dst, args.chunk_rows)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
 def main():
     print("=== P&L Runner ===")
     while True:
@@ -47,4 +172,7 @@ def main():
             break
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        main_headless()
+    else:
+        main()
@@ -0,0 +1,17 @@
+from datetime import date, time
+
+import pytest
+
+from trading_calendar.config_loader import EarlyClose, builtin_market_path, load_market_config
+
+# Holidays on the Mondays after both 2025 DST switches, plus two early closes
+HOLIDAYS = [date(2025, 3, 10), date(2025, 11, 3)]
+EARLY_CLOSES = [date(2025, 7, 3), date(2025, 11, 28)]
+
+@pytest.fixture
+def cfg():
+    cfg = load_market_config(builtin_market_path("cme_es"), cache=False)
+    cfg.holidays += HOLIDAYS
+    for d in EARLY_CLOSES:
+        cfg.early_closes[d] = EarlyClose(rth_end=time(12, 15), label="EARLY_CLOSE")
+    return cfg
@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from trading_calendar.sessions import _next_open_walk, market_status, next_close, next_open
+
+UTC = timezone.utc
+ONE_US = timedelta(microseconds=1)
+
+# DST switches (Sun 2025-03-09, Sun 2025-11-02) into the holidays after them,
+# a seeded holiday (2025-01-20) and the 2025-07-03 early close
+DAYS = [date(2025, 3, 8), date(2025, 11, 1), date(2025, 1, 19), date(2025, 7, 2)]
+
+def _sample(step_min: int = 23):
+    for d in DAYS:
+        t = datetime(d.year, d.month, d.day, tzinfo=UTC)
+        for k in range(0, 4 * 1440, step_min):
+            yield t + timedelta(minutes=k)
+
+def test_next_open_matches_walk(cfg):
+    for ts in _sample():
+        assert next_open(ts, cfg) == _next_open_walk(ts, cfg), ts
+
+def test_next_open_is_exact_off_the_minute(cfg):
+    # Sun 2025-03-09 16:59:30 CDT: the walk lands on 17:00:30, the reopen is 17:00:00
+    ts = datetime(2025, 3, 9, 21, 59, 30, tzinfo=UTC)
+    assert next_open(ts, cfg) == datetime(2025, 3, 9, 22, 0, tzinfo=UTC)
+
+# Window ends are inclusive, so a session closes 1 us after its end second
+@pytest.mark.parametrize("ts, want", [
+    # early close: 12:15 CDT
+    (datetime(2025, 7, 3, 14, 0, tzinfo=UTC), datetime(2025, 7, 3, 17, 15, 0, 1, tzinfo=UTC)),
+    # Sun ETH into the Monday holiday: 23:59:59 CDT, then CST
+    (datetime(2025, 3, 9, 23, 0, tzinfo=UTC), datetime(2025, 3, 10, 4, 59, 59, 1, tzinfo=UTC)),
+    (datetime(2025, 11, 2, 23, 0, tzinfo=UTC), datetime(2025, 11, 3, 5, 59, 59, 1, tzinfo=UTC)),
+])
+def test_next_close_known(cfg, ts, want):
+    assert next_close(ts, cfg) == want
+
+def test_next_close_ends_the_session(cfg):
+    for ts in _sample(step_min=97):
+        r = next_close(ts, cfg)
+        if not market_status(ts, cfg)["open"]:
+            assert r == ts
+            continue
+        assert r > ts
+        assert not market_status(r, cfg)["open"], ts
+        assert market_status(r - ONE_US, cfg)["open"], ts
+        assert next_open(r, cfg) > r
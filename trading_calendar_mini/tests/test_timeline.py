@@ -0,0 +1,34 @@
+import random
+from datetime import date, datetime, timezone
+
+from trading_calendar.sessions import market_status
+from trading_calendar.timeline import compile_timeline, from_us, to_us
+
+# Spring forward and fall back, 2024 and 2025 (Chicago switches at 02:00 local)
+DST_DAYS = [date(2024, 3, 10), date(2024, 11, 3), date(2025, 3, 9), date(2025, 11, 2)]
+
+def _check(tl, cfg, probe):
+    for us in probe:
+        ts = from_us(us)
+        assert tl.status(ts) == market_status(ts, cfg), ts
+
+def test_status_at_every_boundary(cfg):
+    tl = compile_timeline(cfg, date(2024, 1, 1), date(2026, 1, 1))
+    _check(tl, cfg, [s + d for s in tl.starts[1:] for d in (-1, 0, 1)])
+
+def test_status_on_dst_days(cfg):
+    tl = compile_timeline(cfg, date(2024, 1, 1), date(2026, 1, 1))
+    for d in DST_DAYS:
+        lo = to_us(datetime(d.year, d.month, d.day, tzinfo=timezone.utc))
+        _check(tl, cfg, range(lo, lo + 2 * 86400 * 10**6, 13 * 10**6))
+
+def test_status_random(cfg):
+    tl = compile_timeline(cfg, date(2024, 1, 1), date(2026, 1, 1))
+    rng = random.Random(1)
+    _check(tl, cfg, [rng.randrange(tl.lo, tl.hi) for _ in range(20000)])
+
+def test_status_past_horizon_uses_rules(cfg):
+    tl = compile_timeline(cfg, date(2025, 1, 1), date(2025, 2, 1))
+    ts = datetime(2025, 3, 10, 15, 0, tzinfo=timezone.utc)    # holiday, outside [lo, hi)
+    assert not tl.covers(to_us(ts))
+    assert tl.status(ts) == market_status(ts, cfg)
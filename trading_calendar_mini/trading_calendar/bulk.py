@@ -0,0 +1,174 @@
+"""
+Bulk session status over timestamp arrays (needs NumPy: the "bulk" extra).
+
+    st = classify(df["ts"].values, cfg)        # datetime64 or epoch ints (unit=...)
+    st.open, st.label_names[st.label], st.reason_names[st.reason]
+
+Same answers as market_status() per element, looked up in the compiled
+timeline (bucket index, falling back to searchsorted).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Tuple
+import numpy as np
+from .config_loader import MarketConfig
+from .timeline import DAY_US, SessionTimeline, _EPOCH_ORD, _offset_spans, _time_us, compile_timeline, timeline_for
+
+UNITS = {"s": 1_000_000, "ms": 1_000, "us": 1, "ns": None}
+CHUNK = 16_384   # elements per pass, so the temporaries stay in cache
+
+@dataclass(frozen=True)
+class BulkStatus:
+    open: np.ndarray             # bool
+    label: np.ndarray            # int8 index into label_names
+    reason: np.ndarray           # int8 index into reason_names (0 = None, i.e. open)
+    label_names: Tuple[str, ...]
+    reason_names: Tuple[object, ...]
+
+    def labels(self) -> np.ndarray:
+        return np.asarray(self.label_names, dtype=object)[self.label]
+
+    def reasons(self) -> np.ndarray:
+        return np.asarray(self.reason_names, dtype=object)[self.reason]
+
+def to_epoch_us(ts, unit: str = "us") -> np.ndarray:
+    """int64 UTC microseconds from datetime64 (any unit, naive = UTC) or epoch integers in `unit`."""
+    a = np.asarray(ts)
+    if a.dtype.kind == "M":
+        if np.datetime_data(a.dtype) == ("ns", 1):
+            return a.view(np.int64) // 1_000       # floor, like unit="ns"
+        return a.astype("datetime64[us]").view(np.int64)
+    if unit not in UNITS:
+        raise ValueError(f"unit must be one of {', '.join(UNITS)}")
+    a = a.astype(np.int64, copy=False)
+    return a // 1_000 if unit == "ns" else a * UNITS[unit]
+
+def _tables(tl: SessionTimeline):
+    # built once per timeline: starts (+ hi sentinel), codes, per-state open / label / reason,
+    # and a bucket index over fixed 2**shift us buckets (first interval of each bucket)
+    t = tl.__dict__.get("_bulk")
+    if t is None:
+        label_names = tuple(sorted({s[1] for s in tl.states}))
+        reason_names = (None,) + tuple(sorted({s[2] for s in tl.states if s[2] is not None}))
+        st_open = np.array([s[0] for s in tl.states], dtype=bool)
+        st_label = np.array([label_names.index(s[1]) for s in tl.states], dtype=np.int8)
+        st_reason = np.array([reason_names.index(s[2]) for s in tl.states], dtype=np.int8)
+        codes = np.array(tl.codes, dtype=np.int8 if len(tl.states) < 128 else np.int32)
+        starts = np.array(tl.starts + [tl.hi], dtype=np.int64)
+        bucket = None
+        for shift in range(32, 23, -1):       # ~72 min buckets down to ~17 s
+            edges = tl.lo + (np.arange(((tl.hi - tl.lo) >> shift) + 1, dtype=np.int64) << shift)
+            first = np.searchsorted(starts, edges, side="right") - 1
+            steps = int((np.searchsorted(starts, edges + (1 << shift)) - 1 - first).max())
+            if steps <= 3:
+                bucket = (shift, first.astype(np.int32), steps)
+                break
+        t = tl.__dict__["_bulk"] = (starts, codes, st_open, st_label, st_reason, label_names, reason_names, bucket)
+    return t
+
+def _timeline_covering(cfg: MarketConfig, lo: int, hi: int) -> SessionTimeline:
+    tl = timeline_for(cfg)
+    if tl.lo <= lo and hi < tl.hi:
+        return tl
+    # data outside the default horizon: compile one that spans it (whole UTC days)
+    start = date.fromordinal(int(min(lo, tl.lo) // DAY_US) + _EPOCH_ORD)
+    end = date.fromordinal(int(max(hi, tl.hi - 1) // DAY_US) + _EPOCH_ORD) + timedelta(days=1)
+    return compile_timeline(cfg, start, end)
+
+def _codes(us: np.ndarray, lo: int, t) -> np.ndarray:
+    starts, codes, bucket = t[0], t[1], t[7]
+    if bucket is None:
+        idx = np.searchsorted(starts, us, side="right")
+        idx -= 1
+        return codes[idx]
+    # the bucket gives the interval at the bucket's start; step over the <= steps
+    # boundaries inside it (cheaper than a binary search per element)
+    shift, first, steps = bucket
+    d = us - lo
+    d >>= shift
+    idx = first[d]
+    for _ in range(steps):
+        idx += starts[idx + 1] <= us
+    return codes[idx]
+
+def _prepare(ts, cfg: MarketConfig, unit: str):
+    us = to_epoch_us(ts, unit).ravel()
+    tl = timeline_for(cfg) if us.size == 0 else _timeline_covering(cfg, int(us.min()), int(us.max()))
+    return us, tl, _tables(tl)
+
+def state_codes(ts, cfg: MarketConfig, unit: str = "us"):
+    """Timeline state code per timestamp, plus the state tables it indexes."""
+    us, tl, t = _prepare(ts, cfg, unit)
+    out = np.empty(us.shape, dtype=t[1].dtype)
+    for a in range(0, us.size, CHUNK):
+        out[a:a + CHUNK] = _codes(us[a:a + CHUNK], tl.lo, t)
+    return out.reshape(np.shape(ts)), t
+
+def classify(ts, cfg: MarketConfig, unit: str = "us") -> BulkStatus:
+    """open / label / reason for every timestamp, identical to market_status() element-wise."""
+    us, tl, t = _prepare(ts, cfg, unit)
+    st_open, st_label, st_reason, label_names, reason_names = t[2:7]
+    op = np.empty(us.shape, dtype=bool)
+    label = np.empty(us.shape, dtype=np.int8)
+    reason = np.empty(us.shape, dtype=np.int8)
+    for a in range(0, us.size, CHUNK):
+        c = _codes(us[a:a + CHUNK], tl.lo, t)
+        op[a:a + CHUNK] = st_open[c]
+        label[a:a + CHUNK] = st_label[c]
+        reason[a:a + CHUNK] = st_reason[c]
+    shape = np.shape(ts)
+    return BulkStatus(op.reshape(shape), label.reshape(shape), reason.reshape(shape), label_names, reason_names)
+
+def is_open(ts, cfg: MarketConfig, unit: str = "us") -> np.ndarray:
+    code, t = state_codes(ts, cfg, unit)
+    return t[2][code]
+
+def utc_offsets(us: np.ndarray, tz) -> np.ndarray:
+    """UTC offset (us) of tz (a ZoneInfo) at each UTC-microsecond timestamp."""
+    us = np.asarray(us, dtype=np.int64)
+    if us.size == 0:
+        return np.zeros(us.shape, dtype=np.int64)
+    lo, hi = int(us.min()), int(us.max()) + 1
+    spans = _offset_spans(tz, lo - lo % 1_000_000, hi)
+    starts = np.array([a for a, _, _ in spans], dtype=np.int64)
+    offs = np.array([o for _, _, o in spans], dtype=np.int64)
+    return offs[np.searchsorted(starts, us, side="right") - 1]
+
+def session_dates(ts, cfg: MarketConfig, unit: str = "us", rollover=None, tz=None, calendar=None) -> np.ndarray:
+    """Trading-session date (datetime64[D]) per timestamp, as trading_day.SessionDates.date_of().
+
+    Local date in tz (default venue), +1 day at or after the rollover time
+    (default the config's), then forward to the next trading date through
+    a per-day lookup table.
+    """
+    from .trading_day import SessionDates
+    cal = calendar or SessionDates(cfg, rollover, tz)
+    us = to_epoch_us(ts, unit)
+    if us.size == 0:
+        return np.empty(us.shape, dtype="datetime64[D]")
+    local = us + utc_offsets(us, cal.tz)
+    day = local // DAY_US
+    day += (local - day * DAY_US) >= _time_us(cal.rollover)
+    d0 = int(day.min())
+    table = np.array([cal.trading_day(date.fromordinal(d + _EPOCH_ORD)).toordinal() - _EPOCH_ORD
+                      for d in range(d0, int(day.max()) + 1)], dtype=np.int64)
+    return table[day - d0].astype("datetime64[D]")
+
+def next_opens(ts, cfg: MarketConfig, unit: str = "us") -> np.ndarray:
+    """next_open() per timestamp as UTC microseconds: itself when open, else the next open start."""
+    us, tl, t = _prepare(ts, cfg, unit)
+    op = np.empty(us.shape, dtype=bool)
+    for a in range(0, us.size, CHUNK):
+        op[a:a + CHUNK] = t[2][_codes(us[a:a + CHUNK], tl.lo, t)]
+    opens = np.array(tl._open_starts, dtype=np.int64)
+    i = np.searchsorted(opens, us, side="right")
+    out = np.where(op, us, opens[np.minimum(i, len(opens) - 1)] if len(opens) else us)
+    beyond = ~op & (i >= len(opens))
+    if beyond.any():
+        # next open lies past the compiled span: answer those from the scalar API
+        from .sessions import next_open
+        from .timeline import from_us, to_us
+        for j in np.flatnonzero(beyond).tolist():
+            out[j] = to_us(next_open(from_us(int(us[j])), cfg))
+    return out.reshape(np.shape(ts))
@@ -0,0 +1,154 @@
+"""
+Streaming session annotation for large CSV / JSONL files (tcal classify; needs NumPy).
+
+    tcal classify ticks.csv --market cme_es --ts-col ts -o ticks_sessions.csv --jobs 4
+
+Each chunk of rows gets open / label / reason / session_date / next_open
+appended (next_open in UTC). Memory stays at a few chunks however large
+the file; with --jobs the chunks are classified in worker processes and
+written back in input order.
+"""
+from __future__ import annotations
+import csv, json, sys, warnings
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterator, Optional, Sequence
+import numpy as np
+from .bulk import classify, next_opens, session_dates
+from .config_loader import MarketConfig, load_market_config
+from .timeline import to_us
+from .trading_day import session_dates_for
+from .tz import parse_dt
+
+OUT_COLUMNS = ("open", "label", "reason", "session_date", "next_open")
+CHUNK_ROWS = 200_000
+
+def parse_timestamps(values: Sequence, unit: str = "iso", assume_tz: str = "UTC") -> np.ndarray:
+    """int64 UTC microseconds for a column of ISO strings or epoch numbers (unit s/ms/us/ns)."""
+    if unit != "iso":
+        from .bulk import to_epoch_us
+        return to_epoch_us(np.asarray(values, dtype=np.int64), unit)
+    if assume_tz == "UTC":
+        # naive ISO strings: NumPy parses them in C; anything with an offset takes the slow path
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                return np.array(values, dtype="datetime64[us]").view(np.int64)
+        except (ValueError, UserWarning, DeprecationWarning):
+            pass
+    return np.array([to_us(parse_dt(v, assume_tz=assume_tz)) for v in values], dtype=np.int64)
+
+def _iso_utc(us: np.ndarray) -> np.ndarray:
+    dt = us.astype("datetime64[us]")
+    unit = "s" if not (us % 1_000_000).any() else "us"
+    return np.datetime_as_string(dt.astype(f"datetime64[{unit}]"), timezone="UTC")
+
+def annotate(values: Sequence, cfg: MarketConfig, unit: str = "iso", assume_tz: str = "UTC") -> Dict[str, list]:
+    """OUT_COLUMNS for one chunk of timestamp values, as lists of strings."""
+    us = parse_timestamps(values, unit, assume_tz)
+    st = classify(us, cfg)
+    reason_names = np.array([r or "" for r in st.reason_names], dtype=object)
+    nxt = next_opens(us, cfg)
+    return {
+        "open": np.where(st.open, "true", "false").tolist(),
+        "label": st.labels().tolist(),
+        "reason": reason_names[st.reason].tolist(),
+        "session_date": np.datetime_as_string(session_dates(us, cfg, calendar=session_dates_for(cfg))).tolist(),
+        "next_open": _iso_utc(nxt).tolist(),
+    }
+
+# --- worker side (--jobs): each process loads the config once ---
+_worker_cfg: Optional[MarketConfig] = None
+
+def _init_worker(cfg_path: str):
+    global _worker_cfg
+    _worker_cfg = load_market_config(cfg_path)
+
+def _annotate_in_worker(values, unit, assume_tz):
+    return annotate(values, _worker_cfg, unit, assume_tz)
+
+def _ordered(chunks: Iterator[tuple], cfg: MarketConfig, cfg_path: str, unit: str, assume_tz: str,
+             jobs: int) -> Iterator[tuple]:
+    # (payload, values) -> (payload, columns) in input order, at most 2 * jobs chunks in flight
+    if jobs <= 1:
+        for payload, values in chunks:
+            yield payload, annotate(values, cfg, unit, assume_tz)
+        return
+    import multiprocessing as mp
+    with mp.Pool(jobs, initializer=_init_worker, initargs=(cfg_path,)) as pool:
+        pending = deque()
+        for payload, values in chunks:
+            pending.append((payload, pool.apply_async(_annotate_in_worker, (values, unit, assume_tz))))
+            if len(pending) >= 2 * jobs:
+                p, r = pending.popleft()
+                yield p, r.get()
+        while pending:
+            p, r = pending.popleft()
+            yield p, r.get()
+
+def classify_csv(src, dst, cfg: MarketConfig, cfg_path: str, ts_col: str = "ts", unit: str = "iso",
+                 assume_tz: str = "UTC", chunk_rows: int = CHUNK_ROWS, jobs: int = 1) -> int:
+    reader = csv.reader(src)
+    header = next(reader, None)
+    if header is None:
+        return 0
+    if ts_col not in header:
+        raise SystemExit(f"timestamp column {ts_col!r} not in header: {', '.join(header)}")
+    col = header.index(ts_col)
+    writer = csv.writer(dst)
+    writer.writerow(header + list(OUT_COLUMNS))
+
+    def chunks():
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                return
+            yield rows, [r[col] for r in rows]
+
+    n = 0
+    for rows, cols in _ordered(chunks(), cfg, cfg_path, unit, assume_tz, jobs):
+        out = [cols[c] for c in OUT_COLUMNS]
+        writer.writerows([*r, *extra] for r, extra in zip(rows, zip(*out)))
+        n += len(rows)
+    return n
+
+def classify_jsonl(src, dst, cfg: MarketConfig, cfg_path: str, ts_col: str = "ts", unit: str = "iso",
+                   assume_tz: str = "UTC", chunk_rows: int = CHUNK_ROWS, jobs: int = 1) -> int:
+    lines = (ln for ln in src if ln.strip())
+
+    def chunks():
+        while True:
+            recs = [json.loads(ln) for ln in islice(lines, chunk_rows)]
+            if not recs:
+                return
+            try:
+                yield recs, [r[ts_col] for r in recs]
+            except KeyError:
+                raise SystemExit(f"record without timestamp field {ts_col!r}") from None
+
+    n = 0
+    for recs, cols in _ordered(chunks(), cfg, cfg_path, unit, assume_tz, jobs):
+        out = [cols[c] for c in OUT_COLUMNS]
+        for r, extra in zip(recs, zip(*out)):
+            r.update(zip(OUT_COLUMNS, extra))
+            r["open"] = r["open"] == "true"
+            r["reason"] = r["reason"] or None
+        dst.write("".join(json.dumps(r) + "\n" for r in recs))
+        n += len(recs)
+    return n
+
+def run(path: str, out: str, cfg_path: str, fmt: Optional[str] = None, **kw) -> int:
+    """Annotate path ("-" = stdin) into out ("-" = stdout); format from --format or the file suffix."""
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    cfg = load_market_config(cfg_path)
+    src = sys.stdin if path == "-" else open(path, newline="")
+    dst = sys.stdout if out == "-" else open(out, "w", newline="")
+    try:
+        fn = classify_jsonl if fmt == "jsonl" else classify_csv
+        return fn(src, dst, cfg, cfg_path, **kw)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
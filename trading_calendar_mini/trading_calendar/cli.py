@@ -11,9 +11,7 @@ from .sessions import (
     market_status,
     next_open,
 )
-from .config_loader import load_market_config
-
-PKG_DIR = os.path.dirname(__file__)
+from .config_loader import builtin_market_path, load_market_config, save_compiled_config
 
 def tzutil_main():
     p = argparse.ArgumentParser(prog="tzutil", description="Timezone utilities")
@@ -49,15 +47,47 @@ def cal_main():
     p_next.add_argument("--tz", default=os.environ.get("TCAL_TZ", "UTC"), help="Display timezone")
     p_next.add_argument("--json", action="store_true", help="Emit JSON instead of text")
 
+    p_comp = sp.add_parser("compile-config", help="Write a market YAML as compiled JSON (loads without PyYAML)")
+    p_comp.add_argument("config", help="Path to a market YAML")
+    p_comp.add_argument("-o", "--out", help="Output path (default: alongside, .json)")
+
+    p_cls = sp.add_parser("classify", help="Append session columns to a CSV/JSONL of timestamps (needs NumPy)")
+    p_cls.add_argument("path", help='CSV or JSONL file ("-" for stdin)')
+    p_cls.add_argument("-o", "--out", default="-", help='Output file ("-" for stdout)')
+    p_cls.add_argument("--market", choices=["cme_es"])
+    p_cls.add_argument("--config", help="Path to a market YAML/JSON (overrides --market)")
+    p_cls.add_argument("--ts-col", dest="ts_col", default="ts", help="Timestamp column / field")
+    p_cls.add_argument("--ts-unit", dest="ts_unit", choices=["iso", "s", "ms", "us", "ns"], default="iso",
+                       help="ISO strings or epoch numbers")
+    p_cls.add_argument("--tz", default="UTC", help="Timezone of naive ISO timestamps")
+    p_cls.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file suffix, else CSV")
+    p_cls.add_argument("--chunk-rows", dest="chunk_rows", type=int, default=200_000)
+    p_cls.add_argument("--jobs", type=int, default=1, help="Worker processes")
+
     args = p.parse_args()
 
+    if args.cmd == "classify":
+        from .classify import run
+        cfg_path = args.config or (builtin_market_path(args.market) if args.market else None)
+        if cfg_path is None:
+            raise SystemExit("Provide --market or --config")
+        run(args.path, args.out, cfg_path, args.format, ts_col=args.ts_col, unit=args.ts_unit,
+            assume_tz=args.tz, chunk_rows=args.chunk_rows, jobs=args.jobs)
+        return
+
+    if args.cmd == "compile-config":
+        out = args.out or os.path.splitext(args.config)[0] + ".json"
+        save_compiled_config(load_market_config(args.config, cache=False), out, source=args.config)
+        print(out)
+        return
+
     def _load_cfg():
         # Use explicit config file if provided
         if getattr(args, "config", None):
             return load_market_config(args.config)
         # Or built-in shortcuts
         if getattr(args, "market", None) == "cme_es":
-            return load_market_config(os.path.join(PKG_DIR, "config/markets/cme_es.yaml"))
+            return load_market_config(builtin_market_path("cme_es"))
         raise SystemExit("Provide --market or --config")
 
     if args.cmd == "is-open":
@@ -1,9 +1,12 @@
 from __future__ import annotations
+import hashlib, json, os
 from dataclasses import dataclass
 from datetime import time, date
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from zoneinfo import ZoneInfo
-import yaml
+
+MARKETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "markets")
+COMPILED_FORMAT = "tcal-market/1"
 
 DOW_MAP = {"Mon":0,"Tue":1,"Wed":2,"Thu":3,"Fri":4,"Sat":5,"Sun":6}
 
@@ -35,6 +38,7 @@ class MarketConfig:
     labels: Dict[str, str]
     holidays: List[date]
     early_closes: Dict[date, EarlyClose]
+    session_rollover: Optional[time] = None  # trading-date rollover; None = sunday_reopen
 
 def _parse_time(s: str) -> time:
     # supports HH:MM or HH:MM:SS
@@ -45,10 +49,69 @@ def _parse_time(s: str) -> time:
         return time(parts[0], parts[1], parts[2])
     raise ValueError(f"bad time '{s}'")
 
-def load_market_config(path: str) -> MarketConfig:
+# realpath -> (mtime_ns, size, config); see load_market_config()
+_CACHE: Dict[str, Tuple[int, int, MarketConfig]] = {}
+
+def load_market_config(path: str, cache: bool = True) -> MarketConfig:
+    """MarketConfig from a market YAML, or from a compiled .json (see save_compiled_config).
+
+    Cached per process by real path, file mtime and size, so repeated calls
+    are a stat(). Cached configs are shared: copy.deepcopy() one before
+    editing it, or pass cache=False.
+    """
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    hit = _CACHE.get(real) if cache else None
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    if real.endswith(".json"):
+        cfg = _load_compiled(real)
+    else:
+        cfg = _load_yaml(real)
+    if cache:
+        _CACHE[real] = (st.st_mtime_ns, st.st_size, cfg)
+    return cfg
+
+_BUILTIN: Dict[str, Tuple[tuple, str]] = {}
+
+def builtin_market_path(market: str) -> str:
+    """Path of a packaged market config: the compiled .json when it matches its YAML, else the YAML."""
+    yml = os.path.join(MARKETS_DIR, f"{market}.yaml")
+    js = os.path.join(MARKETS_DIR, f"{market}.json")
+    key = (_stamp(yml), _stamp(js))
+    hit = _BUILTIN.get(market)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    path = yml
+    if key[1] is not None:
+        try:
+            with open(js) as f:
+                src = json.load(f).get("source_sha256")
+            if key[0] is None or src == _sha256(yml):
+                path = js
+        except (OSError, ValueError):
+            pass
+    _BUILTIN[market] = (key, path)
+    return path
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _load_yaml(path: str) -> MarketConfig:
+    import yaml  # only YAML configs need PyYAML
     with open(path, "r") as f:
         raw = yaml.safe_load(f)
+    return _from_raw(raw)
 
+def _from_raw(raw: dict) -> MarketConfig:
     venue = ZoneInfo(raw["venue_tz"])
     weekly: Dict[int, List[Window]] = {i: [] for i in range(7)}
     for block in raw.get("weekly", []):
@@ -99,5 +162,50 @@ def load_market_config(path: str) -> MarketConfig:
         labels=labels,
         holidays=hols,
         early_closes=early,
+        session_rollover=_parse_time(raw["session_rollover"]) if raw.get("session_rollover") else None,
     )
 
+
+def save_compiled_config(cfg: MarketConfig, path: str, source: Optional[str] = None) -> None:
+    """Write cfg as compiled JSON: already-parsed fields, loads without PyYAML.
+
+    With source (the YAML it came from), its sha256 is recorded so
+    builtin_market_path() can tell when the JSON is stale.
+    """
+    out = {
+        "format": COMPILED_FORMAT,
+        "source_sha256": _sha256(source) if source else None,
+        "market_id": cfg.market_id,
+        "venue_tz": cfg.venue_tz.key,
+        "weekly": {str(d): [[w.start.isoformat(), w.end.isoformat(), w.label] for w in ws]
+                   for d, ws in cfg.weekly.items()},
+        "maintenance": [[m.days, m.start.isoformat(), m.end.isoformat()] for m in cfg.maintenance],
+        "friday_close": cfg.friday_close.isoformat(),
+        "sunday_reopen": cfg.sunday_reopen.isoformat(),
+        "labels": cfg.labels,
+        "holidays": [d.isoformat() for d in cfg.holidays],
+        "early_closes": {d.isoformat(): [ec.rth_end.isoformat(), ec.label] for d, ec in cfg.early_closes.items()},
+        "session_rollover": cfg.session_rollover.isoformat() if cfg.session_rollover else None,
+    }
+    with open(path, "w") as f:
+        json.dump(out, f)
+        f.write("\n")
+
+def _load_compiled(path: str) -> MarketConfig:
+    with open(path) as f:
+        raw = json.load(f)
+    if raw.get("format") != COMPILED_FORMAT:
+        raise ValueError(f"{path}: not a compiled market config ({COMPILED_FORMAT})")
+    t = time.fromisoformat
+    return MarketConfig(
+        market_id=raw["market_id"],
+        venue_tz=ZoneInfo(raw["venue_tz"]),
+        weekly={int(d): [Window(start=t(a), end=t(b), label=lb) for a, b, lb in ws] for d, ws in raw["weekly"].items()},
+        maintenance=[Maintenance(days=list(days), start=t(a), end=t(b)) for days, a, b in raw["maintenance"]],
+        friday_close=t(raw["friday_close"]),
+        sunday_reopen=t(raw["sunday_reopen"]),
+        labels=raw["labels"],
+        holidays=[date.fromisoformat(d) for d in raw["holidays"]],
+        early_closes={date.fromisoformat(d): EarlyClose(rth_end=t(a), label=lb) for d, (a, lb) in raw["early_closes"].items()},
+        session_rollover=t(raw["session_rollover"]) if raw.get("session_rollover") else None,
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta, date
 from zoneinfo import ZoneInfo
-from .config_loader import load_market_config, MarketConfig, Window
+from .config_loader import builtin_market_path, load_market_config, MarketConfig, Window
 
 def _is_between(t_local: time, w: Window) -> bool:
     return (t_local >= w.start) and (t_local <= w.end)
@@ -15,10 +15,10 @@ def market_status(ts: datetime, cfg: MarketConfig) -> dict:
         raise ValueError("Timestamp must be timezone-aware")
 
     local = ts.astimezone(cfg.venue_tz)
-    dow = _weekday(local)
-    t = local.time()
-    today = local.date()
+    return local_status(cfg, _weekday(local), local.time(), local.date())
 
+def local_status(cfg: MarketConfig, dow: int, t: time, today: date) -> dict:
+    """The session rules on venue wall-clock fields (weekday, time of day, date)."""
     # Weekend rule: Fri >= friday_close, Sat all day, Sun < sunday_reopen
     if (dow == 4 and t >= cfg.friday_close) or (dow == 5) or (dow == 6 and t < cfg.sunday_reopen):
         return {"open": False, "label": "CLOSED", "reason": cfg.labels.get("closed_reason_weekend", "WEEKEND")}
@@ -48,7 +48,43 @@ def market_status(ts: datetime, cfg: MarketConfig) -> dict:
     return {"open": False, "label": "CLOSED", "reason": "OUTSIDE_SESSION"}
 
 def next_open(ts: datetime, cfg: MarketConfig) -> datetime:
-    """Walk forward minute by minute until an open is found. Efficient enough for our use-case."""
+    """ts if the market is open, else the exact start of the next open session.
+
+    Read off the compiled timeline (timeline.timeline_for); past its horizon
+    off a short one compiled around ts, and only if that finds no open
+    either, the minute walk below.
+    """
+    from .timeline import from_us, timeline_around, timeline_for, to_us
+    us = timeline_for(cfg).next_open_us(to_us(ts))
+    if us is None:
+        us = timeline_around(cfg, to_us(ts)).next_open_us(to_us(ts))
+    if us is None:
+        return _next_open_walk(ts, cfg)
+    return ts if us == to_us(ts) else from_us(us).astimezone(ts.tzinfo)
+
+def next_close(ts: datetime, cfg: MarketConfig, min_gap: timedelta = timedelta(seconds=1)) -> datetime:
+    """ts if the market is closed, else the first closed instant after the current session.
+
+    Closed stretches shorter than min_gap do not count: windows are inclusive
+    of their end second, so "00:00-08:29:59" then "08:30-..." leaves a
+    sub-second OUTSIDE_SESSION gap that is not a close. Past the timeline
+    horizon a short timeline is compiled around ts (minute walk as last resort).
+    """
+    from .timeline import US, from_us, timeline_around, timeline_for, to_us
+    us = timeline_for(cfg).next_close_us(to_us(ts), min_gap // US)
+    if us is None:
+        us = timeline_around(cfg, to_us(ts)).next_close_us(to_us(ts), min_gap // US)
+    if us is None:
+        step, cur = timedelta(minutes=1), ts
+        for _ in range(7*24*60):
+            if not market_status(cur, cfg)["open"]:
+                return cur
+            cur += step
+        return cur
+    return ts if us == to_us(ts) else from_us(us).astimezone(ts.tzinfo)
+
+def _next_open_walk(ts: datetime, cfg: MarketConfig) -> datetime:
+    """Walk forward minute by minute until an open is found (fallback outside the compiled horizon)."""
     step = timedelta(minutes=1)
     cur = ts
     # if closed now, start searching from now; if open, just return ts (back-compat)
@@ -63,12 +99,10 @@ def next_open(ts: datetime, cfg: MarketConfig) -> datetime:
 # Convenience for ES using packaged config path
 CHI = ZoneInfo("America/Chicago")
 def market_status_cme_es(ts: datetime) -> dict:
-    cfg = load_market_config(__package__.replace("trading_calendar", "trading_calendar") + "/config/markets/cme_es.yaml")
-    return market_status(ts, cfg)
+    return market_status(ts, load_market_config(builtin_market_path("cme_es")))
 
 def next_open_cme_es(ts: datetime) -> datetime:
-    cfg = load_market_config(__package__.replace("trading_calendar", "trading_calendar") + "/config/markets/cme_es.yaml")
-    return next_open(ts, cfg)
+    return next_open(ts, load_market_config(builtin_market_path("cme_es")))
 
 def is_open_cme_es(ts: datetime) -> bool:
     return market_status_cme_es(ts)["open"]
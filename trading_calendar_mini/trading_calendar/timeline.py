@@ -0,0 +1,248 @@
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+from .config_loader import MarketConfig
+from .sessions import local_status, market_status
+
+US = timedelta(microseconds=1)
+DAY_US = 86_400_000_000
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORD = date(1970, 1, 1).toordinal()
+
+State = Tuple[bool, str, Optional[str]]   # (open, label, reason), as in market_status()
+
+def to_us(ts: datetime) -> int:
+    """Aware datetime -> integer microseconds since the Unix epoch (exact)."""
+    if ts.tzinfo is None:
+        raise ValueError("Timestamp must be timezone-aware")
+    return (ts - EPOCH) // US
+
+def from_us(us: int) -> datetime:
+    return EPOCH + timedelta(microseconds=us)
+
+def _time_us(t: time) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+def _us_time(us: int) -> time:
+    s, u = divmod(us, 1_000_000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return time(h, m, s, u)
+
+def _day_boundaries(cfg: MarketConfig, day: date) -> List[int]:
+    # every time of day at which some rule of local_status() can flip; windows are
+    # inclusive of their end, early close is "t > rth_end", so both flip 1us later
+    dow = day.weekday()
+    b = {0, DAY_US}
+    if dow == 4:
+        b.add(_time_us(cfg.friday_close))
+    if dow == 6:
+        b.add(_time_us(cfg.sunday_reopen))
+    for m in cfg.maintenance:
+        if dow in m.days:
+            b.update((_time_us(m.start), _time_us(m.end)))
+    ec = cfg.early_closes.get(day)
+    if ec is not None:
+        b.add(_time_us(ec.rth_end) + 1)
+    for w in cfg.weekly.get(dow, []):
+        b.update((_time_us(w.start), _time_us(w.end) + 1))
+    return sorted(x for x in b if 0 <= x <= DAY_US)
+
+def _offset_spans(tz: ZoneInfo, lo: int, hi: int, probe: int = 6 * 3600) -> List[Tuple[int, int, int]]:
+    """[(start_us, end_us, utc_offset_us)] covering [lo, hi) with a constant UTC offset each."""
+    def off(s: int) -> int:
+        return datetime.fromtimestamp(s, tz).utcoffset() // US
+
+    spans = []
+    s = lo // 1_000_000
+    start, cur = lo, off(s)
+    while s * 1_000_000 < hi:
+        nxt = s + probe
+        if off(nxt) != cur:
+            a, z = s, nxt                      # off(a) == cur != off(z): bisect to the second
+            while z - a > 1:
+                mid = (a + z) // 2
+                if off(mid) == cur:
+                    a = mid
+                else:
+                    z = mid
+            if z * 1_000_000 < hi:
+                spans.append((start, z * 1_000_000, cur))
+                start, cur = z * 1_000_000, off(z)
+            nxt = z
+        s = nxt
+    spans.append((start, hi, cur))
+    return spans
+
+@dataclass
+class SessionTimeline:
+    """A MarketConfig compiled into contiguous UTC intervals over [lo, hi).
+
+    Interval i covers [starts[i], starts[i + 1]) in UTC microseconds and has
+    state states[codes[i]]. Lookups are a bisect; outside the horizon they
+    fall back to market_status().
+    """
+    cfg: MarketConfig
+    lo: int
+    hi: int
+    starts: List[int]
+    codes: List[int]
+    states: List[State]
+
+    def __post_init__(self):
+        # open runs (consecutive open intervals, e.g. ETH -> RTH -> POST) and closed runs
+        self._open_starts: List[int] = []
+        self._closed_starts: List[int] = []
+        self._closed_ends: List[int] = []
+        prev = None
+        for a, c in zip(self.starts, self.codes):
+            op = self.states[c][0]
+            if op == prev:
+                continue
+            if op:
+                self._open_starts.append(a)
+                if self._closed_starts:
+                    self._closed_ends.append(a)
+            else:
+                self._closed_starts.append(a)
+            prev = op
+        if len(self._closed_ends) < len(self._closed_starts):
+            self._closed_ends.append(self.hi)
+
+    def next_open_us(self, us: int) -> Optional[int]:
+        """us if open at us, else the start of the next open run; None past the horizon."""
+        if not self.lo <= us < self.hi:
+            return None
+        if self.states[self.codes[bisect_right(self.starts, us) - 1]][0]:
+            return us
+        i = bisect_right(self._open_starts, us)
+        return self._open_starts[i] if i < len(self._open_starts) else None
+
+    def next_close_us(self, us: int, min_gap_us: int = 0) -> Optional[int]:
+        """us if closed at us, else the first instant of the next closed run lasting at
+        least min_gap_us; None past the horizon."""
+        if not self.lo <= us < self.hi:
+            return None
+        if not self.states[self.codes[bisect_right(self.starts, us) - 1]][0]:
+            return us
+        i = bisect_right(self._closed_starts, us)
+        while i < len(self._closed_starts):
+            a, z = self._closed_starts[i], self._closed_ends[i]
+            if z - a >= min_gap_us or z == self.hi:
+                return a
+            i += 1
+        return None
+
+    def index(self, us: int) -> int:
+        return bisect_right(self.starts, us) - 1
+
+    def covers(self, us: int) -> bool:
+        return self.lo <= us < self.hi
+
+    def state_at(self, us: int) -> State:
+        if not self.lo <= us < self.hi:
+            st = market_status(from_us(us), self.cfg)
+            return st["open"], st["label"], st["reason"]
+        return self.states[self.codes[bisect_right(self.starts, us) - 1]]
+
+    def status(self, ts: datetime) -> dict:
+        """market_status(ts, cfg), by bisect."""
+        us = to_us(ts)
+        if not self.lo <= us < self.hi:
+            return market_status(ts, self.cfg)
+        op, label, reason = self.states[self.codes[bisect_right(self.starts, us) - 1]]
+        return {"open": op, "label": label, "reason": reason}
+
+    def is_open(self, ts: datetime) -> bool:
+        return self.status(ts)["open"]
+
+    def intervals(self):
+        """(start, end, open, label, reason) per interval, as aware UTC datetimes."""
+        ends = self.starts[1:] + [self.hi]
+        for a, z, c in zip(self.starts, ends, self.codes):
+            yield (from_us(a), from_us(z), *self.states[c])
+
+def timeline_for(cfg: MarketConfig) -> SessionTimeline:
+    """compile_timeline(cfg), compiled once per config object (recompile after editing cfg in place)."""
+    tl = cfg.__dict__.get("_timeline")
+    if tl is None:
+        tl = cfg.__dict__["_timeline"] = compile_timeline(cfg)
+    return tl
+
+def timeline_around(cfg: MarketConfig, us: int, days: int = 15) -> SessionTimeline:
+    """A short timeline from the UTC day before us, for queries past timeline_for()'s horizon."""
+    day = date.fromordinal(us // DAY_US + _EPOCH_ORD)
+    return compile_timeline(cfg, day - timedelta(days=1), day + timedelta(days=days))
+
+def default_horizon(cfg: MarketConfig) -> Tuple[date, date]:
+    # a year either side of today and of every dated rule in the config
+    years = [datetime.now(timezone.utc).year]
+    years += [d.year for d in cfg.holidays] + [d.year for d in cfg.early_closes]
+    return date(min(years) - 1, 1, 1), date(max(years) + 2, 1, 1)
+
+def compile_timeline(cfg: MarketConfig, start: Optional[date] = None, end: Optional[date] = None) -> SessionTimeline:
+    """Compile cfg over [start, end) (UTC midnights; default default_horizon()).
+
+    Each venue day is cut at the times where a rule can change, every piece
+    is classified once by the same local_status() that market_status() uses,
+    and the pieces are mapped to UTC per constant-offset span of venue_tz,
+    so DST days (23 h / 25 h, repeated wall-clock hour) come out exact.
+    """
+    if start is None or end is None:
+        d0, d1 = default_horizon(cfg)
+        start, end = start or d0, end or d1
+    lo = (start.toordinal() - _EPOCH_ORD) * DAY_US
+    hi = (end.toordinal() - _EPOCH_ORD) * DAY_US
+    if hi <= lo:
+        raise ValueError("empty horizon")
+
+    state_code: Dict[State, int] = {}
+    states: List[State] = []
+    starts: List[int] = []
+    codes: List[int] = []
+    day_cache: Dict[tuple, List[Tuple[int, int]]] = {}
+    holidays = set(cfg.holidays)
+
+    def day_segments(day_no: int) -> List[Tuple[int, int]]:
+        # [(start_us_of_day, code)] for one venue date; the rules only look at the
+        # date through holidays / early_closes, so days share segments by that key
+        day = date.fromordinal(day_no + _EPOCH_ORD)
+        dow = day.weekday()
+        ec = cfg.early_closes.get(day)
+        key = (dow, day in holidays, ec and (ec.rth_end, ec.label))
+        segs = day_cache.get(key)
+        if segs is None:
+            segs = []
+            for t0 in _day_boundaries(cfg, day)[:-1]:
+                st = local_status(cfg, dow, _us_time(t0), day)
+                state = (st["open"], st["label"], st["reason"])
+                code = state_code.get(state)
+                if code is None:
+                    code = state_code[state] = len(states)
+                    states.append(state)
+                segs.append((t0, code))
+            day_cache[key] = segs
+        return segs
+
+    def push(us: int, code: int):
+        if codes and codes[-1] == code:
+            return
+        if starts and starts[-1] == us:
+            starts.pop(), codes.pop()
+            if codes and codes[-1] == code:
+                return
+        starts.append(us)
+        codes.append(code)
+
+    for a, z, off in _offset_spans(cfg.venue_tz, lo, hi):
+        # venue wall clock on this span is UTC + off, so local [a + off, z + off)
+        la, lz = a + off, z + off
+        for day_no in range(la // DAY_US, (lz - 1) // DAY_US + 1):
+            base = day_no * DAY_US - off            # UTC us of this venue midnight
+            for t0, code in day_segments(day_no):
+                if base + t0 < z:
+                    push(max(base + t0, a), code)
+    return SessionTimeline(cfg, lo, hi, starts, codes, states)
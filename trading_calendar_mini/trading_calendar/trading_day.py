@@ -0,0 +1,83 @@
+from __future__ import annotations
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Union
+from zoneinfo import ZoneInfo
+from .config_loader import MarketConfig
+from .timeline import from_us, to_us
+
+ONE_DAY = timedelta(days=1)
+
+def rollover_of(cfg: MarketConfig) -> time:
+    """Time of day (venue tz) from which timestamps belong to the next trading date."""
+    return cfg.session_rollover or cfg.sunday_reopen
+
+class SessionDates:
+    """Timestamp -> trading-session date for one market.
+
+    A timestamp at or after the rollover time (in `tz`, default the venue's)
+    belongs to the next calendar day. That day then moves forward past
+    Saturday/Sunday (the weekend rule), holidays and weekdays without
+    windows. The UTC span of the last session looked up is kept, so a time-
+    ordered stream costs one comparison per timestamp until the session
+    changes.
+    """
+    def __init__(self, cfg: MarketConfig, rollover: Optional[time] = None,
+                 tz: Union[str, ZoneInfo, None] = None):
+        self.cfg = cfg
+        self.rollover = rollover or rollover_of(cfg)
+        self.tz = ZoneInfo(tz) if isinstance(tz, str) else (tz or cfg.venue_tz)
+        self._holidays = frozenset(cfg.holidays)
+        self._next: Dict[date, date] = {}
+        self._lo = self._hi = 0
+        self._date: Optional[date] = None
+
+    def is_trading_day(self, d: date) -> bool:
+        return d.weekday() < 5 and bool(self.cfg.weekly.get(d.weekday())) and d not in self._holidays
+
+    def trading_day(self, d: date) -> date:
+        """First trading date on or after d."""
+        out = self._next.get(d)
+        if out is None:
+            out = d
+            for _ in range(366):
+                if self.is_trading_day(out):
+                    break
+                out += ONE_DAY
+            else:
+                raise ValueError(f"no trading day within a year of {d}")
+            self._next[d] = out
+        return out
+
+    def date_of_us(self, us: int) -> date:
+        if self._lo <= us < self._hi:
+            return self._date
+        local = from_us(us).astimezone(self.tz)
+        day = local.date()
+        if local.time() >= self.rollover:
+            day += ONE_DAY
+        self._date = self.trading_day(day)
+        # remember this calendar session's UTC span [rollover of day - 1, rollover of day)
+        self._lo = to_us(datetime.combine(day - ONE_DAY, self.rollover, self.tz))
+        self._hi = to_us(datetime.combine(day, self.rollover, self.tz))
+        if not self._lo <= us < self._hi:
+            self._lo = self._hi = 0   # rollover inside a DST gap/fold: don't cache
+        return self._date
+
+    def date_of(self, ts: datetime) -> date:
+        return self.date_of_us(to_us(ts))
+
+    def dates(self, ts, unit: str = "us"):
+        """Bulk date_of(): datetime64 / epoch array in, datetime64[D] array out (needs NumPy)."""
+        from .bulk import session_dates
+        return session_dates(ts, self.cfg, unit, rollover=self.rollover, tz=self.tz, calendar=self)
+
+def session_dates_for(cfg: MarketConfig) -> SessionDates:
+    """SessionDates with the config's own rollover, one per config object."""
+    sd = cfg.__dict__.get("_session_dates")
+    if sd is None:
+        sd = cfg.__dict__["_session_dates"] = SessionDates(cfg)
+    return sd
+
+def session_date(ts: datetime, cfg: MarketConfig) -> date:
+    """Trading-session date of an aware timestamp (see SessionDates)."""
+    return session_dates_for(cfg).date_of(ts)